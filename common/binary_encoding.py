@@ -0,0 +1,186 @@
+"""Optional binary encoding for the synapses that carry large responses.
+
+GetMinerIndex, GetDataEntityBucket and GetContentsByBuckets responses can be many megabytes of JSON, and the
+content bytes of each DataEntity are further inflated when embedded in JSON.
+
+A validator that supports the binary encoding sends its request with version >= BINARY_ENCODING_PROTOCOL_VERSION.
+A miner that also supports it then fills the synapse's '*_encoded' field with a msgpack payload, compressed with
+zlib and base64 encoded so it can still travel in the JSON body, and leaves the JSON field empty.
+
+Older miners ignore the version and fill the JSON field as before. Older validators never request the encoding.
+Validators should always read responses through the vali_utils helpers, which handle either form.
+"""
+
+import base64
+import binascii
+import datetime as dt
+import zlib
+from typing import Any, List, Optional, Tuple
+
+import msgpack
+
+from common import constants
+from common.data import (
+    CompressedMinerIndex,
+    DataEntity,
+    DataEntityBucketId,
+    DataLabel,
+    TimeBucket,
+)
+from common.data_v2 import ColumnarCompressedMinerIndex
+
+# Favor speed over ratio. Higher levels shrink payloads by a few percent at several times the cost.
+_COMPRESSION_LEVEL = 1
+
+
+def supports_binary_encoding(version: Optional[int]) -> bool:
+    """Returns whether a synapse with the provided protocol version can use the binary encoding."""
+    return version is not None and version >= constants.BINARY_ENCODING_PROTOCOL_VERSION
+
+
+def encode_compressed_index(index: CompressedMinerIndex) -> str:
+    """Encodes a CompressedMinerIndex for GetMinerIndex.compressed_index_encoded."""
+    return _pack(
+        [
+            [int(source), bucket.label, bucket.time_bucket_ids, bucket.sizes_bytes]
+            for source, compressed_buckets in index.sources.items()
+            for bucket in compressed_buckets
+        ]
+    )
+
+
+def decode_compressed_index(payload: str) -> ColumnarCompressedMinerIndex:
+    """Decodes GetMinerIndex.compressed_index_encoded into a columnar index.
+
+    Raises:
+        ValueError: If the payload is not a valid encoded index.
+    """
+    groups = _unpack(payload)
+    if not isinstance(groups, list) or not all(
+        isinstance(group, list) and len(group) == 4 for group in groups
+    ):
+        raise ValueError("Encoded index must be a list of compressed buckets.")
+    return ColumnarCompressedMinerIndex.from_groups(groups)
+
+
+def encode_data_entities(data_entities: List[DataEntity]) -> str:
+    """Encodes DataEntities for GetDataEntityBucket.data_entities_encoded."""
+    return _pack(
+        [
+            [
+                entity.uri,
+                entity.datetime.isoformat(),
+                int(entity.source),
+                entity.label.value if entity.label else None,
+                entity.content,
+                entity.content_size_bytes,
+            ]
+            for entity in data_entities
+        ]
+    )
+
+
+def decode_data_entities(payload: str) -> List[DataEntity]:
+    """Decodes GetDataEntityBucket.data_entities_encoded.
+
+    The entities come from a miner, so they are fully validated.
+
+    Raises:
+        ValueError: If the payload is not a valid list of DataEntities.
+    """
+    entities = _unpack(payload)
+    if not isinstance(entities, list):
+        raise ValueError("Encoded data entities must be a list.")
+
+    try:
+        return [
+            DataEntity(
+                uri=uri,
+                datetime=dt.datetime.fromisoformat(datetime),
+                source=source,
+                label=DataLabel(value=label) if label is not None else None,
+                content=content,
+                content_size_bytes=content_size_bytes,
+            )
+            for uri, datetime, source, label, content, content_size_bytes in entities
+        ]
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Encoded data entities are invalid: {e}.")
+
+
+def encode_bucket_contents(
+    bucket_ids_to_contents: List[Tuple[DataEntityBucketId, List[bytes]]]
+) -> str:
+    """Encodes contents for GetContentsByBuckets.bucket_ids_to_contents_encoded."""
+    return _pack(
+        [
+            [
+                bucket_id.time_bucket.id,
+                int(bucket_id.source),
+                bucket_id.label.value if bucket_id.label else None,
+                contents,
+            ]
+            for bucket_id, contents in bucket_ids_to_contents
+        ]
+    )
+
+
+def decode_bucket_contents(
+    payload: str,
+) -> List[Tuple[DataEntityBucketId, List[bytes]]]:
+    """Decodes GetContentsByBuckets.bucket_ids_to_contents_encoded.
+
+    Raises:
+        ValueError: If the payload is not a valid list of bucket contents.
+    """
+    buckets = _unpack(payload)
+    if not isinstance(buckets, list):
+        raise ValueError("Encoded bucket contents must be a list.")
+
+    try:
+        bucket_ids_to_contents = []
+        for time_bucket_id, source, label, contents in buckets:
+            if not isinstance(contents, list) or not all(
+                isinstance(content, bytes) for content in contents
+            ):
+                raise ValueError("Bucket contents must be a list of bytes.")
+            bucket_ids_to_contents.append(
+                (
+                    DataEntityBucketId(
+                        time_bucket=TimeBucket(id=time_bucket_id),
+                        source=source,
+                        label=DataLabel(value=label) if label is not None else None,
+                    ),
+                    contents,
+                )
+            )
+        return bucket_ids_to_contents
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Encoded bucket contents are invalid: {e}.")
+
+
+def _pack(obj: Any) -> str:
+    """Serializes obj with msgpack, then compresses and base64 encodes it."""
+    packed = msgpack.packb(obj, use_bin_type=True)
+    return base64.b64encode(zlib.compress(packed, _COMPRESSION_LEVEL)).decode("ascii")
+
+
+def _unpack(payload: str) -> Any:
+    """Reverses _pack, refusing payloads that decompress beyond the size limit.
+
+    Raises:
+        ValueError: If the payload cannot be decoded.
+    """
+    try:
+        compressed = base64.b64decode(payload, validate=True)
+        decompressor = zlib.decompressobj()
+        packed = decompressor.decompress(
+            compressed, constants.BINARY_ENCODING_DECODED_SIZE_LIMIT_BYTES
+        )
+        if decompressor.unconsumed_tail:
+            raise ValueError(
+                f"Encoded payload is larger than {constants.BINARY_ENCODING_DECODED_SIZE_LIMIT_BYTES} bytes."
+            )
+        return msgpack.unpackb(packed, raw=False)
+    except (binascii.Error, zlib.error, msgpack.UnpackException, ValueError) as e:
+        raise ValueError(f"Invalid binary encoded payload: {e}.")
@@ -25,7 +25,13 @@ DATA_ENTITY_BUCKET_AGE_LIMIT_DAYS = 30
 MAX_LABEL_LENGTH = 140
 
 # The current protocol version (int)
-PROTOCOL_VERSION = 4
+PROTOCOL_VERSION = 5
+
+# The minimum protocol version that supports binary encoded GetMinerIndex, GetDataEntityBucket and GetContentsByBuckets responses.
+BINARY_ENCODING_PROTOCOL_VERSION = 5
+
+# How big a binary encoded response can be once decompressed, to defend against decompression bombs.
+BINARY_ENCODING_DECODED_SIZE_LIMIT_BYTES = utils.mb_to_bytes(256)
 
 # Min evaluation period that must pass before a validator re-evaluates a miner.
 MIN_EVALUATION_PERIOD = dt.timedelta(minutes=60)
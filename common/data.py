@@ -1,6 +1,6 @@
 import dataclasses
 import time
-from common import constants
+from common import constants, time_buckets
 from common.date_range import DateRange
 from . import utils
 import datetime as dt
@@ -15,6 +15,19 @@ from pydantic import (
 )
 
 
+def _construct_trusted(cls: Type[BaseModel], values: Dict[str, Any]) -> Any:
+    """Creates an instance of a pydantic model from already validated values for every field, skipping validation.
+
+    Equivalent to cls.model_construct(**values), without its per-field overhead, which costs more than validation.
+    """
+    instance = cls.__new__(cls)
+    object.__setattr__(instance, "__dict__", values)
+    object.__setattr__(instance, "__pydantic_fields_set__", set(values))
+    object.__setattr__(instance, "__pydantic_extra__", None)
+    object.__setattr__(instance, "__pydantic_private__", None)
+    return instance
+
+
 class StrictBaseModel(BaseModel):
     """A BaseModel that enforces stricter validation constraints"""
 
@@ -42,20 +55,12 @@ class TimeBucket(StrictBaseModel):
         Args:
             datetime (datetime.datetime): A datetime object, assumed to be in UTC.
         """
-        datetime.astimezone(dt.timezone.utc)
-        return TimeBucket(
-            id=utils.seconds_to_hours(
-                datetime.astimezone(tz=dt.timezone.utc).timestamp()
-            )
-        )
+        return TimeBucket(id=time_buckets.id_from_datetime(datetime))
 
     @classmethod
     def to_date_range(cls, bucket: "TimeBucket") -> DateRange:
         """Returns the date range for this time bucket."""
-        return DateRange(
-            start=utils.datetime_from_hours_since_epoch(bucket.id),
-            end=utils.datetime_from_hours_since_epoch(bucket.id + 1),
-        )
+        return time_buckets.to_date_range(bucket.id)
 
 
 class DataSource(IntEnum):
@@ -135,6 +140,38 @@ class DataEntity(StrictBaseModel):
     content: bytes
     content_size_bytes: int = Field(ge=0)
 
+    @classmethod
+    def from_trusted_values(
+            cls,
+            uri: str,
+            datetime: dt.datetime,
+            source: int,
+            label: Optional[str],
+            content: bytes,
+            content_size_bytes: int,
+    ) -> "DataEntity":
+        """Creates a DataEntity without running validation.
+
+        Only use this for values that were produced by a validated DataEntity, such as rows read back from our own
+        storage. The values must already be in validated form: a timezone aware datetime, the int value of a
+        DataSource, and a label that has already been through DataLabel's validator.
+        """
+        return _construct_trusted(
+            cls,
+            {
+                "uri": uri,
+                "datetime": datetime,
+                "source": DataSource(source),
+                "label": (
+                    _construct_trusted(DataLabel, {"value": label})
+                    if label is not None
+                    else None
+                ),
+                "content": content,
+                "content_size_bytes": content_size_bytes,
+            },
+        )
+
     @classmethod
     def are_non_content_fields_equal(
             cls, this: "DataEntity", other: "DataEntity"
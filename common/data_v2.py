@@ -17,11 +17,15 @@ As a rule of thumb:
 """
 
 import datetime as dt
+import numpy as np
+import orjson
 from pydantic import BaseModel, Field, ConfigDict
-from typing import List, Optional
+from typing import Iterable, List, Optional, Sequence, Tuple, Union
 
 from common import constants
 from common.data import (
+    CompressedEntityBucket,
+    CompressedMinerIndex,
     DataEntityBucket,
     DataEntityBucketId,
     DataLabel,
@@ -123,4 +127,404 @@ class ScorableMinerIndex(BaseModel):
         description="DataEntityBuckets the miner is serving, scored on uniqueness.",
         max_length=constants.DATA_ENTITY_BUCKET_COUNT_LIMIT_PER_MINER_INDEX_PROTOCOL_4,
     )
-    last_updated: dt.datetime = Field(description="Time last updated in UTC.")
\ No newline at end of file
+    last_updated: dt.datetime = Field(description="Time last updated in UTC.")
+
+class ColumnarScorableMinerIndex:
+    """A struct-of-arrays variant of ScorableMinerIndex.
+
+    Instead of one ScorableDataEntityBucket per bucket, each bucket attribute is stored in its own numpy array,
+    where position i across all arrays describes bucket i. This avoids creating hundreds of thousands of Python
+    objects per miner when reading and scoring an index.
+
+    Attributes:
+        sources: The DataSource of each bucket.
+        label_ids: The position of each bucket's label in 'labels'.
+        labels: The distinct labels referenced by this index. None represents the absence of a label.
+        time_bucket_ids: The TimeBucket id of each bucket.
+        size_bytes: The size in bytes of each bucket.
+        scorable_bytes: The scorable bytes of each bucket. See ScorableDataEntityBucket for details.
+        last_updated: Time last updated in UTC.
+    """
+
+    __slots__ = (
+        "sources",
+        "label_ids",
+        "labels",
+        "time_bucket_ids",
+        "size_bytes",
+        "scorable_bytes",
+        "last_updated",
+        "_cumulative_scorable_bytes",
+    )
+
+    def __init__(
+        self,
+        sources: np.ndarray,
+        label_ids: np.ndarray,
+        labels: Sequence[Optional[str]],
+        time_bucket_ids: np.ndarray,
+        size_bytes: np.ndarray,
+        scorable_bytes: np.ndarray,
+        last_updated: dt.datetime,
+    ):
+        sources = np.asarray(sources, dtype=np.int8)
+        label_ids = np.asarray(label_ids, dtype=np.int32)
+        time_bucket_ids = np.asarray(time_bucket_ids, dtype=np.int64)
+        size_bytes = np.asarray(size_bytes, dtype=np.int64)
+        scorable_bytes = np.asarray(scorable_bytes, dtype=np.int64)
+
+        count = len(sources)
+        if not (
+            len(label_ids)
+            == len(time_bucket_ids)
+            == len(size_bytes)
+            == len(scorable_bytes)
+            == count
+        ):
+            raise ValueError("All bucket columns must have the same length.")
+        if count > constants.DATA_ENTITY_BUCKET_COUNT_LIMIT_PER_MINER_INDEX_PROTOCOL_4:
+            raise ValueError(
+                f"Index is too large. {count} buckets > {constants.DATA_ENTITY_BUCKET_COUNT_LIMIT_PER_MINER_INDEX_PROTOCOL_4}"
+            )
+        if any(label and len(label) > constants.MAX_LABEL_LENGTH for label in labels):
+            raise ValueError("Label value cannot be longer than 140 characters.")
+        if count and (label_ids.min() < 0 or label_ids.max() >= len(labels)):
+            raise ValueError("Label ids must reference an entry in labels.")
+        if count and (
+            size_bytes.min() < 0
+            or size_bytes.max() > constants.DATA_ENTITY_BUCKET_SIZE_LIMIT_BYTES
+        ):
+            raise ValueError(
+                f"Size must be between 0 and {constants.DATA_ENTITY_BUCKET_SIZE_LIMIT_BYTES}."
+            )
+        if count and scorable_bytes.min() < 0:
+            raise ValueError(
+                f"Scorable bytes must be between 0 and {constants.DATA_ENTITY_BUCKET_SIZE_LIMIT_BYTES}."
+            )
+        if np.any(scorable_bytes > size_bytes):
+            raise ValueError("Scorable bytes cannot be greater than size bytes.")
+
+        self.sources = sources
+        self.label_ids = label_ids
+        self.labels = tuple(label.casefold() if label else None for label in labels)
+        self.time_bucket_ids = time_bucket_ids
+        self.size_bytes = size_bytes
+        self.scorable_bytes = scorable_bytes
+        self.last_updated = last_updated
+        # Built on first use. The bucket columns must not be modified afterwards.
+        self._cumulative_scorable_bytes: Optional[np.ndarray] = None
+
+    def __repr__(self):
+        return f"ColumnarScorableMinerIndex(buckets={self.bucket_count()}, labels={len(self.labels)}, last_updated={self.last_updated})"
+
+    def bucket_count(self) -> int:
+        """Returns the number of buckets in this index."""
+        return len(self.sources)
+
+    def label_at(self, i: int) -> Optional[str]:
+        """Returns the label of the bucket at position i."""
+        return self.labels[self.label_ids[i]]
+
+    def total_scorable_bytes(self) -> int:
+        """Returns the scorable bytes across all buckets in this index."""
+        cumulative = self._get_cumulative_scorable_bytes()
+        return int(cumulative[-1]) if len(cumulative) else 0
+
+    def bucket_at_scorable_byte(self, byte: int) -> int:
+        """Returns the position of the bucket holding the given scorable byte, counting across all buckets in order.
+
+        Uses a prefix sum built once per index, so each lookup is O(log n).
+        """
+        if not 0 <= byte < self.total_scorable_bytes():
+            raise ValueError(
+                f"Byte {byte} is outside the {self.total_scorable_bytes()} scorable bytes of this index."
+            )
+        return int(
+            np.searchsorted(self._get_cumulative_scorable_bytes(), byte, side="right")
+        )
+
+    def _get_cumulative_scorable_bytes(self) -> np.ndarray:
+        if self._cumulative_scorable_bytes is None:
+            self._cumulative_scorable_bytes = np.cumsum(self.scorable_bytes)
+        return self._cumulative_scorable_bytes
+
+    def to_data_entity_bucket(self, i: int) -> DataEntityBucket:
+        """Returns the bucket at position i as a DataEntityBucket."""
+        label = self.label_at(i)
+        return DataEntityBucket(
+            id=DataEntityBucketId(
+                time_bucket=TimeBucket(id=int(self.time_bucket_ids[i])),
+                source=int(self.sources[i]),
+                label=DataLabel(value=label) if label else None,
+            ),
+            size_bytes=int(self.size_bytes[i]),
+        )
+
+    @property
+    def scorable_data_entity_buckets(self) -> List[ScorableDataEntityBucket]:
+        """Materializes the index as a list of ScorableDataEntityBucket.
+
+        This creates one object per bucket, so avoid it on hot paths.
+        """
+        return [
+            ScorableDataEntityBucket(
+                time_bucket_id=int(time_bucket_id),
+                source=int(source),
+                label=self.labels[label_id],
+                size_bytes=int(size_bytes),
+                scorable_bytes=int(scorable_bytes),
+            )
+            for source, label_id, time_bucket_id, size_bytes, scorable_bytes in zip(
+                self.sources.tolist(),
+                self.label_ids.tolist(),
+                self.time_bucket_ids.tolist(),
+                self.size_bytes.tolist(),
+                self.scorable_bytes.tolist(),
+            )
+        ]
+
+    @classmethod
+    def from_scorable_buckets(
+        cls, buckets: List[ScorableDataEntityBucket], last_updated: dt.datetime
+    ) -> "ColumnarScorableMinerIndex":
+        """Builds a columnar index from a list of ScorableDataEntityBuckets."""
+        label_ids_by_label = {}
+        label_ids = []
+        for bucket in buckets:
+            label_ids.append(
+                label_ids_by_label.setdefault(bucket.label, len(label_ids_by_label))
+            )
+
+        return cls(
+            sources=[int(bucket.source) for bucket in buckets],
+            label_ids=label_ids,
+            labels=list(label_ids_by_label.keys()),
+            time_bucket_ids=[bucket.time_bucket_id for bucket in buckets],
+            size_bytes=[bucket.size_bytes for bucket in buckets],
+            scorable_bytes=[bucket.scorable_bytes for bucket in buckets],
+            last_updated=last_updated,
+        )
+
+    @classmethod
+    def from_index(
+        cls, index: Union[ScorableMinerIndex, "ColumnarScorableMinerIndex"]
+    ) -> "ColumnarScorableMinerIndex":
+        """Returns the provided index in columnar form, converting a ScorableMinerIndex if necessary."""
+        if isinstance(index, ColumnarScorableMinerIndex):
+            return index
+        return cls.from_scorable_buckets(
+            index.scorable_data_entity_buckets, index.last_updated
+        )
+
+
+class ColumnarCompressedMinerIndex:
+    """A struct-of-arrays variant of CompressedMinerIndex, as received from a miner.
+
+    Position i across the bucket arrays describes bucket i. Unlike CompressedMinerIndex, bucket sizes and
+    label lengths are bounds checked on construction, so an index that would later fail to be scored is
+    rejected up front.
+
+    Attributes:
+        sources: The DataSource of each bucket.
+        label_ids: The position of each bucket's label in 'labels'.
+        labels: The labels referenced by this index, as sent by the miner. None represents the absence of a label.
+        time_bucket_ids: The TimeBucket id of each bucket.
+        sizes_bytes: The size in bytes of each bucket.
+    """
+
+    __slots__ = "sources", "label_ids", "labels", "time_bucket_ids", "sizes_bytes"
+
+    def __init__(
+        self,
+        sources: np.ndarray,
+        label_ids: np.ndarray,
+        labels: Sequence[Optional[str]],
+        time_bucket_ids: np.ndarray,
+        sizes_bytes: np.ndarray,
+    ):
+        sources = np.asarray(sources, dtype=np.int64)
+        label_ids = np.asarray(label_ids, dtype=np.int32)
+        time_bucket_ids = np.asarray(time_bucket_ids, dtype=np.int64)
+        sizes_bytes = np.asarray(sizes_bytes, dtype=np.int64)
+
+        count = len(sources)
+        if not len(label_ids) == len(time_bucket_ids) == len(sizes_bytes) == count:
+            raise ValueError("All bucket columns must have the same length.")
+        if count > constants.DATA_ENTITY_BUCKET_COUNT_LIMIT_PER_MINER_INDEX_PROTOCOL_4:
+            raise ValueError(
+                f"Compressed index is too large. {count} buckets > {constants.DATA_ENTITY_BUCKET_COUNT_LIMIT_PER_MINER_INDEX_PROTOCOL_4}"
+            )
+        if any(label and len(label) > constants.MAX_LABEL_LENGTH for label in labels):
+            raise ValueError("Label value cannot be longer than 140 characters.")
+        if count and (label_ids.min() < 0 or label_ids.max() >= len(labels)):
+            raise ValueError("Label ids must reference an entry in labels.")
+        if count and (
+            sizes_bytes.min() < 0
+            or sizes_bytes.max() > constants.DATA_ENTITY_BUCKET_SIZE_LIMIT_BYTES
+        ):
+            raise ValueError(
+                f"Size must be between 0 and {constants.DATA_ENTITY_BUCKET_SIZE_LIMIT_BYTES}."
+            )
+
+        self.sources = sources
+        self.label_ids = label_ids
+        self.labels = tuple(labels)
+        self.time_bucket_ids = time_bucket_ids
+        self.sizes_bytes = sizes_bytes
+
+    def __repr__(self):
+        return f"ColumnarCompressedMinerIndex(buckets={self.bucket_count()}, labels={len(self.labels)})"
+
+    def bucket_count(self) -> int:
+        """Returns the number of buckets in this index."""
+        return len(self.sources)
+
+    def size_bytes(self) -> int:
+        """Returns the total size in bytes of all buckets in this index."""
+        return int(self.sizes_bytes.sum())
+
+    def to_compressed_index(self) -> CompressedMinerIndex:
+        """Converts this index back to a CompressedMinerIndex."""
+        sources = {}
+        # Buckets for the same source and label are contiguous, so split wherever either changes.
+        boundaries = np.flatnonzero(
+            (np.diff(self.sources) != 0) | (np.diff(self.label_ids) != 0)
+        ) + 1
+        for start, end in zip(
+            [0, *boundaries.tolist()], [*boundaries.tolist(), self.bucket_count()]
+        ):
+            if start == end:
+                continue
+            sources.setdefault(int(self.sources[start]), []).append(
+                CompressedEntityBucket(
+                    label=self.labels[self.label_ids[start]],
+                    time_bucket_ids=self.time_bucket_ids[start:end].tolist(),
+                    sizes_bytes=self.sizes_bytes[start:end].tolist(),
+                )
+            )
+        return CompressedMinerIndex(sources=sources)
+
+    @classmethod
+    def from_compressed_index(
+        cls, index: CompressedMinerIndex
+    ) -> "ColumnarCompressedMinerIndex":
+        """Builds a columnar index from a CompressedMinerIndex."""
+        return cls.from_groups(
+            (
+                source,
+                compressed_bucket.label,
+                compressed_bucket.time_bucket_ids,
+                compressed_bucket.sizes_bytes,
+            )
+            for source, compressed_buckets in index.sources.items()
+            for compressed_bucket in compressed_buckets
+        )
+
+    @classmethod
+    def from_json(cls, payload: Union[str, bytes]) -> "ColumnarCompressedMinerIndex":
+        """Decodes a serialized CompressedMinerIndex directly into a columnar index.
+
+        Accepts everything CompressedMinerIndex.model_validate_json accepts from a well behaved miner, without
+        creating a pydantic object per compressed bucket.
+
+        Raises:
+            ValueError: If the payload is not a valid compressed index.
+        """
+        try:
+            decoded = orjson.loads(payload)
+        except orjson.JSONDecodeError as e:
+            raise ValueError(f"Compressed index is not valid JSON: {e}.")
+
+        if not isinstance(decoded, dict) or not isinstance(
+            decoded.get("sources"), dict
+        ):
+            raise ValueError("Compressed index must contain a 'sources' object.")
+
+        def groups():
+            for source, compressed_buckets in decoded["sources"].items():
+                try:
+                    source = int(source)
+                except ValueError:
+                    raise ValueError(f"Invalid source {source!r} in compressed index.")
+                if not isinstance(compressed_buckets, list):
+                    raise ValueError(f"Buckets for source {source} must be a list.")
+
+                for compressed_bucket in compressed_buckets:
+                    if not isinstance(compressed_bucket, dict):
+                        raise ValueError("Each compressed bucket must be an object.")
+                    yield (
+                        source,
+                        compressed_bucket.get("label"),
+                        compressed_bucket.get("time_bucket_ids", []),
+                        compressed_bucket.get("sizes_bytes", []),
+                    )
+
+        return cls.from_groups(groups())
+
+    @classmethod
+    def from_groups(
+        cls, groups: Iterable[Tuple[int, Optional[str], List[int], List[int]]]
+    ) -> "ColumnarCompressedMinerIndex":
+        """Builds a columnar index from (source, label, time_bucket_ids, sizes_bytes) groups.
+
+        Each group corresponds to one CompressedEntityBucket. Groups may come from an untrusted miner, so their
+        types are checked here.
+
+        Raises:
+            ValueError: If any group is malformed or the index is out of bounds.
+        """
+        sources = []
+        labels = []
+        counts = []
+        time_bucket_ids = []
+        sizes_bytes = []
+        declared_count = 0
+        for source, label, group_time_bucket_ids, group_sizes_bytes in groups:
+            if not isinstance(source, int) or isinstance(source, bool):
+                raise ValueError(f"Invalid source {source!r} in compressed index.")
+            if label is not None and not isinstance(label, str):
+                raise ValueError("Compressed bucket label must be a string.")
+            if not isinstance(group_time_bucket_ids, list) or not isinstance(
+                group_sizes_bytes, list
+            ):
+                raise ValueError(
+                    "Compressed bucket time_bucket_ids and sizes_bytes must be lists."
+                )
+
+            # Match CompressedMinerIndex, which counts buckets by time_bucket_ids, and storage, which
+            # zips time_bucket_ids with sizes_bytes.
+            declared_count += len(group_time_bucket_ids)
+            if (
+                declared_count
+                > constants.DATA_ENTITY_BUCKET_COUNT_LIMIT_PER_MINER_INDEX_PROTOCOL_4
+            ):
+                raise ValueError(
+                    f"Compressed index is too large. More than {constants.DATA_ENTITY_BUCKET_COUNT_LIMIT_PER_MINER_INDEX_PROTOCOL_4} buckets."
+                )
+            count = min(len(group_time_bucket_ids), len(group_sizes_bytes))
+            sources.append(source)
+            labels.append(label)
+            counts.append(count)
+            time_bucket_ids.extend(group_time_bucket_ids[:count])
+            sizes_bytes.extend(group_sizes_bytes[:count])
+
+        return cls(
+            sources=np.repeat(np.asarray(sources, dtype=np.int64), counts),
+            label_ids=np.repeat(np.arange(len(labels), dtype=np.int32), counts),
+            labels=labels,
+            time_bucket_ids=_to_int64_array(time_bucket_ids, "time_bucket_ids"),
+            sizes_bytes=_to_int64_array(sizes_bytes, "sizes_bytes"),
+        )
+
+
+def _to_int64_array(values: List, name: str) -> np.ndarray:
+    """Converts a list of JSON decoded values to an int64 array, rejecting anything that is not an integer."""
+    if not values:
+        return np.empty(0, dtype=np.int64)
+    try:
+        array = np.asarray(values)
+    except (ValueError, OverflowError):
+        raise ValueError(f"Compressed index {name} must be integers.")
+    if array.ndim != 1 or array.dtype.kind not in "iu" or array.dtype == np.uint64:
+        raise ValueError(f"Compressed index {name} must be integers.")
+    return array.astype(np.int64, copy=False)
@@ -0,0 +1,59 @@
+import dataclasses
+from types import MappingProxyType
+from typing import Mapping, Optional, Tuple
+
+import bittensor as bt
+import numpy as np
+
+
+def _read_only_copy(values) -> np.ndarray:
+    array = np.array(values, copy=True)
+    array.flags.writeable = False
+    return array
+
+
+@dataclasses.dataclass(frozen=True)
+class MetagraphSnapshot:
+    """An immutable view of the parts of a metagraph used to evaluate and query miners.
+
+    Why? A bt.metagraph is large and mutable, so it had to be deep copied wherever it was shared across threads.
+    A snapshot is built once per metagraph sync and can be shared freely, since nothing can modify it.
+
+    Compatible with the helpers in common.utils that accept a bt.metagraph, such as get_miner_uids and is_validator.
+    """
+
+    netuid: int
+    block: int
+    n: int
+    uids: np.ndarray
+    hotkeys: Tuple[str, ...]
+    coldkeys: Tuple[str, ...]
+    axons: Tuple[bt.AxonInfo, ...]
+    S: np.ndarray
+    I: np.ndarray
+    validator_permit: np.ndarray
+    uid_by_hotkey: Mapping[str, int]
+
+    @classmethod
+    def from_metagraph(cls, metagraph: bt.metagraph) -> "MetagraphSnapshot":
+        """Builds a snapshot of the metagraph."""
+        hotkeys = tuple(metagraph.hotkeys)
+        return cls(
+            netuid=int(metagraph.netuid),
+            block=int(np.asarray(metagraph.block).item()),
+            n=int(np.asarray(metagraph.n).item()),
+            uids=_read_only_copy(metagraph.uids),
+            hotkeys=hotkeys,
+            coldkeys=tuple(metagraph.coldkeys),
+            axons=tuple(metagraph.axons),
+            S=_read_only_copy(metagraph.S),
+            I=_read_only_copy(metagraph.I),
+            validator_permit=_read_only_copy(metagraph.validator_permit),
+            uid_by_hotkey=MappingProxyType(
+                {hotkey: uid for uid, hotkey in enumerate(hotkeys)}
+            ),
+        )
+
+    def get_uid(self, hotkey: str) -> Optional[int]:
+        """Returns the uid of the hotkey, or None if it isn't registered."""
+        return self.uid_by_hotkey.get(hotkey)
@@ -9,12 +9,14 @@ import threading
 import traceback
 
 from common import utils
+from common.metagraph_snapshot import MetagraphSnapshot
 
 
 class MetagraphSyncer:
     @dataclasses.dataclass
     class _State:
         metagraph: Optional[bt.metagraph] = None
+        snapshot: Optional[MetagraphSnapshot] = None
         last_synced_time: Optional[datetime] = None
         listeners: List = field(default_factory=list)
 
@@ -46,9 +48,11 @@ class MetagraphSyncer:
         for netuid in self.config.keys():
             fn = functools.partial(self.subtensor.metagraph, netuid)
             metagraph = utils.run_in_thread(fn, ttl=120, name=f"InitalSync-{netuid}")
+            snapshot = MetagraphSnapshot.from_metagraph(metagraph)
             with self.lock:
                 state = self.metagraph_map[netuid]
                 state.metagraph = metagraph
+                state.snapshot = snapshot
                 state.last_synced_time = datetime.now()
 
             bt.logging.debug(f"Successfully loaded metagraph for {netuid}")
@@ -80,11 +84,13 @@ class MetagraphSyncer:
                     name=f"Sync-{netuid}",
                 )
                 bt.logging.trace(f"Successfully synced metagraph for {netuid}.")
+                snapshot = MetagraphSnapshot.from_metagraph(metagraph)
                 state = None
                 with self.lock:
                     # Store metagraph and sync time
                     state = self.metagraph_map[netuid]
                     state.metagraph = metagraph
+                    state.snapshot = snapshot
                     state.last_synced_time = datetime.now()
 
                 self._notify_listeners(state, netuid)
@@ -140,6 +146,21 @@ class MetagraphSyncer:
                 raise ValueError(f"Metagraph for {netuid} has not been synced yet.")
             return metagraph
 
+    def get_metagraph_snapshot(self, netuid: int) -> MetagraphSnapshot:
+        """Returns an immutable snapshot of the last synced version of the metagraph for netuid.
+
+        The same snapshot is returned until the next sync, so it can be shared without copying.
+        """
+        with self.lock:
+            if netuid not in self.metagraph_map:
+                raise ValueError(
+                    f"Metagraph for {netuid} not known to MetagraphSyncer."
+                )
+            snapshot = self.metagraph_map[netuid].snapshot
+            if not snapshot:
+                raise ValueError(f"Metagraph for {netuid} has not been synced yet.")
+            return snapshot
+
     def _notify_listeners(self, state: _State, netuid: int):
         """Notifies listeners of a new metagraph for netuid."""
         bt.logging.debug(f"Notifying listeners of update to metagraph for {netuid}.")
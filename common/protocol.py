@@ -27,7 +27,10 @@ class GetMinerIndex(BaseProtocol):
     Protocol by which Validators can retrieve the Index from a Miner.
 
     Attributes:
-    - data_entity_buckets: A list of DataEntityBucket objects that the Miner can serve.
+    - compressed_index_serialized: The serialized CompressedMinerIndex of the Miner.
+    - compressed_index_encoded: The binary encoded CompressedMinerIndex of the Miner, if negotiated.
+    - index_hash: The hash of the index. See the field description for details.
+    - index_unchanged: Whether the index was omitted because it matches the requested index_hash.
     """
 
     # We opt to send the compressed index in pre-serialized form to have full control
@@ -40,6 +43,25 @@ class GetMinerIndex(BaseProtocol):
         default=None,
     )
 
+    compressed_index_encoded: Optional[str] = Field(
+        description="The compressed index in binary encoded form. Used instead of compressed_index_serialized when both sides support it. See common/binary_encoding.py.",
+        frozen=False,
+        repr=False,
+        default=None,
+    )
+
+    index_hash: Optional[str] = Field(
+        description="Sent by the Validator as the hash of the last index it received from this Miner, if any. Returned by the Miner as the hash of its current index.",
+        frozen=False,
+        default=None,
+    )
+
+    index_unchanged: bool = Field(
+        description="Set by the Miner, instead of returning the index, when its current index matches the requested index_hash.",
+        frozen=False,
+        default=False,
+    )
+
 
 class GetDataEntityBucket(BaseProtocol):
     """
@@ -48,6 +70,7 @@ class GetDataEntityBucket(BaseProtocol):
     Attributes:
     - bucket_id: The id of the bucket that the requester is asking for.
     - data_entities: A list of DataEntity objects that make up the requested DataEntityBucket.
+    - data_entities_encoded: The binary encoded data_entities, if negotiated.
     """
 
     data_entity_bucket_id: Optional[DataEntityBucketId] = Field(
@@ -66,6 +89,14 @@ class GetDataEntityBucket(BaseProtocol):
         default_factory=list,
     )
 
+    data_entities_encoded: Optional[str] = Field(
+        title="data_entities_encoded",
+        description="The data_entities in binary encoded form. Used instead of data_entities when both sides support it. See common/binary_encoding.py.",
+        frozen=False,
+        repr=False,
+        default=None,
+    )
+
 
 class GetContentsByBuckets(BaseProtocol):
     """
@@ -75,6 +106,7 @@ class GetContentsByBuckets(BaseProtocol):
     Attributes:
     - bucket_ids: The ids of the buckets that the requester is asking for.
     - bucket_ids_to_contents: A dict of DataEntityBucketId objects to a list of contained contents.
+    - bucket_ids_to_contents_encoded: The binary encoded bucket_ids_to_contents, if negotiated.
     """
 
     data_entity_bucket_ids: Optional[List[DataEntityBucketId]] = Field(
@@ -93,6 +125,14 @@ class GetContentsByBuckets(BaseProtocol):
         default_factory=list,
     )
 
+    bucket_ids_to_contents_encoded: Optional[str] = Field(
+        title="bucket_ids_to_contents_encoded",
+        description="The bucket_ids_to_contents in binary encoded form. Used instead of bucket_ids_to_contents when both sides support it. See common/binary_encoding.py.",
+        frozen=False,
+        repr=False,
+        default=None,
+    )
+
 
 class GetHuggingFaceMetadata(BaseProtocol):
     """
@@ -0,0 +1,89 @@
+"""Integer arithmetic for TimeBucket ids.
+
+TimeBucket ids are the number of whole hours since the unix epoch. The pydantic TimeBucket model in data.py is the
+public representation, but hot paths only need the id. The functions here work on plain ints, or numpy arrays of ints,
+without constructing TimeBuckets or timezone aware datetimes.
+"""
+
+import datetime as dt
+import functools
+import time
+from typing import Iterable, Optional
+
+import numpy as np
+
+from common.date_range import DateRange
+
+SECONDS_PER_TIME_BUCKET = 3600
+
+
+def id_from_timestamp(timestamp: float) -> int:
+    """Returns the TimeBucket id containing the provided unix timestamp."""
+    return int(timestamp // SECONDS_PER_TIME_BUCKET)
+
+
+def id_from_datetime(datetime: dt.datetime) -> int:
+    """Returns the TimeBucket id containing the provided datetime.
+
+    Args:
+        datetime (datetime.datetime): A datetime object. Naive datetimes are interpreted as local time, matching
+            datetime.astimezone.
+    """
+    return id_from_timestamp(datetime.timestamp())
+
+
+def current_id(now: Optional[float] = None) -> int:
+    """Returns the TimeBucket id for now, or for the provided unix timestamp."""
+    return id_from_timestamp(time.time() if now is None else now)
+
+
+def ids_from_timestamps(timestamps: np.ndarray) -> np.ndarray:
+    """Vectorized version of id_from_timestamp."""
+    return np.floor_divide(
+        np.asarray(timestamps), SECONDS_PER_TIME_BUCKET
+    ).astype(np.int64)
+
+
+def ids_from_datetimes(datetimes: Iterable[dt.datetime]) -> np.ndarray:
+    """Returns the TimeBucket id for each of the provided datetimes."""
+    return ids_from_timestamps(
+        np.fromiter(
+            (datetime.timestamp() for datetime in datetimes), dtype=np.float64
+        )
+    )
+
+
+def start_timestamp(time_bucket_id: int) -> int:
+    """Returns the unix timestamp that the TimeBucket starts at, inclusive."""
+    return time_bucket_id * SECONDS_PER_TIME_BUCKET
+
+
+def end_timestamp(time_bucket_id: int) -> int:
+    """Returns the unix timestamp that the TimeBucket ends at, exclusive."""
+    return (time_bucket_id + 1) * SECONDS_PER_TIME_BUCKET
+
+
+@functools.lru_cache(maxsize=8192)
+def to_date_range(time_bucket_id: int) -> DateRange:
+    """Returns the UTC DateRange covered by the TimeBucket.
+
+    Results are cached, since DateRange is immutable and the same recent ids are requested repeatedly.
+    """
+    return DateRange(
+        start=dt.datetime.fromtimestamp(
+            start_timestamp(time_bucket_id), tz=dt.timezone.utc
+        ),
+        end=dt.datetime.fromtimestamp(end_timestamp(time_bucket_id), tz=dt.timezone.utc),
+    )
+
+
+def age_in_hours(time_bucket_id: int, current_time_bucket_id: int) -> int:
+    """Returns how many hours old the TimeBucket is, treating future TimeBuckets as current."""
+    return max(0, current_time_bucket_id - time_bucket_id)
+
+
+def ages_in_hours(
+    time_bucket_ids: np.ndarray, current_time_bucket_id: int
+) -> np.ndarray:
+    """Vectorized version of age_in_hours."""
+    return np.maximum(0, current_time_bucket_id - np.asarray(time_bucket_ids))
@@ -10,6 +10,7 @@ from math import floor
 from typing import Any, Callable, List, Optional, Dict
 import bittensor as bt
 from functools import lru_cache, update_wrapper
+from common import time_buckets
 from common.date_range import DateRange
 
 _KB = 1024
@@ -112,16 +113,12 @@ def time_bucket_id_from_datetime(datetime: dt.datetime) -> int:
     Args:
         datetime (datetime.datetime): A datetime object, assumed to be in UTC.
     """
-    return seconds_to_hours(datetime.astimezone(tz=dt.timezone.utc).timestamp())
+    return time_buckets.id_from_datetime(datetime)
 
 
-@classmethod
 def time_bucket_id_to_date_range(bucket: int) -> DateRange:
     """Returns the date range from a Timebucket ID."""
-    return DateRange(
-        start=datetime_from_hours_since_epoch(bucket),
-        end=datetime_from_hours_since_epoch(bucket + 1),
-    )
+    return time_buckets.to_date_range(bucket)
 
 
 def serialize_to_file(obj: Any, filename: str) -> None:
@@ -181,6 +181,13 @@ def add_args(neuron_type: NeuronType, parser):
             default="SqliteMinerStorage.sqlite",
         )
 
+        parser.add_argument(
+            "--neuron.scrape_yield_database_name",
+            type=str,
+            help="The name of the database recording what each scrape produced. Set to an empty string to disable.",
+            default="ScrapeYields.sqlite",
+        )
+
         parser.add_argument(
             "--neuron.max_database_size_gb_hint",
             type=int,
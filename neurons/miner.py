@@ -24,7 +24,7 @@ import traceback
 import typing
 import bittensor as bt
 import datetime as dt
-from common import constants, utils
+from common import binary_encoding, constants, utils
 from common.data import CompressedMinerIndex, TimeBucket
 from common.protocol import (
     GetDataEntityBucket,
@@ -38,6 +38,7 @@ from common.protocol import (
 from scraping.config.config_reader import ConfigReader
 from scraping.coordinator import ScraperCoordinator
 from scraping.provider import ScraperProvider
+from scraping.scrape_yield_store import ScrapeYieldStore
 from storage.miner.sqlite_miner_storage import SqliteMinerStorage
 from neurons.config import NeuronType, check_config, create_config
 from huggingface_utils.huggingface_uploader import DualUploader
@@ -182,10 +183,17 @@ class Miner:
         )
         bt.logging.success(f"Loaded scraping config: {scraping_config}.")
 
+        scrape_yield_store = None
+        if self.config.neuron.scrape_yield_database_name:
+            scrape_yield_store = ScrapeYieldStore(
+                self.config.neuron.scrape_yield_database_name
+            )
+
         self.scraping_coordinator = ScraperCoordinator(
             scraper_provider=ScraperProvider(),
             miner_storage=self.storage,
             config=scraping_config,
+            scrape_yield_store=scrape_yield_store,
         )
 
         # Configure per hotkey per request limits.
@@ -232,7 +240,8 @@ class Miner:
                 # Check if it's a new day and we haven't updated yet
                 if last_update is None or current_datetime.date() > last_update.date():
                     bt.logging.info("Retrieving the latest dynamic lookup...")
-                    sync_run_retrieval(self.config)
+                    lookup = sync_run_retrieval(self.config)
+                    self.scraping_coordinator.on_desirability_lookup_updated(lookup)
                     bt.logging.info(f"New desirable data list has been written to total.json")
                     last_update = current_datetime
                     bt.logging.info(f"Updated dynamic lookup at {last_update}")
@@ -438,10 +447,27 @@ class Miner:
             return synapse
 
         # Return the appropriate amount of max buckets based on protocol of the requesting validator.
-        compressed_index = self.storage.get_compressed_index(
+        compressed_index, index_hash = self.storage.get_compressed_index_with_hash(
             bucket_count_limit=constants.DATA_ENTITY_BUCKET_COUNT_LIMIT_PER_MINER_INDEX_PROTOCOL_4
         )
-        synapse.compressed_index_serialized = compressed_index.model_dump_json()
+
+        # If the validator already has this index, tell it so instead of sending the index again.
+        requested_index_hash = synapse.index_hash
+        synapse.index_hash = index_hash
+        if index_hash is not None and requested_index_hash == index_hash:
+            synapse.index_unchanged = True
+            bt.logging.success(
+                f"Returning unchanged compressed miner index to {synapse.dendrite.hotkey}."
+            )
+            synapse.version = constants.PROTOCOL_VERSION
+            return synapse
+
+        if binary_encoding.supports_binary_encoding(synapse.version):
+            synapse.compressed_index_encoded = binary_encoding.encode_compressed_index(
+                compressed_index
+            )
+        else:
+            synapse.compressed_index_serialized = compressed_index.model_dump_json()
         bt.logging.success(
             f"Returning compressed miner index of {CompressedMinerIndex.size_bytes(compressed_index)} bytes "
             + f"across {CompressedMinerIndex.bucket_count(compressed_index)} buckets to {synapse.dendrite.hotkey}."
@@ -468,13 +494,19 @@ class Miner:
         )
 
         # List all the data entities that this miner has for the requested DataEntityBucket.
-        synapse.data_entities = self.storage.list_data_entities_in_data_entity_bucket(
+        data_entities = self.storage.list_data_entities_in_data_entity_bucket(
             synapse.data_entity_bucket_id
         )
+        if binary_encoding.supports_binary_encoding(synapse.version):
+            synapse.data_entities_encoded = binary_encoding.encode_data_entities(
+                data_entities
+            )
+        else:
+            synapse.data_entities = data_entities
         synapse.version = constants.PROTOCOL_VERSION
 
         bt.logging.success(
-            f"Returning Bucket ID: {str(synapse.data_entity_bucket_id)} with {len(synapse.data_entities)} entities to {synapse.dendrite.hotkey}."
+            f"Returning Bucket ID: {str(synapse.data_entity_bucket_id)} with {len(data_entities)} entities to {synapse.dendrite.hotkey}."
         )
 
         return synapse
@@ -619,11 +651,7 @@ class Miner:
                 synapse.data = enhanced_data_entities[:synapse.limit] if synapse.limit else enhanced_data_entities
             else:
                 # For Reddit, use the provider that's part of the coordinator
-                from scraping.provider import ScraperProvider
-
-                # Create a new scraper provider and get the appropriate scraper
-                provider = ScraperProvider()
-                scraper = provider.get(scraper_id)
+                scraper = self.scraping_coordinator.provider.get(scraper_id)
 
                 if not scraper:
                     bt.logging.error(f"No scraper available for ID {scraper_id}")
@@ -677,13 +705,17 @@ class Miner:
         buckets_to_contents = self.storage.list_contents_in_data_entity_buckets(
             synapse.data_entity_bucket_ids
         )
-        synapse.bucket_ids_to_contents = [
-            (k, v) for k, v in buckets_to_contents.items()
-        ]
+        bucket_ids_to_contents = [(k, v) for k, v in buckets_to_contents.items()]
+        if binary_encoding.supports_binary_encoding(synapse.version):
+            synapse.bucket_ids_to_contents_encoded = (
+                binary_encoding.encode_bucket_contents(bucket_ids_to_contents)
+            )
+        else:
+            synapse.bucket_ids_to_contents = bucket_ids_to_contents
         synapse.version = constants.PROTOCOL_VERSION
 
         bt.logging.success(
-            f"Returning Bucket IDs: {str(synapse.data_entity_bucket_ids)} with {sum(len(contents) for (_,contents) in synapse.bucket_ids_to_contents)} entities to {synapse.dendrite.hotkey}."
+            f"Returning Bucket IDs: {str(synapse.data_entity_bucket_ids)} with {sum(len(contents) for (_,contents) in bucket_ids_to_contents)} entities to {synapse.dendrite.hotkey}."
         )
 
         return synapse
@@ -47,7 +47,6 @@ from common.protocol import OnDemandRequest
 from common import utils
 from scraping.scraper import ScrapeConfig, ValidationResult
 from common.date_range import DateRange
-from scraping.provider import ScraperProvider
 from scraping.x.enhanced_apidojo_scraper import EnhancedApiDojoTwitterScraper
 from vali_utils.miner_evaluator import MinerEvaluator
 import random
@@ -113,6 +112,10 @@ class Validator:
 
         # The metagraph holds the state of the network, letting us know about other validators and miners.
         self.metagraph = self.metagraph_syncer.get_metagraph(self.config.netuid)
+        # An immutable snapshot of the metagraph, shared with the API to select and query miners.
+        self.metagraph_snapshot = self.metagraph_syncer.get_metagraph_snapshot(
+            self.config.netuid
+        )
         self.metagraph_syncer.register_listener(
             self._on_metagraph_updated, netuids=[self.config.netuid]
         )
@@ -398,7 +401,11 @@ class Validator:
         """Processes an update to the metagraph"""
         with self.lock:
             assert netuid == self.config.netuid
-            self.metagraph = copy.deepcopy(metagraph)
+            # The syncer replaces rather than modifies its metagraphs, so they can be shared without copying.
+            self.metagraph = metagraph
+            self.metagraph_snapshot = self.metagraph_syncer.get_metagraph_snapshot(
+                netuid
+            )
 
     def _on_eval_batch_complete(self):
         with self.lock:
@@ -599,9 +606,11 @@ class Validator:
             MIN_PENALTY = 0.01
             MAX_PENALTY = 0.05
 
+            metagraph = self.metagraph_snapshot
+
             # Get all miner UIDs and sort by incentive
-            miner_uids = utils.get_miner_uids(self.metagraph, self.uid, 10000)
-            miner_scores = [(uid, float(self.metagraph.I[uid])) for uid in miner_uids]
+            miner_uids = utils.get_miner_uids(metagraph, self.uid, 10000)
+            miner_scores = [(uid, float(metagraph.I[uid])) for uid in miner_uids]
             miner_scores.sort(key=lambda x: x[1], reverse=True)
 
             # Take top 60% of miners (but at least 5 if available)
@@ -622,7 +631,7 @@ class Validator:
             while len(selected_miners) < NUM_MINERS_TO_QUERY and top_miners:
                 idx = random.randint(0, len(top_miners) - 1)
                 uid, _ = top_miners.pop(idx)
-                coldkey = self.metagraph.coldkeys[uid]
+                coldkey = metagraph.coldkeys[uid]
 
                 # Only add if we haven't selected too many miners from this coldkey
                 if coldkey not in selected_coldkeys or len(selected_coldkeys) < 2:
@@ -657,28 +666,27 @@ class Validator:
             miner_responses = {}
             miner_data_counts = {}
 
-            async with bt.dendrite(wallet=self.wallet) as dendrite:
-                axons = [self.metagraph.axons[uid] for uid in selected_miners]
-                responses = await dendrite.forward(
-                    axons=axons,
-                    synapse=on_demand_synapse,
-                    timeout=30
-                )
+            axons = [metagraph.axons[uid] for uid in selected_miners]
+            responses = await self.evaluator.dendrite_pool.forward(
+                axons=axons,
+                synapse=on_demand_synapse,
+                timeout=30
+            )
 
-                # Process responses
-                for i, response in enumerate(responses):
-                    if i < len(selected_miners) and response is not None:
-                        uid = selected_miners[i]
-                        hotkey = self.metagraph.hotkeys[uid]
+            # Process responses
+            for i, response in enumerate(responses):
+                if i < len(selected_miners) and response is not None:
+                    uid = selected_miners[i]
+                    hotkey = metagraph.hotkeys[uid]
 
-                        # Check if response has data
-                        data = getattr(response, 'data', [])
-                        data_count = len(data) if data else 0
+                    # Check if response has data
+                    data = getattr(response, 'data', [])
+                    data_count = len(data) if data else 0
 
-                        miner_responses[uid] = response
-                        miner_data_counts[uid] = data_count
+                    miner_responses[uid] = response
+                    miner_data_counts[uid] = data_count
 
-                        bt.logging.info(f"Miner {uid} ({hotkey}) returned {data_count} items")
+                    bt.logging.info(f"Miner {uid} ({hotkey}) returned {data_count} items")
 
             if not miner_responses:
                 synapse.status = "error"
@@ -710,7 +718,7 @@ class Validator:
                                 "consensus": "no_data"
                             }
                             return synapse
-                        scraper = ScraperProvider().get(scraper_id)
+                        scraper = self.evaluator.scraper_provider.get(scraper_id)
                     else:
                         bt.logging.warning(f"No preferred scraper for source {on_demand_synapse.source}")
                         synapse.status = "success"
@@ -908,7 +916,7 @@ class Validator:
                             bt.logging.warning(f"No preferred scraper for source {on_demand_synapse.source}")
                             continue
 
-                        scraper = ScraperProvider().get(scraper_id)
+                        scraper = self.evaluator.scraper_provider.get(scraper_id)
                         if not scraper:
                             bt.logging.warning(f"Could not initialize scraper {scraper_id}")
                             continue
@@ -944,7 +952,7 @@ class Validator:
                             )
 
                             # Update the miner's score with this result
-                            index = self.evaluator.storage.read_miner_index(self.metagraph.hotkeys[uid])
+                            index = self.evaluator.storage.read_miner_index(metagraph.hotkeys[uid])
                             self.evaluator.scorer.on_miner_evaluated(uid, index, [validation_result])
 
                             # Remove this miner from consistent miners if it was there
@@ -968,7 +976,7 @@ class Validator:
                 best_meta = {
                     "source": "validated",
                     "miner_uid": best_uid,
-                    "miner_hotkey": self.metagraph.hotkeys[best_uid],
+                    "miner_hotkey": metagraph.hotkeys[best_uid],
                     "validation_rate": validated_miners[best_uid]
                 }
 
@@ -981,7 +989,7 @@ class Validator:
                 best_meta = {
                     "source": "consistent",
                     "miner_uid": best_uid,
-                    "miner_hotkey": self.metagraph.hotkeys[best_uid]
+                    "miner_hotkey": metagraph.hotkeys[best_uid]
                 }
 
             # Last resort: take data from any miner that returned something
@@ -994,7 +1002,7 @@ class Validator:
                 best_meta = {
                     "source": "inconsistent",
                     "miner_uid": median_uid,
-                    "miner_hotkey": self.metagraph.hotkeys[median_uid]
+                    "miner_hotkey": metagraph.hotkeys[median_uid]
                 }
 
             # Process the data for return
@@ -1076,8 +1084,9 @@ class Validator:
         return True, "No whitelist configured"
 
     def organic_priority(self, synapse: OrganicRequest) -> float:
-        caller_uid = self.metagraph.hotkeys.index(synapse.dendrite.hotkey)
-        priority = float(self.metagraph.S[caller_uid])
+        metagraph = self.metagraph_snapshot
+        caller_uid = metagraph.uid_by_hotkey[synapse.dendrite.hotkey]
+        priority = float(metagraph.S[caller_uid])
         bt.logging.trace(
             f"Prioritizing {synapse.dendrite.hotkey} with value: {priority}.",
         )
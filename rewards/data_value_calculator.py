@@ -1,7 +1,9 @@
 import datetime as dt
+import numpy as np
 from typing import Optional
+from common import time_buckets
 from common.data import DataSource, TimeBucket
-from common.data_v2 import ScorableDataEntityBucket
+from common.data_v2 import ColumnarScorableMinerIndex, ScorableDataEntityBucket
 from rewards.data import DataDesirabilityLookup
 from scraping.scraper import HFValidationResult
 
@@ -40,6 +42,45 @@ class DataValueCalculator:
             * scorable_data_entity_bucket.scorable_bytes
         )
 
+    def get_score_for_index(
+        self,
+        index: ColumnarScorableMinerIndex,
+        current_time_bucket: TimeBucket,
+    ) -> float:
+        """Returns the total score of all buckets in the given index.
+
+        Equivalent to summing get_score_for_data_entity_bucket over every bucket, but computed over the index
+        columns so that no per-bucket objects are created.
+        """
+        if index.bucket_count() == 0:
+            return 0.0
+
+        # Compute the source and label scale factor once per distinct (source, label) pair.
+        label_count = len(index.labels)
+        pair_keys = index.sources.astype(np.int64) * label_count + index.label_ids
+        unique_pair_keys, pair_positions = np.unique(pair_keys, return_inverse=True)
+        pair_scale_factors = np.array(
+            [
+                self._scale_factor_for_source_and_label(
+                    pair_key // label_count, index.labels[pair_key % label_count]
+                )
+                for pair_key in unique_pair_keys.tolist()
+            ],
+            dtype=np.float64,
+        )
+
+        time_scalars = self._scale_factors_for_ages(
+            index.time_bucket_ids, current_time_bucket.id
+        )
+
+        return float(
+            np.sum(
+                pair_scale_factors[pair_positions]
+                * time_scalars
+                * index.scorable_bytes
+            )
+        )
+
     def _scale_factor_for_source_and_label(
         self, data_source: DataSource, label: Optional[str]
     ) -> float:
@@ -61,11 +102,24 @@ class DataValueCalculator:
         # Note: This makes the assumption that TimeBuckets are 1 hour buckets, which isn't ideal,
         # but we make the trade-off because it has a notable impact on perf vs. constructing TimeBuckets
         # to compute the age in hours.
-        data_age_in_hours = current_time_bucket_id - time_bucket_id
-
-        # Safe guard against future data.
-        data_age_in_hours = max(0, data_age_in_hours)
+        # Future data is treated as current.
+        data_age_in_hours = time_buckets.age_in_hours(
+            time_bucket_id, current_time_bucket_id
+        )
 
         if data_age_in_hours > self.model.max_age_in_hours:
             return 0.0
         return 1.0 - (data_age_in_hours / (2 * self.model.max_age_in_hours))
+
+    def _scale_factors_for_ages(
+        self, time_bucket_ids: np.ndarray, current_time_bucket_id: int
+    ) -> np.ndarray:
+        """Vectorized version of _scale_factor_for_age."""
+        data_ages_in_hours = time_buckets.ages_in_hours(
+            time_bucket_ids, current_time_bucket_id
+        )
+        return np.where(
+            data_ages_in_hours > self.model.max_age_in_hours,
+            0.0,
+            1.0 - (data_ages_in_hours / (2 * self.model.max_age_in_hours)),
+        )
@@ -1,10 +1,10 @@
 import threading
-from typing import List, Optional
+from typing import Dict, List, Optional, Union
 import torch
 import bittensor as bt
-import datetime as dt
+from common import time_buckets
 from common.data import TimeBucket
-from common.data_v2 import ScorableMinerIndex
+from common.data_v2 import ColumnarScorableMinerIndex, ScorableMinerIndex
 from rewards.data_value_calculator import DataValueCalculator
 from scraping.scraper import ValidationResult, HFValidationResult
 
@@ -98,6 +98,27 @@ class MinerScorer:
         with self.lock:
             return self.miner_credibility[uid].item()
 
+    def get_miner_scoring_state(self, uid: int) -> Dict[str, float]:
+        """Returns the state used to score miner 'uid': its score, credibility, last raw score, raw HF boost and HF
+        credibility."""
+        with self.lock:
+            return {
+                "score": self.scores[uid].item(),
+                "credibility": self.miner_credibility[uid].item(),
+                "raw_score": self.scorable_bytes[uid].item(),
+                "hf_boost": self.hf_boosts[uid].item(),
+                "hf_credibility": self.hf_credibility[uid].item(),
+            }
+
+    def set_miner_scoring_state(self, uid: int, state: Dict[str, float]) -> None:
+        """Restores the state used to score miner 'uid', as returned by get_miner_scoring_state."""
+        with self.lock:
+            self.scores[uid] = state["score"]
+            self.miner_credibility[uid] = state["credibility"]
+            self.scorable_bytes[uid] = state["raw_score"]
+            self.hf_boosts[uid] = state["hf_boost"]
+            self.hf_credibility[uid] = state["hf_credibility"]
+
     def resize(self, num_neurons: int) -> None:
         """Resizes the score tensor to the new number of neurons.
 
@@ -142,14 +163,14 @@ class MinerScorer:
     def on_miner_evaluated(
         self,
         uid: int,
-        index: Optional[ScorableMinerIndex],
+        index: Optional[Union[ColumnarScorableMinerIndex, ScorableMinerIndex]],
         validation_results: List[ValidationResult]
     ) -> None:
         """Notifies the scorer that a miner has been evaluated and should have its score updated.
 
         Args:
             uid (int): The miner's UID.
-            index (ScorableMinerIndex): The latest index of the miner.
+            index (ColumnarScorableMinerIndex | ScorableMinerIndex): The latest index of the miner.
             validation_results (List[ValidationResult]): The results of data validation performed on the data provided by the miner.
             hf_validation_result (Optional, HFValidationResult): The overall result from a validation process on a 10,000 row sample from a miner's HF dataset. 
         """
@@ -161,13 +182,10 @@ class MinerScorer:
             if index:
                 # Compute the raw miner score based on the amount of data it has, scaled based on
                 # the reward distribution.
-                current_time_bucket = TimeBucket.from_datetime(
-                    dt.datetime.now(tz=dt.timezone.utc)
+                current_time_bucket = TimeBucket(id=time_buckets.current_id())
+                score = self.value_calculator.get_score_for_index(
+                    ColumnarScorableMinerIndex.from_index(index), current_time_bucket
                 )
-                for bucket in index.scorable_data_entity_buckets:
-                    score += self.value_calculator.get_score_for_data_entity_bucket(
-                        bucket, current_time_bucket
-                    )
 
                 # If the score has increased since the last eval, decrease credibility so that the
                 # new score remains unchanged. i.e. "you've told us you now have more valuable data, prove it".
@@ -0,0 +1,102 @@
+import asyncio
+import time
+from enum import Enum
+from typing import Optional
+
+
+class ScrapeOutcome(str, Enum):
+    """How a scrape ended, as far as concurrency control is concerned."""
+
+    # Returned at least one entity.
+    SUCCESS = "success"
+    # Returned no entities. Usually the label has no data in the time range, but most scrapers also catch their errors,
+    # including rate limiting, and return nothing.
+    EMPTY = "empty"
+    # Raised a timeout.
+    TIMEOUT = "timeout"
+    # Raised any other exception, including rate limiting the scraper didn't catch.
+    ERROR = "error"
+
+
+class AimdConcurrencyLimiter:
+    """Limits how many scrapes run concurrently with one scraper, adapting the limit to how the scrapes fare.
+
+    The limit is adjusted by AIMD (additive increase, multiplicative decrease), as in TCP congestion control. Each
+    successful scrape raises the limit by 1 / limit, so it grows by ~1 per limit's worth of successes. Each failed,
+    timed out or unusually slow scrape multiplies it by DECREASE_FACTOR. A burst of failures from scrapes that were
+    already running when the limit was last decreased only decreases it once.
+
+    Empty scrapes leave the limit alone, since sparse labels and time ranges are expected. Only a streak of
+    EMPTY_STREAK_LIMIT empty scrapes in a row, which is more likely a scraper swallowing errors, decreases it.
+
+    The limit stays within [1, max_limit]. Not thread safe: must only be used from a single event loop.
+    """
+
+    DECREASE_FACTOR = 0.5
+
+    # Scrapes that take longer than this multiple of the typical scrape latency count as congested.
+    LATENCY_TOLERANCE = 3.0
+
+    # Scrapes that take less than this never count as congested, so jitter on fast scrapes is ignored.
+    MIN_CONGESTED_LATENCY_SECS = 10.0
+
+    # The number of empty scrapes in a row that count as a failure.
+    EMPTY_STREAK_LIMIT = 5
+
+    # The weight of each successful scrape in the typical latency.
+    LATENCY_ALPHA = 0.1
+
+    def __init__(self, max_limit: int, initial_limit: float = 1.0):
+        assert max_limit >= 1, "max_limit must be at least 1"
+
+        self.max_limit = max_limit
+        self.limit = min(max(initial_limit, 1.0), max_limit)
+        self.in_flight = 0
+        # A moving average of the latency of successful scrapes, in seconds.
+        self.typical_latency: Optional[float] = None
+        self.empty_streak = 0
+        self.last_decrease = float("-inf")
+        self.condition = asyncio.Condition()
+
+    def _has_capacity(self) -> bool:
+        return self.in_flight < int(self.limit)
+
+    async def acquire(self) -> float:
+        """Waits until another scrape may start. Returns the start time, to pass to release."""
+        async with self.condition:
+            await self.condition.wait_for(self._has_capacity)
+            self.in_flight += 1
+        return time.monotonic()
+
+    async def release(self, started_at: float, outcome: ScrapeOutcome):
+        """Notifies the limiter that a scrape started at started_at has ended with outcome."""
+        latency = time.monotonic() - started_at
+        is_slow = self.typical_latency is not None and latency > max(
+            self.LATENCY_TOLERANCE * self.typical_latency,
+            self.MIN_CONGESTED_LATENCY_SECS,
+        )
+        self.empty_streak = self.empty_streak + 1 if outcome == ScrapeOutcome.EMPTY else 0
+
+        if outcome == ScrapeOutcome.SUCCESS:
+            self.typical_latency = (
+                latency
+                if self.typical_latency is None
+                else self.LATENCY_ALPHA * latency
+                + (1 - self.LATENCY_ALPHA) * self.typical_latency
+            )
+
+        if outcome == ScrapeOutcome.SUCCESS and not is_slow:
+            self.limit = min(self.limit + 1.0 / self.limit, self.max_limit)
+        elif (
+            outcome == ScrapeOutcome.EMPTY
+            and self.empty_streak < self.EMPTY_STREAK_LIMIT
+        ):
+            pass
+        elif started_at > self.last_decrease:
+            self.limit = max(self.limit * self.DECREASE_FACTOR, 1.0)
+            self.last_decrease = time.monotonic()
+            self.empty_streak = 0
+
+        async with self.condition:
+            self.in_flight -= 1
+            self.condition.notify_all()
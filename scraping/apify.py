@@ -1,6 +1,10 @@
+import asyncio
 import os
-from typing import List, Optional
+import threading
+import weakref
+from typing import AsyncIterator, Dict, List, Optional
 from apify_client import ApifyClientAsync
+from apify_client.clients import RunClientAsync
 from pydantic import BaseModel, Field, PositiveInt
 import bittensor as bt
 
@@ -43,6 +47,11 @@ class RunConfig(StrictBaseModel):
         description="The amount of memory in mb to use for this run.", default=None
     )
 
+    build: Optional[str] = Field(
+        description="The tag or number of the actor build to run. Pinning a build spares Apify from resolving the latest build on every run. If None, the actor's default build is used.",
+        default=None,
+    )
+
 
 class ActorRunError(Exception):
     """Exception raised when an actor run fails."""
@@ -52,9 +61,66 @@ class ActorRunError(Exception):
         super().__init__(self.message)
 
 
-class ActorRunner:
+class _LoopState:
+    """The clients and run limits an ActorRunner uses on a single event loop."""
+
     def __init__(self):
-        pass
+        self.clients: Dict[str, ApifyClientAsync] = {}
+        self.run_limits: Dict[str, asyncio.Semaphore] = {}
+
+
+class ActorRunner:
+    """Runs Apify actors, reusing clients and limiting how many runs of each actor are in flight.
+
+    Each client holds an HTTP connection pool, which is bound to the event loop it was created on. One client is
+    therefore kept per API token per event loop, and reused for every run on that loop. Concurrent runs are limited
+    per actor per event loop too.
+
+    Runs that outlive their timeout are aborted, as are runs whose caller is cancelled, so they don't keep running
+    (and billing) unobserved.
+
+    Thread safe.
+    """
+
+    # The most runs of a single actor in flight at once on an event loop.
+    MAX_CONCURRENT_RUNS_PER_ACTOR = 8
+
+    # How much longer than a run's timeout to wait for it to finish, before aborting it.
+    WAIT_GRACE_SECS = 5
+
+    # The statuses of runs that have finished. Any other status, e.g. TIMING-OUT or ABORTING, is still running.
+    TERMINAL_STATUSES = ("SUCCEEDED", "FAILED", "TIMED-OUT", "ABORTED")
+
+    def __init__(
+        self, max_concurrent_runs_per_actor: int = MAX_CONCURRENT_RUNS_PER_ACTOR
+    ):
+        self.max_concurrent_runs_per_actor = max_concurrent_runs_per_actor
+        self.lock = threading.Lock()
+        # The _LoopState for each event loop, dropped along with the loop.
+        self.loop_states = weakref.WeakKeyDictionary()
+
+    def _get_loop_state(self) -> _LoopState:
+        loop = asyncio.get_running_loop()
+        with self.lock:
+            state = self.loop_states.get(loop)
+            if state is None:
+                state = _LoopState()
+                self.loop_states[loop] = state
+            return state
+
+    def _get_client(self, state: _LoopState, api_key: str) -> ApifyClientAsync:
+        client = state.clients.get(api_key)
+        if client is None:
+            client = ApifyClientAsync(api_key)
+            state.clients[api_key] = client
+        return client
+
+    def _get_run_limit(self, state: _LoopState, actor_id: str) -> asyncio.Semaphore:
+        run_limit = state.run_limits.get(actor_id)
+        if run_limit is None:
+            run_limit = asyncio.Semaphore(self.max_concurrent_runs_per_actor)
+            state.run_limits[actor_id] = run_limit
+        return run_limit
 
     async def run(self, config: RunConfig, run_input: dict) -> List[dict]:
         """
@@ -70,27 +136,83 @@ class ActorRunner:
         Returns:
             list[dict]: List of items fetched from the dataset.
         """
+        return [item async for item in self.iterate(config, run_input)]
+
+    async def iterate(self, config: RunConfig, run_input: dict) -> AsyncIterator[dict]:
+        """Like run, but yields the items as each page of the dataset is fetched, rather than collecting them all.
+
+        The actor's concurrency limit is only held while it runs, not while its items are consumed.
+        """
+        state = self._get_loop_state()
+        client = self._get_client(state, config.api_key)
 
-        client = ApifyClientAsync(config.api_key)
+        async with self._get_run_limit(state, config.actor_id):
+            run = await self._run_to_completion(client, config, run_input)
 
-        run = await client.actor(config.actor_id).call(
+        async for item in client.dataset(run["defaultDatasetId"]).iterate_items():
+            yield item
+
+    async def _run_to_completion(
+        self, client: ApifyClientAsync, config: RunConfig, run_input: dict
+    ) -> dict:
+        """Starts the run and waits for it to finish, aborting it if it takes too long. Returns the finished run."""
+        run = await client.actor(config.actor_id).start(
             run_input=run_input,
+            build=config.build,
             max_items=config.max_data_entities,
             timeout_secs=config.timeout_secs,
-            # If not set, the client will wait indefinitely for the run to finish. Ensure we don't wait forever.
-            wait_secs=config.timeout_secs + 5,
             memory_mbytes=config.memory_mb,
         )
+        run_client = client.run(run["id"])
+
+        try:
+            # Apify stops the run after timeout_secs itself. Only wait a little longer than that.
+            finished_run = await run_client.wait_for_finish(
+                wait_secs=config.timeout_secs + self.WAIT_GRACE_SECS
+            )
+        except asyncio.CancelledError:
+            await asyncio.shield(self._abort(run_client, config))
+            raise
+
+        if (
+            finished_run is None
+            or finished_run.get("status", "").upper() not in self.TERMINAL_STATUSES
+        ):
+            bt.logging.warning(
+                f"Actor ({config.actor_id}) [{config.debug_info}] exceeded its timeout of {config.timeout_secs}s. Aborting it."
+            )
+            # Like a run that timed out on its own, the items it produced so far are still used.
+            return await self._abort(run_client, config) or finished_run or run
 
         # We want a success status. Timeout is also okay because it will return partial results.
-        if "status" not in run or not (
-            run["status"].casefold() == "SUCCEEDED".casefold()
-            or run["status"].casefold() == "TIMED-OUT".casefold()
+        if "status" not in finished_run or not (
+            finished_run["status"].casefold() == "SUCCEEDED".casefold()
+            or finished_run["status"].casefold() == "TIMED-OUT".casefold()
         ):
             raise ActorRunError(
-                f"Actor ({config.actor_id}) [{config.debug_info}] failed: {run}"
+                f"Actor ({config.actor_id}) [{config.debug_info}] failed: {finished_run}"
+            )
+        return finished_run
+
+    async def _abort(
+        self, run_client: RunClientAsync, config: RunConfig
+    ) -> Optional[dict]:
+        try:
+            return await run_client.abort()
+        except Exception as e:
+            bt.logging.warning(
+                f"Failed to abort actor ({config.actor_id}) [{config.debug_info}] run: {e}"
             )
-        iterator = client.dataset(run["defaultDatasetId"]).iterate_items()
-        items = [i async for i in iterator]
+            return None
+
+    async def close(self):
+        """Closes the clients created on the current event loop. Later runs on it create new clients."""
+        state = self._get_loop_state()
+        clients, state.clients = state.clients, {}
+        for client in clients.values():
+            await client.http_client.httpx_async_client.aclose()
+            client.http_client.httpx_client.close()
+
 
-        return items
+# The runner shared by all scrapers by default, so they share clients and per-actor run limits.
+DEFAULT_ACTOR_RUNNER = ActorRunner()
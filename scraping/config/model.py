@@ -78,6 +78,12 @@ class ScraperConfig(StrictBaseModel):
         """
     )
 
+    max_concurrent_scrapes: PositiveInt = Field(
+        default=5,
+        description="""The most scrapes to run at once with this scraper. The miner adapts how many run at once
+        within this ceiling, based on how the scrapes fare.""",
+    )
+
     def to_coordinator_scraper_config(self) -> coordinator.ScraperConfig:
         """Returns the internal ScraperConfig representation"""
         return coordinator.ScraperConfig(
@@ -86,6 +92,7 @@ class ScraperConfig(StrictBaseModel):
                 label.to_coordinator_label_scrape_config()
                 for label in self.labels_to_scrape
             ],
+            max_concurrent_scrapes=self.max_concurrent_scrapes,
         )
 
 
@@ -98,6 +105,11 @@ class ScrapingConfig(StrictBaseModel):
         description="The list of scrapers (and their scraping config) this miner should scrape from. Only scrapers in this list will be used."
     )
 
+    target_bucket_size_bytes: PositiveInt = Field(
+        default=constants.DATA_ENTITY_BUCKET_SIZE_LIMIT_BYTES,
+        description="The size each (label, hour) bucket should be filled to. Scrapes favor emptier buckets.",
+    )
+
     def to_coordinator_config(self) -> coordinator.CoordinatorConfig:
         """Returns the CoordinatorConfig."""
         ids_and_configs = [
@@ -105,5 +117,6 @@ class ScrapingConfig(StrictBaseModel):
             for config in self.scraper_configs
         ]
         return coordinator.CoordinatorConfig(
-            scraper_configs={id: config for id, config in ids_and_configs}
+            scraper_configs={id: config for id, config in ids_and_configs},
+            target_bucket_size_bytes=self.target_bucket_size_bytes,
         )
\ No newline at end of file
@@ -2,16 +2,24 @@ import asyncio
 import functools
 import random
 import threading
+import time
 import traceback
 import bittensor as bt
 import datetime as dt
-from typing import Dict, List, Optional
+from typing import Collection, Dict, List, Optional, Set, Tuple
 import numpy
 from pydantic import Field, PositiveInt, ConfigDict
+from common import constants, time_buckets
 from common.date_range import DateRange
-from common.data import DataLabel, DataSource, StrictBaseModel, TimeBucket
+from common.data import DataEntity, DataLabel, DataSource, StrictBaseModel
+from rewards.data import DataDesirabilityLookup
+from scraping.adaptive_concurrency import AimdConcurrencyLimiter, ScrapeOutcome
+from scraping.coverage_planner import CoveragePlanner
 from scraping.provider import ScraperProvider
-from scraping.scraper import ScrapeConfig, ScraperId
+from scraping.scrape_scheduler import ScrapeScheduler
+from scraping.scrape_yield_store import ScrapeYield, ScrapeYieldStore
+from scraping.scraper import ScrapeConfig, Scraper, ScraperId
+from storage.miner.ingestion_queue import IngestionQueue
 from storage.miner.miner_storage import MinerStorage
 
 
@@ -55,6 +63,12 @@ class ScraperConfig(StrictBaseModel):
         """
     )
 
+    max_concurrent_scrapes: PositiveInt = Field(
+        default=5,
+        description="""The most scrapes to run at once with this scraper. The coordinator adapts how many run at once
+        within this ceiling, backing off when scrapes fail, time out, slow down or repeatedly come back empty.""",
+    )
+
 
 class CoordinatorConfig(StrictBaseModel):
     """Informs the Coordinator how to schedule scrapes."""
@@ -63,11 +77,24 @@ class CoordinatorConfig(StrictBaseModel):
         description="The configs for each scraper."
     )
 
+    target_bucket_size_bytes: PositiveInt = Field(
+        default=constants.DATA_ENTITY_BUCKET_SIZE_LIMIT_BYTES,
+        description="""The size each (label, hour) bucket should be filled to. Scrapes favor hours whose bucket
+        for the scraped label is further below this size.""",
+    )
+
 
 def _choose_scrape_configs(
-        scraper_id: ScraperId, config: CoordinatorConfig, now: dt.datetime
+        scraper_id: ScraperId,
+        config: CoordinatorConfig,
+        now: dt.datetime,
+        scheduler: Optional[ScrapeScheduler] = None,
 ) -> List[ScrapeConfig]:
-    """For the given scraper, returns a list of scrapes (defined by ScrapeConfig) to be run."""
+    """For the given scraper, returns a list of scrapes (defined by ScrapeConfig) to be run.
+
+    If a scheduler is provided, labels and time buckets are chosen by their expected reward. Otherwise labels are
+    chosen uniformly and time buckets from a triangular distribution favoring recent data.
+    """
     assert (
             scraper_id in config.scraper_configs
     ), f"Scraper Id {scraper_id} not in config"
@@ -82,7 +109,11 @@ def _choose_scrape_configs(
     for label_config in scraper_config.labels_to_scrape:
         # First, choose a label
         labels_to_scrape = None
-        if label_config.label_choices:
+        if scheduler:
+            labels_to_scrape = scheduler.choose_label(
+                scraper_id, label_config.label_choices
+            )
+        elif label_config.label_choices:
             labels_to_scrape = [random.choice(label_config.label_choices)]
 
         # Get max age from config or use default
@@ -109,31 +140,34 @@ def _choose_scrape_configs(
                     labels=labels_to_scrape,
                 )
             )
+        elif scheduler:
+            results.append(
+                ScrapeConfig(
+                    entity_limit=label_config.max_data_entities,
+                    date_range=scheduler.choose_date_range(
+                        max_age_minutes, now, scraper_id, labels_to_scrape
+                    ),
+                    labels=labels_to_scrape,
+                )
+            )
         else:
             # For other scrapers, use the normal time bucket approach
-            current_bucket = TimeBucket.from_datetime(now)
-            oldest_bucket = TimeBucket.from_datetime(
-                now - dt.timedelta(minutes=max_age_minutes)
+            now_timestamp = now.timestamp()
+            current_bucket_id = time_buckets.id_from_timestamp(now_timestamp)
+            oldest_bucket_id = time_buckets.id_from_timestamp(
+                now_timestamp - max_age_minutes * 60
             )
 
-            chosen_bucket = current_bucket
+            chosen_bucket_id = current_bucket_id
             # If we have more than 1 bucket to choose from, choose a bucket in the range
-            if oldest_bucket.id < current_bucket.id:
+            if oldest_bucket_id < current_bucket_id:
                 # Use a triangular distribution for bucket selection
-                chosen_id = int(numpy.random.default_rng().triangular(
-                    left=oldest_bucket.id, mode=current_bucket.id, right=current_bucket.id
+                chosen_bucket_id = int(numpy.random.default_rng().triangular(
+                    left=oldest_bucket_id, mode=current_bucket_id, right=current_bucket_id
                 ))
 
-                chosen_bucket = TimeBucket(id=chosen_id)
-
-            date_range = TimeBucket.to_date_range(chosen_bucket)
-
-            # Ensure date_range has timezone info
-            if date_range.start.tzinfo is None:
-                date_range = DateRange(
-                    start=date_range.start.replace(tzinfo=dt.timezone.utc),
-                    end=date_range.end.replace(tzinfo=dt.timezone.utc)
-                )
+            # Date ranges for time buckets are always in UTC.
+            date_range = time_buckets.to_date_range(chosen_bucket_id)
 
             results.append(
                 ScrapeConfig(
@@ -173,6 +207,17 @@ class ScraperCoordinator:
                     results.append(scraper_id)
             return results
 
+        def get_next_scrape_time(
+            self, excluded_scraper_ids: Collection[ScraperId] = ()
+        ) -> Optional[dt.datetime]:
+            """Returns when the next scraper, other than the excluded ones, is due to run, or None if there isn't one."""
+            due_times = [
+                self.last_scrape_time_per_scraper_id[scraper_id] + cadence
+                for scraper_id, cadence in self.cadence_by_scraper_id.items()
+                if scraper_id not in excluded_scraper_ids
+            ]
+            return min(due_times, default=None)
+
         def on_scrape_scheduled(self, scraper_id: ScraperId, now: dt.datetime):
             """Notifies the tracker that a scrape has been scheduled."""
             self.last_scrape_time_per_scraper_id[scraper_id] = now
@@ -182,15 +227,46 @@ class ScraperCoordinator:
         scraper_provider: ScraperProvider,
         miner_storage: MinerStorage,
         config: CoordinatorConfig,
+        scrape_yield_store: Optional[ScrapeYieldStore] = None,
     ):
         self.provider = scraper_provider
         self.storage = miner_storage
         self.config = config
+        # If set, records what each scrape produced.
+        self.scrape_yield_store = scrape_yield_store
 
         self.tracker = ScraperCoordinator.Tracker(self.config, dt.datetime.utcnow())
-        self.max_workers = 5
         self.is_running = False
-        self.queue = asyncio.Queue()
+        # Each scraper has its own queue and workers, so a throttled scraper can't hold up the others.
+        self.queues: Dict[ScraperId, asyncio.Queue] = {
+            scraper_id: asyncio.Queue() for scraper_id in config.scraper_configs
+        }
+        self.concurrency_limiters: Dict[ScraperId, AimdConcurrencyLimiter] = {
+            scraper_id: AimdConcurrencyLimiter(cfg.max_concurrent_scrapes)
+            for scraper_id, cfg in config.scraper_configs.items()
+        }
+        # Stores scraped entities on a separate thread, so storage writes don't stall the workers.
+        self.ingestion_queue = IngestionQueue(miner_storage)
+        # Tracks which buckets the miner already holds, so scrapes target those it's missing.
+        self.coverage_planner = CoveragePlanner(
+            miner_storage, config.target_bucket_size_bytes
+        )
+        # Chooses what each scrape fetches, based on desirability, coverage and the yield of previous scrapes.
+        self.scheduler = ScrapeScheduler(coverage_planner=self.coverage_planner)
+        # The number of entities scraped, and of those already stored, by scraper and label.
+        self.duplicate_counts: Dict[Tuple[ScraperId, Optional[str]], Tuple[int, int]] = {}
+        # Scrapers that are due, but whose previous scrapes haven't started yet. They're scheduled again once one of
+        # their workers finishes a scrape.
+        self.backlogged_scraper_ids: Set[ScraperId] = set()
+        # Set to wake the scheduling loop before the next scrape is due. Created on the coordinator's event loop.
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.wakeup: Optional[asyncio.Event] = None
+        # Re-reads the miner's coverage in the background, so scheduling never waits on the index.
+        self.coverage_refresh: Optional[asyncio.Task] = None
+
+    def on_desirability_lookup_updated(self, lookup: DataDesirabilityLookup):
+        """Notifies the coordinator of a new DataDesirabilityLookup, to schedule subsequent scrapes by."""
+        self.scheduler.set_lookup(lookup)
 
     def run_in_background_thread(self):
         """
@@ -201,7 +277,8 @@ class ScraperCoordinator:
         bt.logging.info("Starting ScrapingCoordinator in a background thread.")
 
         self.is_running = True
-        self.thread = threading.Thread(target=self.run, daemon=True).start()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
 
     def run(self):
         """Blocking call to run the Coordinator, indefinitely."""
@@ -210,57 +287,267 @@ class ScraperCoordinator:
     def stop(self):
         bt.logging.info("Stopping the ScrapingCoordinator.")
         self.is_running = False
+        if self.loop is not None:
+            self.loop.call_soon_threadsafe(self._wake)
+
+    def _refresh_coverage_in_background(self):
+        """Starts re-reading the miner's coverage, unless it's already being re-read.
+
+        Reading the index may have to wait for it to be built, which can take minutes on a large database. Until the
+        read finishes, scrapes are scheduled with the coverage read last, or by age alone before the first read.
+        """
+        if self.coverage_refresh is None or self.coverage_refresh.done():
+            self.coverage_refresh = asyncio.create_task(self._refresh_coverage())
+
+    async def _refresh_coverage(self):
+        try:
+            await asyncio.get_running_loop().run_in_executor(
+                None, self.coverage_planner.refresh_if_stale
+            )
+        except Exception:
+            bt.logging.warning(
+                f"Failed to refresh scrape coverage: {traceback.format_exc()}"
+            )
+
+    def _wake(self):
+        """Wakes the scheduling loop. Must be called on the coordinator's event loop."""
+        if self.wakeup is not None:
+            self.wakeup.set()
 
     async def _start(self):
+        self.loop = asyncio.get_running_loop()
+        self.wakeup = asyncio.Event()
+        self.ingestion_queue.start()
+        await self.provider.start(self.config.scraper_configs.keys())
+
         workers = []
-        for i in range(self.max_workers):
-            worker = asyncio.create_task(
-                self._worker(
-                    f"worker-{i}",
+        for scraper_id, scraper_config in self.config.scraper_configs.items():
+            for i in range(scraper_config.max_concurrent_scrapes):
+                worker = asyncio.create_task(
+                    self._worker(
+                        f"{scraper_id}-worker-{i}", scraper_id, self.queues[scraper_id]
+                    )
                 )
-            )
-            workers.append(worker)
+                workers.append(worker)
 
         while self.is_running:
+            # Anything that woke the loop is handled by this iteration.
+            self.wakeup.clear()
+            await self._flush_scrape_yields(force=False)
+
             now = dt.datetime.utcnow()
-            scraper_ids_to_scrape_now = self.tracker.get_scraper_ids_ready_to_scrape(
-                now
-            )
+            scraper_ids_to_scrape_now = [
+                scraper_id
+                for scraper_id in self.tracker.get_scraper_ids_ready_to_scrape(now)
+                if scraper_id not in self.backlogged_scraper_ids
+            ]
             if not scraper_ids_to_scrape_now:
-                bt.logging.trace("Nothing ready to scrape yet. Trying again in 15s.")
-                # Nothing is due a scrape. Wait a few seconds and try again
-                await asyncio.sleep(15)
+                await self._wait_for_next_scrape(now)
                 continue
 
+            self._refresh_coverage_in_background()
+
             for scraper_id in scraper_ids_to_scrape_now:
+                queue = self.queues[scraper_id]
+                limiter = self.concurrency_limiters[scraper_id]
+                # If the previous scrapes haven't started yet, the scraper is being throttled. Hold this round
+                # back until one of its workers frees up, rather than let its queue grow without bound.
+                if queue.qsize() >= limiter.limit:
+                    bt.logging.debug(
+                        f"Deferring scrapes for {scraper_id}: {queue.qsize()} scrapes still queued at a concurrency "
+                        + f"limit of {limiter.limit:.1f}."
+                    )
+                    self.backlogged_scraper_ids.add(scraper_id)
+                    continue
+
                 scraper = self.provider.get(scraper_id)
 
-                scrape_configs = _choose_scrape_configs(scraper_id, self.config, now)
+                scrape_configs = _choose_scrape_configs(
+                    scraper_id, self.config, now, self.scheduler
+                )
 
                 for config in scrape_configs:
                     # Use .partial here to make sure the functions arguments are copied/stored
                     # now rather than being lazily evaluated (if a lambda was used).
                     # https://pylint.readthedocs.io/en/latest/user_guide/messages/warning/cell-var-from-loop.html#cell-var-from-loop-w0640
                     bt.logging.trace(f"Adding scrape task for {scraper_id}: {config}.")
-                    self.queue.put_nowait(functools.partial(scraper.scrape, config))
+                    queue.put_nowait(
+                        functools.partial(self._scrape, scraper_id, scraper, config)
+                    )
 
                 self.tracker.on_scrape_scheduled(scraper_id, now)
 
         bt.logging.info("Coordinator shutting down. Waiting for workers to finish.")
+        if self.coverage_refresh is not None:
+            self.coverage_refresh.cancel()
+        # Queued scrapes are still run. Each worker then exits on reaching a None.
+        for scraper_id, scraper_config in self.config.scraper_configs.items():
+            for _ in range(scraper_config.max_concurrent_scrapes):
+                self.queues[scraper_id].put_nowait(None)
         await asyncio.gather(*workers)
+        bt.logging.info("Waiting for scraped data to be stored.")
+        await asyncio.get_running_loop().run_in_executor(
+            None, self.ingestion_queue.stop
+        )
+        await self._flush_scrape_yields(force=True)
+        await self.provider.close()
         bt.logging.info("Coordinator stopped.")
 
-    async def _worker(self, name):
+    async def _scrape(
+        self, scraper_id: ScraperId, scraper: Scraper, config: ScrapeConfig
+    ) -> List[DataEntity]:
+        """Performs the scrape, returning only the entities that aren't already stored.
+
+        Dropping stored entities here spares storage from rewriting them. The yield recorded with the scheduler only
+        counts new entities.
+
+        Waits for the scraper's concurrency limiter before starting, and reports how the scrape fared to it.
+        """
+        limiter = self.concurrency_limiters[scraper_id]
+        started_at = await limiter.acquire()
+        outcome = ScrapeOutcome.ERROR
+        try:
+            data_entities = await scraper.scrape(config)
+            outcome = ScrapeOutcome.SUCCESS if data_entities else ScrapeOutcome.EMPTY
+        except (asyncio.TimeoutError, TimeoutError):
+            outcome = ScrapeOutcome.TIMEOUT
+            raise
+        finally:
+            latency_seconds = time.monotonic() - started_at
+            await limiter.release(started_at, outcome)
+            bt.logging.trace(
+                f"Scrape with {scraper_id} ended with {outcome.value}. Concurrency limit is now {limiter.limit:.1f}."
+            )
+            if outcome in (ScrapeOutcome.TIMEOUT, ScrapeOutcome.ERROR):
+                self._record_scrape_yield(
+                    scraper_id, config, outcome, latency_seconds, [], []
+                )
+
+        new_entities = await asyncio.get_running_loop().run_in_executor(
+            None, self.storage.list_unstored_data_entities, data_entities
+        )
+        self._on_duplicates_dropped(
+            scraper_id, config.labels, len(data_entities), len(new_entities)
+        )
+        self.scheduler.on_scrape_completed(scraper_id, config.labels, new_entities)
+        self._record_scrape_yield(
+            scraper_id, config, outcome, latency_seconds, data_entities, new_entities
+        )
+        return new_entities
+
+    def _record_scrape_yield(
+        self,
+        scraper_id: ScraperId,
+        config: ScrapeConfig,
+        outcome: ScrapeOutcome,
+        latency_seconds: float,
+        data_entities: List[DataEntity],
+        new_entities: List[DataEntity],
+    ):
+        if self.scrape_yield_store is None:
+            return
+
+        self.scrape_yield_store.record(
+            ScrapeYield(
+                scraped_at=dt.datetime.now(tz=dt.timezone.utc),
+                scraper_id=ScraperId(scraper_id).value,
+                label=config.labels[0].value if config.labels else None,
+                outcome=outcome.value,
+                entity_count=len(data_entities),
+                new_entity_count=len(new_entities),
+                content_size_bytes=sum(e.content_size_bytes for e in data_entities),
+                new_content_size_bytes=sum(e.content_size_bytes for e in new_entities),
+                latency_seconds=latency_seconds,
+            )
+        )
+
+    async def _flush_scrape_yields(self, force: bool):
+        """Writes the recorded scrape yields off the event loop, if due or if force is set."""
+        if self.scrape_yield_store is None:
+            return
+
+        try:
+            await asyncio.get_running_loop().run_in_executor(
+                None,
+                self.scrape_yield_store.flush
+                if force
+                else self.scrape_yield_store.flush_if_due,
+            )
+        except Exception:
+            bt.logging.warning(
+                f"Failed to write scrape yields: {traceback.format_exc()}"
+            )
+
+    def _on_duplicates_dropped(
+        self,
+        scraper_id: ScraperId,
+        labels: Optional[List[DataLabel]],
+        scraped_count: int,
+        new_count: int,
+    ):
+        key = (scraper_id, labels[0].value if labels else None)
+        scraped_total, duplicate_total = self.duplicate_counts.get(key, (0, 0))
+        scraped_total += scraped_count
+        duplicate_total += scraped_count - new_count
+        self.duplicate_counts[key] = (scraped_total, duplicate_total)
+
+        if scraped_count > new_count:
+            bt.logging.debug(
+                f"Dropped {scraped_count - new_count}/{scraped_count} already stored entities scraped by "
+                + f"{scraper_id} for label {key[1]}. Duplicate rate so far: {duplicate_total / scraped_total:.1%}."
+            )
+
+    def get_duplicate_rates(self) -> Dict[Tuple[ScraperId, Optional[str]], float]:
+        """Returns the fraction of scraped entities that were already stored, by scraper and label."""
+        return {
+            key: duplicate_total / scraped_total
+            for key, (scraped_total, duplicate_total) in self.duplicate_counts.items()
+            if scraped_total > 0
+        }
+
+    def get_concurrency_limits(self) -> Dict[ScraperId, float]:
+        """Returns the current concurrency limit of each scraper."""
+        return {
+            scraper_id: limiter.limit
+            for scraper_id, limiter in self.concurrency_limiters.items()
+        }
+
+    async def _wait_for_next_scrape(self, now: dt.datetime):
+        """Sleeps until the next scrape is due, or until the loop is woken sooner."""
+        next_scrape_time = self.tracker.get_next_scrape_time(
+            self.backlogged_scraper_ids
+        )
+        # With every due scraper backlogged, only a worker finishing can make progress.
+        timeout = (
+            None
+            if next_scrape_time is None
+            else max((next_scrape_time - now).total_seconds(), 0)
+        )
+        bt.logging.trace(f"Nothing ready to scrape yet. Waiting up to {timeout}s.")
+        try:
+            await asyncio.wait_for(self.wakeup.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _worker(self, name: str, scraper_id: ScraperId, queue: asyncio.Queue):
         """A worker thread"""
-        while self.is_running:
+        while True:
             try:
                 # Wait for a scraping task to be added to the queue.
-                scrape_fn = await self.queue.get()
+                scrape_fn = await queue.get()
+                if scrape_fn is None:
+                    return
 
                 # Perform the scrape
                 data_entities = await scrape_fn()
 
-                self.storage.store_data_entities(data_entities)
-                self.queue.task_done()
+                # Waits if storage is falling behind, to slow down scraping.
+                await self.ingestion_queue.put(data_entities)
+                queue.task_done()
             except Exception as e:
                 bt.logging.error("Worker " + name + ": " + traceback.format_exc())
+            finally:
+                # A deferred round for this scraper may fit in its queue now.
+                if scraper_id in self.backlogged_scraper_ids:
+                    self.backlogged_scraper_ids.discard(scraper_id)
+                    self._wake()
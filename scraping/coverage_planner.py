@@ -0,0 +1,115 @@
+import datetime as dt
+import threading
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+import bittensor as bt
+
+from common import constants
+from common.data import DataSource
+from storage.miner.miner_storage import MinerStorage
+
+
+class CoveragePlanner:
+    """Tracks how full each (source, label, hour) bucket the miner already holds is, to direct scrapes to the emptier
+    ones.
+
+    Why? Bytes beyond the target size of a bucket add nothing, e.g. because validators cap the size of each bucket, so
+    scraping a full bucket again mostly fetches duplicates. Scrapes are better spent on buckets the miner holds
+    little of.
+
+    Coverage is read from the miner's compressed index, which the miner already keeps up to date, so no extra queries
+    are made against storage. The index only lists the largest INDEX_BUCKET_COUNT_LIMIT buckets. When it's full, a
+    bucket it leaves out may hold up to as much as the smallest one it lists, so unlisted buckets are assumed to hold
+    that much rather than nothing.
+
+    Thread safe.
+    """
+
+    # How often to re-read the compressed index. It's only refreshed by the miner every MINER_CACHE_FRESHNESS.
+    REFRESH_INTERVAL = constants.MINER_CACHE_FRESHNESS
+
+    # The most buckets the compressed index lists, largest first.
+    INDEX_BUCKET_COUNT_LIMIT = (
+        constants.DATA_ENTITY_BUCKET_COUNT_LIMIT_PER_MINER_INDEX_PROTOCOL_4
+    )
+
+    def __init__(
+        self,
+        storage: MinerStorage,
+        target_bucket_size_bytes: int = constants.DATA_ENTITY_BUCKET_SIZE_LIMIT_BYTES,
+    ):
+        self.storage = storage
+        self.target_bucket_size_bytes = target_bucket_size_bytes
+
+        self.lock = threading.Lock()
+        # The size of each bucket in the index, by source and label, then time bucket id.
+        self.sizes_by_source_and_label: Dict[
+            Tuple[DataSource, Optional[str]], Dict[int, int]
+        ] = {}
+        # The size assumed for buckets the index doesn't list: 0 unless the index was truncated.
+        self.unlisted_bucket_size_bytes = 0
+        self.last_refreshed: Optional[dt.datetime] = None
+
+    def refresh(self):
+        """Re-reads the bucket sizes from the miner's compressed index."""
+        index = self.storage.get_compressed_index()
+
+        sizes_by_source_and_label = defaultdict(dict)
+        for source, compressed_buckets in index.sources.items():
+            for compressed_bucket in compressed_buckets:
+                sizes = sizes_by_source_and_label[
+                    (DataSource(source), compressed_bucket.label)
+                ]
+                sizes.update(
+                    zip(compressed_bucket.time_bucket_ids, compressed_bucket.sizes_bytes)
+                )
+
+        listed_sizes = [
+            size
+            for sizes in sizes_by_source_and_label.values()
+            for size in sizes.values()
+        ]
+        unlisted_bucket_size_bytes = (
+            min(listed_sizes)
+            if len(listed_sizes) >= self.INDEX_BUCKET_COUNT_LIMIT
+            else 0
+        )
+
+        with self.lock:
+            self.sizes_by_source_and_label = dict(sizes_by_source_and_label)
+            self.unlisted_bucket_size_bytes = unlisted_bucket_size_bytes
+            self.last_refreshed = dt.datetime.utcnow()
+        bt.logging.trace(
+            f"CoveragePlanner refreshed coverage of {len(sizes_by_source_and_label)} labels."
+        )
+
+    def refresh_if_stale(self):
+        """Re-reads the bucket sizes if they were last read more than REFRESH_INTERVAL ago."""
+        with self.lock:
+            is_fresh = (
+                self.last_refreshed is not None
+                and dt.datetime.utcnow() - self.last_refreshed < self.REFRESH_INTERVAL
+            )
+        if not is_fresh:
+            self.refresh()
+
+    def get_unfilled_fractions(
+        self, source: DataSource, label: Optional[str], time_bucket_ids: List[int]
+    ) -> List[float]:
+        """Returns, for each time bucket, the fraction of the target size the miner is missing for the label.
+
+        Buckets the miner doesn't hold are 1.0, and buckets at or beyond the target size are 0.0. Until the first
+        refresh, every bucket is 1.0, so scrapes are chosen by age alone.
+        """
+        with self.lock:
+            sizes = self.sizes_by_source_and_label.get((source, label), {})
+            return [
+                max(
+                    1.0
+                    - sizes.get(time_bucket_id, self.unlisted_bucket_size_bytes)
+                    / self.target_bucket_size_bytes,
+                    0.0,
+                )
+                for time_bucket_id in time_bucket_ids
+            ]
@@ -1,5 +1,9 @@
 import threading
-from typing import Callable, Dict
+import traceback
+from typing import Callable, Dict, Iterable
+
+import bittensor as bt
+
 from common.data import DataSource
 from scraping.reddit.reddit_lite_scraper import RedditLiteScraper
 from scraping.reddit.reddit_custom_scraper import RedditCustomScraper
@@ -23,16 +27,53 @@ DEFAULT_FACTORIES = {
 
 
 class ScraperProvider:
-    """A scraper provider will provide the correct scraper based on the source to be scraped."""
+    """A scraper provider will provide the correct scraper based on the source to be scraped.
+
+    Each scraper is created on first use and then reused for the lifetime of the provider, so its clients and
+    sessions are shared by all callers instead of being rebuilt for every scrape or validation.
+
+    Thread safe.
+    """
 
     def __init__(
         self, factories: Dict[DataSource, Callable[[], Scraper]] = DEFAULT_FACTORIES
     ):
         self.factories = factories
+        self.lock = threading.Lock()
+        self.scrapers: Dict[ScraperId, Scraper] = {}
 
     def get(self, scraper_id: ScraperId) -> Scraper:
-        """Returns a scraper for the given scraper id."""
+        """Returns the scraper for the given scraper id, creating it if it doesn't exist yet."""
 
         assert scraper_id in self.factories, f"Scraper id {scraper_id} not supported."
 
-        return self.factories[scraper_id]()
+        with self.lock:
+            scraper = self.scrapers.get(scraper_id)
+            if scraper is None:
+                scraper = self.factories[scraper_id]()
+                self.scrapers[scraper_id] = scraper
+            return scraper
+
+    async def start(self, scraper_ids: Iterable[ScraperId]):
+        """Creates and starts the scrapers for the given ids, so their first use isn't slowed down by setup."""
+        for scraper_id in scraper_ids:
+            try:
+                await self.get(scraper_id).start()
+            except Exception:
+                bt.logging.warning(
+                    f"Failed to start scraper {scraper_id}: {traceback.format_exc()}"
+                )
+
+    async def close(self):
+        """Closes all scrapers created so far. Later calls to get create new scrapers."""
+        with self.lock:
+            scrapers = list(self.scrapers.items())
+            self.scrapers = {}
+
+        for scraper_id, scraper in scrapers:
+            try:
+                await scraper.close()
+            except Exception:
+                bt.logging.warning(
+                    f"Failed to close scraper {scraper_id}: {traceback.format_exc()}"
+                )
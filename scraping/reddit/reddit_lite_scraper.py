@@ -7,7 +7,7 @@ from common import constants
 from common.data import DataEntity, DataLabel, DataSource
 from common.date_range import DateRange
 from scraping.scraper import ScrapeConfig, Scraper, ValidationResult
-from scraping.apify import ActorRunError, ActorRunner, RunConfig
+from scraping.apify import DEFAULT_ACTOR_RUNNER, ActorRunError, ActorRunner, RunConfig
 from scraping.reddit.model import RedditContent, RedditDataType
 from scraping.reddit.utils import (
     is_valid_reddit_url,
@@ -41,7 +41,7 @@ class RedditLiteScraper(Scraper):
         "searchPosts": True,
     }
 
-    def __init__(self, runner: ActorRunner = ActorRunner()):
+    def __init__(self, runner: ActorRunner = DEFAULT_ACTOR_RUNNER):
         self.runner = runner
 
     async def validate(self, entities: List[DataEntity]) -> List[ValidationResult]:
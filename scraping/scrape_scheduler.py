@@ -0,0 +1,175 @@
+import datetime as dt
+import random
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import bittensor as bt
+
+from common import time_buckets
+from common.data import DataEntity, DataLabel, DataSource
+from common.date_range import DateRange
+from rewards import data_desirability_lookup
+from rewards.data import DataDesirabilityLookup, PrimitiveDataDesirabilityLookup
+from scraping.coverage_planner import CoveragePlanner
+from scraping.scraper import ScraperId
+
+
+# The DataSource each scraper scrapes, from the prefix of its ScraperId.
+_SOURCE_BY_SCRAPER_ID_PREFIX = {
+    "Reddit": DataSource.REDDIT,
+    "X": DataSource.X,
+    "YouTube": DataSource.YOUTUBE,
+}
+
+
+def source_for_scraper_id(scraper_id: ScraperId) -> DataSource:
+    """Returns the DataSource that the scraper scrapes."""
+    # CoordinatorConfig stores ScraperIds by value, so accept either.
+    return _SOURCE_BY_SCRAPER_ID_PREFIX[ScraperId(scraper_id).value.split(".", 1)[0]]
+
+
+class ScrapeScheduler:
+    """Chooses what each scrape should fetch, in proportion to the reward it's expected to earn.
+
+    Every scrape costs roughly the same, one run of the scraper, so choosing by expected reward per scrape is
+    choosing by expected reward per unit of cost. For a label, that's the reward validators give its bytes under the
+    current DataDesirabilityLookup, times the bytes a scrape of it has recently yielded. Within a label, each hour
+    is chosen in proportion to the reward validators give data of its age, times the fraction of the hour's bucket
+    the miner is still missing, if a CoveragePlanner is provided.
+
+    A share of EXPLORATION_RATE of scrapes choose labels uniformly, so labels that yielded little keep being sampled
+    and their yield estimates recover if they start yielding more.
+
+    Thread safe.
+    """
+
+    # The fraction of scrapes that choose a label uniformly, regardless of its expected reward.
+    EXPLORATION_RATE = 0.1
+
+    # How much each completed scrape moves the yield estimate for its label.
+    YIELD_ALPHA = 0.3
+
+    def __init__(
+        self,
+        lookup: DataDesirabilityLookup = data_desirability_lookup.LOOKUP,
+        rng: random.Random = random,
+        coverage_planner: Optional[CoveragePlanner] = None,
+    ):
+        self.rng = rng
+        self.coverage_planner = coverage_planner
+        self.lock = threading.Lock()
+        self.lookup: PrimitiveDataDesirabilityLookup = (
+            DataDesirabilityLookup.to_primitive_data_desirability_lookup(lookup)
+        )
+        # The moving average of content bytes yielded per scrape, by scraper and label. None is the "all" label.
+        self.yield_bytes: Dict[Tuple[ScraperId, Optional[str]], float] = {}
+
+    def set_lookup(self, lookup: DataDesirabilityLookup):
+        """Replaces the DataDesirabilityLookup that scrapes are chosen by."""
+        primitive_lookup = DataDesirabilityLookup.to_primitive_data_desirability_lookup(
+            lookup
+        )
+        with self.lock:
+            self.lookup = primitive_lookup
+        bt.logging.info("ScrapeScheduler is now using the updated desirability lookup.")
+
+    def on_scrape_completed(
+        self,
+        scraper_id: ScraperId,
+        labels: Optional[List[DataLabel]],
+        data_entities: List[DataEntity],
+    ):
+        """Records the yield of a scrape, to inform which labels later scrapes choose."""
+        label = labels[0].value if labels else None
+        content_bytes = sum(entity.content_size_bytes for entity in data_entities)
+        key = (scraper_id, label)
+        with self.lock:
+            previous = self.yield_bytes.get(key)
+            if previous is None:
+                self.yield_bytes[key] = float(content_bytes)
+            else:
+                self.yield_bytes[key] = (
+                    self.YIELD_ALPHA * content_bytes + (1 - self.YIELD_ALPHA) * previous
+                )
+
+    def choose_label(
+        self, scraper_id: ScraperId, label_choices: Optional[List[DataLabel]]
+    ) -> Optional[List[DataLabel]]:
+        """Chooses the labels to scrape from label_choices, or None to scrape "all" if there are no choices."""
+        if not label_choices:
+            return None
+        if self.rng.random() < self.EXPLORATION_RATE:
+            return [self.rng.choice(label_choices)]
+
+        with self.lock:
+            desirability = self.lookup.distribution[source_for_scraper_id(scraper_id)]
+            # Labels without an observed yield are assumed to yield as much as the best label, so each is tried.
+            observed = [
+                self.yield_bytes[(scraper_id, label.value)]
+                for label in label_choices
+                if (scraper_id, label.value) in self.yield_bytes
+            ]
+            unobserved_yield = max(observed, default=1.0) or 1.0
+            weights = [
+                desirability.weight
+                # Undesirable labels earn nothing, rather than a negative weight.
+                * max(
+                    desirability.label_scale_factors.get(
+                        label.value, desirability.default_scale_factor
+                    ),
+                    0.0,
+                )
+                * self.yield_bytes.get((scraper_id, label.value), unobserved_yield)
+                for label in label_choices
+            ]
+
+        if sum(weights) <= 0:
+            return [self.rng.choice(label_choices)]
+        return self.rng.choices(label_choices, weights=weights)
+
+    def choose_date_range(
+        self,
+        max_age_minutes: int,
+        now: dt.datetime,
+        scraper_id: Optional[ScraperId] = None,
+        labels: Optional[List[DataLabel]] = None,
+    ) -> DateRange:
+        """Chooses the hour to scrape, within max_age_minutes of now.
+
+        Hours are weighted by the reward validators give data of their age. Hours older than the lookup's max age
+        earn nothing, so aren't chosen unless there's nothing newer to choose.
+
+        If a scraper_id and label are provided, hours are also weighted by how much of their bucket for that label
+        the miner is missing. If the miner already holds every bucket in full, hours are weighted by age alone.
+        """
+        with self.lock:
+            max_age_in_hours = self.lookup.max_age_in_hours
+
+        now_timestamp = now.timestamp()
+        current_bucket_id = time_buckets.id_from_timestamp(now_timestamp)
+        oldest_bucket_id = max(
+            time_buckets.id_from_timestamp(now_timestamp - max_age_minutes * 60),
+            current_bucket_id - max_age_in_hours,
+        )
+        if oldest_bucket_id >= current_bucket_id:
+            return time_buckets.to_date_range(current_bucket_id)
+
+        bucket_ids = range(oldest_bucket_id, current_bucket_id + 1)
+        weights = [
+            1.0 - time_buckets.age_in_hours(bucket_id, current_bucket_id) / (2 * max_age_in_hours)
+            for bucket_id in bucket_ids
+        ]
+        # Scrapes of "all" land in buckets of whichever labels the data has, so their coverage can't be targeted.
+        if self.coverage_planner and scraper_id and labels:
+            unfilled_fractions = self.coverage_planner.get_unfilled_fractions(
+                source_for_scraper_id(scraper_id), labels[0].value, list(bucket_ids)
+            )
+            coverage_weights = [
+                weight * unfilled
+                for weight, unfilled in zip(weights, unfilled_fractions)
+            ]
+            if sum(coverage_weights) > 0:
+                weights = coverage_weights
+
+        chosen_bucket_id = self.rng.choices(bucket_ids, weights=weights)[0]
+        return time_buckets.to_date_range(chosen_bucket_id)
@@ -0,0 +1,227 @@
+import contextlib
+import dataclasses
+import datetime as dt
+import sqlite3
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import bittensor as bt
+
+
+@dataclasses.dataclass(frozen=True)
+class ScrapeYield:
+    """What a single scrape produced."""
+
+    # When the scrape ended.
+    scraped_at: dt.datetime
+
+    scraper_id: str
+
+    # The label scraped, or None if the scrape was for "all".
+    label: Optional[str]
+
+    # The ScrapeOutcome of the scrape.
+    outcome: str
+
+    # The number of entities scraped, and how many of them weren't already stored.
+    entity_count: int
+    new_entity_count: int
+
+    # The content size of the entities scraped, and of those that weren't already stored.
+    content_size_bytes: int
+    new_content_size_bytes: int
+
+    latency_seconds: float
+
+
+@dataclasses.dataclass(frozen=True)
+class ScrapeYieldSummary:
+    """The combined yield of a group of scrapes."""
+
+    scrape_count: int
+    # The number of scrapes that returned no entities, timed out or failed.
+    unproductive_scrape_count: int
+    entity_count: int
+    new_entity_count: int
+    content_size_bytes: int
+    new_content_size_bytes: int
+    total_latency_seconds: float
+
+    @property
+    def duplicate_rate(self) -> float:
+        """The fraction of scraped entities that were already stored."""
+        if self.entity_count == 0:
+            return 0.0
+        return 1 - self.new_entity_count / self.entity_count
+
+    @property
+    def new_bytes_per_scrape(self) -> float:
+        return self.new_content_size_bytes / self.scrape_count if self.scrape_count else 0.0
+
+    @property
+    def mean_latency_seconds(self) -> float:
+        return self.total_latency_seconds / self.scrape_count if self.scrape_count else 0.0
+
+
+class ScrapeYieldStore:
+    """Keeps a local SQLite record of what each scrape produced, to tune the scraping config by.
+
+    Recording is cheap enough to leave on: record() only appends to an in-memory buffer, and the buffer is written in a
+    single transaction by flush_if_due(), which the coordinator calls off its event loop. Records older than RETENTION
+    are deleted as new ones are written.
+
+    Thread safe.
+    """
+
+    SCRAPE_YIELD_TABLE_CREATE = """CREATE TABLE IF NOT EXISTS ScrapeYield (
+                                scrapedAt               INTEGER     NOT NULL,
+                                scraperId               TEXT        NOT NULL,
+                                label                   TEXT                ,
+                                outcome                 TEXT        NOT NULL,
+                                entityCount             INTEGER     NOT NULL,
+                                newEntityCount          INTEGER     NOT NULL,
+                                contentSizeBytes        INTEGER     NOT NULL,
+                                newContentSizeBytes     INTEGER     NOT NULL,
+                                latencySeconds          REAL        NOT NULL
+                                )"""
+
+    SCRAPE_YIELD_TABLE_INDEX = """CREATE INDEX IF NOT EXISTS scrape_yield_scraped_at_index
+                                ON ScrapeYield (scrapedAt)"""
+
+    # The aggregates selected for each group of scrapes, in the order of ScrapeYieldSummary's fields.
+    SUMMARY_COLUMNS = """COUNT(*),
+                        SUM(outcome != 'success'),
+                        SUM(entityCount),
+                        SUM(newEntityCount),
+                        SUM(contentSizeBytes),
+                        SUM(newContentSizeBytes),
+                        SUM(latencySeconds)"""
+
+    # How often buffered records are written, at most.
+    FLUSH_INTERVAL = dt.timedelta(minutes=1)
+
+    # The number of buffered records at which they're written, regardless of FLUSH_INTERVAL.
+    MAX_BUFFERED_RECORDS = 1_000
+
+    # How long records are kept.
+    RETENTION = dt.timedelta(days=30)
+
+    def __init__(self, database: str = "ScrapeYields.sqlite"):
+        self.database = database
+
+        with contextlib.closing(self._create_connection()) as connection:
+            cursor = connection.cursor()
+            cursor.execute(ScrapeYieldStore.SCRAPE_YIELD_TABLE_CREATE)
+            cursor.execute(ScrapeYieldStore.SCRAPE_YIELD_TABLE_INDEX)
+            # Use Write Ahead Logging to avoid blocking reads.
+            cursor.execute("pragma journal_mode=wal")
+
+        self.lock = threading.Lock()
+        self.buffer: List[ScrapeYield] = []
+        self.last_flushed = dt.datetime.now()
+        # Serializes writes, so records are written in order.
+        self.flush_lock = threading.Lock()
+
+    def _create_connection(self):
+        return sqlite3.connect(self.database, timeout=60.0)
+
+    def record(self, scrape_yield: ScrapeYield):
+        """Buffers the record, to be written by the next flush."""
+        with self.lock:
+            self.buffer.append(scrape_yield)
+
+    def flush_if_due(self):
+        """Writes the buffered records if FLUSH_INTERVAL has passed or enough have been buffered."""
+        with self.lock:
+            is_due = (
+                len(self.buffer) >= self.MAX_BUFFERED_RECORDS
+                or dt.datetime.now() - self.last_flushed >= self.FLUSH_INTERVAL
+            )
+        if is_due:
+            self.flush()
+
+    def flush(self):
+        """Writes the buffered records, and deletes those older than RETENTION."""
+        with self.flush_lock:
+            with self.lock:
+                records, self.buffer = self.buffer, []
+                self.last_flushed = dt.datetime.now()
+
+            if not records:
+                return
+
+            oldest_kept = dt.datetime.now(tz=dt.timezone.utc) - self.RETENTION
+            try:
+                with contextlib.closing(self._create_connection()) as connection:
+                    with connection:
+                        connection.executemany(
+                            "INSERT INTO ScrapeYield VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                            [
+                                (
+                                    int(record.scraped_at.timestamp()),
+                                    record.scraper_id,
+                                    record.label,
+                                    record.outcome,
+                                    record.entity_count,
+                                    record.new_entity_count,
+                                    record.content_size_bytes,
+                                    record.new_content_size_bytes,
+                                    record.latency_seconds,
+                                )
+                                for record in records
+                            ],
+                        )
+                        connection.execute(
+                            "DELETE FROM ScrapeYield WHERE scrapedAt < ?",
+                            [int(oldest_kept.timestamp())],
+                        )
+            except sqlite3.Error as e:
+                # The records are only used for analysis, so they're dropped rather than retried.
+                bt.logging.warning(f"Failed to write {len(records)} scrape yields: {e}.")
+
+    def get_yield_by_scraper_and_label(
+        self, since: dt.datetime
+    ) -> Dict[Tuple[str, Optional[str]], ScrapeYieldSummary]:
+        """Returns the yield of the scrapes since the given time, by scraper id and label."""
+        self.flush()
+        with contextlib.closing(self._create_connection()) as connection:
+            rows = connection.execute(
+                f"""SELECT scraperId, label, {ScrapeYieldStore.SUMMARY_COLUMNS} FROM ScrapeYield
+                    WHERE scrapedAt >= ?
+                    GROUP BY scraperId, label""",
+                [int(since.timestamp())],
+            ).fetchall()
+
+        return {(row[0], row[1]): ScrapeYieldSummary(*row[2:]) for row in rows}
+
+    def get_yield_by_hour(
+        self,
+        since: dt.datetime,
+        scraper_id: Optional[str] = None,
+        label: Optional[str] = None,
+    ) -> Dict[dt.datetime, ScrapeYieldSummary]:
+        """Returns the yield of the scrapes since the given time, by the UTC hour they ended in.
+
+        Optionally only includes the scrapes with the given scraper id and/or label.
+        """
+        self.flush()
+        query = f"""SELECT scrapedAt / 3600, {ScrapeYieldStore.SUMMARY_COLUMNS} FROM ScrapeYield
+                    WHERE scrapedAt >= ?"""
+        parameters = [int(since.timestamp())]
+        if scraper_id is not None:
+            query += " AND scraperId = ?"
+            parameters.append(scraper_id)
+        if label is not None:
+            query += " AND label = ?"
+            parameters.append(label)
+        query += " GROUP BY scrapedAt / 3600"
+
+        with contextlib.closing(self._create_connection()) as connection:
+            rows = connection.execute(query, parameters).fetchall()
+
+        return {
+            dt.datetime.fromtimestamp(row[0] * 3600, tz=dt.timezone.utc): ScrapeYieldSummary(
+                *row[1:]
+            )
+            for row in rows
+        }
@@ -98,7 +98,21 @@ class ScrapingDistribution(StrictBaseModel):
 
 
 class Scraper(abc.ABC):
-    """An abstract base class for scrapers across all data sources."""
+    """An abstract base class for scrapers across all data sources.
+
+    Scrapers are long-lived: a ScraperProvider creates one instance per ScraperId and shares it between all callers,
+    which may be on different threads and event loops. Expensive clients should therefore be created once, and
+    anything bound to an event loop must not be held across calls.
+    """
+
+    async def start(self):
+        """Prepares the scraper before its first use, e.g. by warming up clients. Optional: scrapers must also work
+        if it isn't called."""
+        pass
+
+    async def close(self):
+        """Releases any clients and sessions held by the scraper. The scraper isn't used after this is called."""
+        pass
 
     @abc.abstractmethod
     async def validate(self, entities: List[DataEntity]) -> List[ValidationResult]:
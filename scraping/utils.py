@@ -1,4 +1,7 @@
+import asyncio
 import datetime as dt
+import threading
+import weakref
 
 
 def obfuscate_datetime_to_minute(datetime_to_obfuscate: dt.datetime) -> dt.datetime:
@@ -11,3 +14,29 @@ def obfuscate_datetime_to_minute(datetime_to_obfuscate: dt.datetime) -> dt.datet
         dt.datetime: obfuscated datetime.
     """
     return datetime_to_obfuscate.replace(second=0, microsecond=0)
+
+
+class LoopLocalSemaphore:
+    """Limits concurrency with one asyncio.Semaphore per event loop, for limits shared by callers on any loop.
+
+    Why? An asyncio.Semaphore can only be used on one event loop. A threading semaphore held across awaits blocks the
+    event loop while waiting, and deadlocks when the holders it waits for run on that same loop.
+
+    Thread safe.
+    """
+
+    def __init__(self, value: int):
+        self.value = value
+        self.lock = threading.Lock()
+        # The semaphore for each event loop, dropped along with the loop.
+        self.semaphores = weakref.WeakKeyDictionary()
+
+    def get(self) -> asyncio.Semaphore:
+        """Returns the semaphore for the running event loop."""
+        loop = asyncio.get_running_loop()
+        with self.lock:
+            semaphore = self.semaphores.get(loop)
+            if semaphore is None:
+                semaphore = asyncio.Semaphore(self.value)
+                self.semaphores[loop] = semaphore
+            return semaphore
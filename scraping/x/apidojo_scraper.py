@@ -2,14 +2,15 @@ import asyncio
 import threading
 import traceback
 import bittensor as bt
-from typing import List, Tuple
+from typing import Dict, List, Tuple
 from common import constants
 from common.data import DataEntity, DataLabel, DataSource
 from common.date_range import DateRange
 from scraping.scraper import ScrapeConfig, Scraper, ValidationResult, HFValidationResult
-from scraping.apify import ActorRunner, RunConfig
+from scraping.apify import DEFAULT_ACTOR_RUNNER, ActorRunner, RunConfig
 from scraping.x.model import XContent
 from scraping.x import utils
+from scraping.utils import LoopLocalSemaphore
 import datetime as dt
 
 
@@ -27,13 +28,35 @@ class ApiDojoTwitterScraper(Scraper):
     }
 
     # As of 2/5/24 this actor only takes 256 MB in the default config so we can run a full batch without hitting shared actor memory limits.
-    concurrent_validates_semaphore = threading.BoundedSemaphore(20)
+    concurrent_validates_semaphore = LoopLocalSemaphore(20)
 
-    def __init__(self, runner: ActorRunner = ActorRunner()):
+    # The most tweet URLs fetched in a single actor run when validating in batches.
+    MAX_URLS_PER_VALIDATION_RUN = 50
+
+    # The items allowed per URL in a batched validation run, so replies or quoted tweets returned for one URL don't
+    # crowd out the tweets of others. Capped at MAX_ITEMS_PER_VALIDATION_RUN.
+    ITEMS_PER_URL_IN_VALIDATION_RUN = 2
+    MAX_ITEMS_PER_VALIDATION_RUN = 100
+
+    def __init__(
+        self, runner: ActorRunner = DEFAULT_ACTOR_RUNNER, batch_validate: bool = True
+    ):
         self.runner = runner
+        # If set, validate first fetches all the entities' tweets in as few actor runs as possible.
+        self.batch_validate = batch_validate
+        # The number of entities validated from batched runs, and of those that had to fall back to a run of their
+        # own, to measure how much batching saves.
+        self.batch_validated_count = 0
+        self.fallback_validated_count = 0
 
     async def validate(self, entities: List[DataEntity]) -> List[ValidationResult]:
-        """Validate the correctness of a DataEntity by URI."""
+        """Validate the correctness of a DataEntity by URI.
+
+        In batch mode, the tweets are first fetched together. Entities whose tweet wasn't among them are then validated
+        one by one, so each entity's result is the same as without batching.
+        """
+        # The tweets fetched in batch, by normalized URL.
+        fetched_tweets: Dict[str, Tuple[XContent, bool]] = {}
 
         async def validate_entity(entity) -> ValidationResult:
             if not utils.is_valid_twitter_url(entity.uri):
@@ -42,6 +65,16 @@ class ApiDojoTwitterScraper(Scraper):
                     reason="Invalid URI.",
                     content_size_bytes_validated=entity.content_size_bytes,
                 )
+
+            fetched_tweet = fetched_tweets.get(utils.normalize_url(entity.uri))
+            if fetched_tweet is not None:
+                actual_tweet, is_retweet = fetched_tweet
+                return utils.validate_tweet_content(
+                    actual_tweet=actual_tweet,
+                    entity=entity,
+                    is_retweet=is_retweet
+                )
+
             attempt = 0
             max_attempts = 2
 
@@ -117,19 +150,92 @@ class ApiDojoTwitterScraper(Scraper):
         if not entities:
             return []
 
-        # Since we are using the threading.semaphore we need to use it in a context outside of asyncio.
         bt.logging.trace("Acquiring semaphore for concurrent apidojo validations.")
 
-        with ApiDojoTwitterScraper.concurrent_validates_semaphore:
+        async with ApiDojoTwitterScraper.concurrent_validates_semaphore.get():
             bt.logging.trace(
                 "Acquired semaphore for concurrent apidojo validations."
             )
+            if self.batch_validate:
+                uris = [
+                    entity.uri
+                    for entity in entities
+                    if utils.is_valid_twitter_url(entity.uri)
+                ]
+                fetched_tweets.update(await self._fetch_tweets_by_url(uris))
+                # A single URL isn't batched, so it doesn't count as falling back.
+                if len(set(uris)) > 1:
+                    fallback_count = sum(
+                        1
+                        for uri in uris
+                        if utils.normalize_url(uri) not in fetched_tweets
+                    )
+                    self.batch_validated_count += len(uris) - fallback_count
+                    self.fallback_validated_count += fallback_count
+                    bt.logging.debug(
+                        f"Fetched {len(uris) - fallback_count} of {len(uris)} tweets in batch. {fallback_count} fall "
+                        + f"back to a run each. {self.fallback_validated_count} of "
+                        + f"{self.batch_validated_count + self.fallback_validated_count} have fallen back so far."
+                    )
             results = await asyncio.gather(
                 *[validate_entity(entity) for entity in entities]
             )
 
         return results
 
+    async def _fetch_tweets_by_url(
+        self, urls: List[str]
+    ) -> Dict[str, Tuple[XContent, bool]]:
+        """Fetches the tweets at the given URLs in as few actor runs as possible.
+
+        Returns each tweet found, and whether it's a retweet, by normalized URL. Tweets that weren't found, including
+        those of failed runs, are left out.
+        """
+        urls = list(dict.fromkeys(urls))
+        # A single URL is fetched just as cheaply one entity at a time.
+        if len(urls) < 2:
+            return {}
+
+        async def fetch_batch(batch: List[str]) -> List[dict]:
+            max_items = min(
+                len(batch) * ApiDojoTwitterScraper.ITEMS_PER_URL_IN_VALIDATION_RUN,
+                ApiDojoTwitterScraper.MAX_ITEMS_PER_VALIDATION_RUN,
+            )
+            run_input = {
+                **ApiDojoTwitterScraper.BASE_RUN_INPUT,
+                "startUrls": batch,
+                "maxItems": max_items,
+            }
+            run_config = RunConfig(
+                actor_id=ApiDojoTwitterScraper.ACTOR_ID,
+                debug_info=f"Validate {len(batch)} tweets",
+                max_data_entities=max_items,
+            )
+            try:
+                return await self.runner.run(run_config, run_input)
+            except Exception:
+                # The entities are validated one by one instead.
+                bt.logging.warning(
+                    f"Failed to validate {len(batch)} tweets in batch: {traceback.format_exc()}."
+                )
+                return []
+
+        datasets = await asyncio.gather(
+            *[
+                fetch_batch(urls[i : i + self.MAX_URLS_PER_VALIDATION_RUN])
+                for i in range(0, len(urls), self.MAX_URLS_PER_VALIDATION_RUN)
+            ]
+        )
+
+        fetched_tweets = {}
+        for dataset in datasets:
+            tweets, is_retweets = self._best_effort_parse_dataset(dataset)
+            for tweet, is_retweet in zip(tweets, is_retweets):
+                fetched_tweets.setdefault(
+                    utils.normalize_url(tweet.url), (tweet, is_retweet)
+                )
+        return fetched_tweets
+
     async def validate_hf(self, entities) -> HFValidationResult:
         """Validate the correctness of a HFEntities by URL."""
 
@@ -210,10 +316,9 @@ class ApiDojoTwitterScraper(Scraper):
                         tweet_to_verify=entity
                     )
 
-        # Since we are using the threading.semaphore we need to use it in a context outside of asyncio.
         bt.logging.trace("Acquiring semaphore for concurrent apidojo validations.")
 
-        with ApiDojoTwitterScraper.concurrent_validates_semaphore:
+        async with ApiDojoTwitterScraper.concurrent_validates_semaphore.get():
             bt.logging.trace(
                 "Acquired semaphore for concurrent apidojo validations."
             )
@@ -7,7 +7,7 @@ from common import constants
 from common.data import DataEntity, DataLabel, DataSource
 from common.date_range import DateRange
 from scraping.scraper import ScrapeConfig, Scraper, ValidationResult, HFValidationResult
-from scraping.apify import ActorRunner, RunConfig
+from scraping.apify import DEFAULT_ACTOR_RUNNER, ActorRunner, RunConfig
 from scraping.x.model import XContent
 from scraping.x.apidojo_scraper import ApiDojoTwitterScraper
 from scraping.x import utils
@@ -26,7 +26,7 @@ class EnhancedApiDojoTwitterScraper(ApiDojoTwitterScraper):
 
     def __init__(self, runner: ActorRunner = None):
         # Initialize the parent class
-        super().__init__(runner=runner or ActorRunner())
+        super().__init__(runner=runner or DEFAULT_ACTOR_RUNNER)
 
     def _best_effort_parse_dataset(self, dataset: List[dict]) -> Tuple[List[XContent], List[bool]]:
         """
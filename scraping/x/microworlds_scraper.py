@@ -7,9 +7,10 @@ from common import constants
 from common.data import DataEntity, DataLabel, DataSource
 from common.date_range import DateRange
 from scraping.scraper import ScrapeConfig, Scraper, ValidationResult, HFValidationResult
-from scraping.apify import ActorRunner, RunConfig
+from scraping.apify import DEFAULT_ACTOR_RUNNER, ActorRunner, RunConfig
 from scraping.x.model import XContent
 from scraping.x import utils
+from scraping.utils import LoopLocalSemaphore
 import datetime as dt
 
 
@@ -28,9 +29,9 @@ class MicroworldsTwitterScraper(Scraper):
     }
 
     # As of 2/5/24 this actor only takes 256 MB in the default config so we can run a full batch without hitting shared actor memory limits.
-    concurrent_validates_semaphore = threading.BoundedSemaphore(20)
+    concurrent_validates_semaphore = LoopLocalSemaphore(20)
 
-    def __init__(self, runner: ActorRunner = ActorRunner()):
+    def __init__(self, runner: ActorRunner = DEFAULT_ACTOR_RUNNER):
         self.runner = runner
 
     async def validate(self, entities: List[DataEntity]) -> List[ValidationResult]:
@@ -115,9 +116,8 @@ class MicroworldsTwitterScraper(Scraper):
         if not entities:
             return []
 
-        # Since we are using the threading.semaphore we need to use it in a context outside of asyncio.
         bt.logging.trace("Acquiring semaphore for concurrent microworlds validations.")
-        with MicroworldsTwitterScraper.concurrent_validates_semaphore:
+        async with MicroworldsTwitterScraper.concurrent_validates_semaphore.get():
             bt.logging.trace(
                 "Acquired semaphore for concurrent microworlds validations."
             )
@@ -207,10 +207,9 @@ class MicroworldsTwitterScraper(Scraper):
                         tweet_to_verify=entity
                     )
 
-        # Since we are using the threading.semaphore we need to use it in a context outside of asyncio.
         bt.logging.trace("Acquiring semaphore for concurrent apidojo validations.")
 
-        with MicroworldsTwitterScraper.concurrent_validates_semaphore:
+        async with MicroworldsTwitterScraper.concurrent_validates_semaphore.get():
             bt.logging.trace(
                 "Acquired semaphore for concurrent apidojo validations."
             )
@@ -302,10 +301,9 @@ class MicroworldsTwitterScraper(Scraper):
                         tweet_to_verify=entity
                     )
 
-        # Since we are using the threading.semaphore we need to use it in a context outside of asyncio.
         bt.logging.trace("Acquiring semaphore for concurrent apidojo validations.")
 
-        with MicroworldsTwitterScraper.concurrent_validates_semaphore:
+        async with MicroworldsTwitterScraper.concurrent_validates_semaphore.get():
             bt.logging.trace(
                 "Acquired semaphore for concurrent apidojo validations."
             )
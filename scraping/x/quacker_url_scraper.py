@@ -5,7 +5,7 @@ from typing import List
 from common import constants
 from common.data import DataEntity, DataLabel, DataSource
 from scraping.scraper import ScrapeConfig, Scraper, ValidationResult
-from scraping.apify import ActorRunner, RunConfig
+from scraping.apify import DEFAULT_ACTOR_RUNNER, ActorRunner, RunConfig
 from scraping.x.microworlds_scraper import test_scrape
 from scraping.x.model import XContent
 from scraping.x import utils
@@ -27,7 +27,7 @@ class QuackerUrlScraper(Scraper):
         "addUserInfo": False,
     }
 
-    def __init__(self, runner: ActorRunner = ActorRunner()):
+    def __init__(self, runner: ActorRunner = DEFAULT_ACTOR_RUNNER):
         self.runner = runner
 
     async def validate(self, entities: List[DataEntity]) -> List[ValidationResult]:
@@ -3,7 +3,9 @@ import hashlib
 import traceback
 import random
 import re
+import threading
 import bittensor as bt
+import requests
 from typing import List, Dict, Any, Optional, Tuple
 import datetime as dt
 import os
@@ -70,6 +72,64 @@ class YouTubeTranscriptScraper(Scraper):
         except Exception as e:
             bt.logging.error(f"Failed to initialize YouTube API client: {str(e)}")
             self.youtube = None
+        # The YouTube API client's HTTP connection isn't thread safe, and this scraper is shared across threads.
+        # Only taken off the event loop, by _execute.
+        self.youtube_lock = threading.Lock()
+
+        # Transcript API clients (and their HTTP sessions) aren't thread safe either, so one is kept per thread
+        # and reused across scrapes.
+        self.transcript_apis = threading.local()
+        self.transcript_sessions: List[requests.Session] = []
+        self.transcript_sessions_lock = threading.Lock()
+
+    def _get_transcript_api(self) -> YouTubeTranscriptApi:
+        """Returns the calling thread's transcript API client, creating it on first use."""
+        ytt_api = getattr(self.transcript_apis, "api", None)
+        if ytt_api is None:
+            if os.getenv('WEB_SHARE_PROXY_USERNAME', None):
+                proxy_config = WebshareProxyConfig(
+                    proxy_username=os.getenv('WEB_SHARE_PROXY_USERNAME'),
+                    proxy_password=os.getenv('WEB_SHARE_PROXY_PASSWORD'),
+                )
+            else:
+                proxy_config = None
+            session = requests.Session()
+            with self.transcript_sessions_lock:
+                self.transcript_sessions.append(session)
+            ytt_api = YouTubeTranscriptApi(proxy_config=proxy_config, http_client=session)
+            self.transcript_apis.api = ytt_api
+        return ytt_api
+
+    async def _fetch_transcript(self, video_id: str) -> List[Dict[str, Any]]:
+        """Fetches the video's transcript on a worker thread, so the HTTP calls don't block the event loop."""
+        return await asyncio.to_thread(
+            lambda: self._get_transcript_api().fetch(video_id).to_raw_data()
+        )
+
+    def _execute_locked(self, request) -> Dict[str, Any]:
+        with self.youtube_lock:
+            return request.execute()
+
+    async def _execute(self, request) -> Dict[str, Any]:
+        """Executes a YouTube API request on a worker thread, so neither the HTTP call nor waiting for the client
+        blocks the event loop."""
+        return await asyncio.to_thread(self._execute_locked, request)
+
+    async def close(self):
+        """Closes the HTTP connections held by the API clients."""
+        with self.transcript_sessions_lock:
+            sessions, self.transcript_sessions = self.transcript_sessions, []
+        for session in sessions:
+            session.close()
+        # Threads that already have a client will create a new one on next use.
+        self.transcript_apis = threading.local()
+
+        if self.youtube is not None:
+            await asyncio.to_thread(self._close_youtube_client)
+
+    def _close_youtube_client(self):
+        with self.youtube_lock:
+            self.youtube.close()
 
     async def scrape(self, scrape_config: ScrapeConfig) -> List[DataEntity]:
         """
@@ -695,10 +755,12 @@ class YouTubeTranscriptScraper(Scraper):
 
         try:
             # Make API request
-            response = self.youtube.videos().list(
-                id=video_id,
-                part="snippet,contentDetails,statistics"
-            ).execute()
+            response = await self._execute(
+                self.youtube.videos().list(
+                    id=video_id,
+                    part="snippet,contentDetails,statistics"
+                )
+            )
 
             if not response.get("items"):
                 bt.logging.warning(f"Video {video_id} not found or private")
@@ -771,17 +833,7 @@ class YouTubeTranscriptScraper(Scraper):
         try:
             # Get the transcript for the video directly
 
-            if os.getenv('WEB_SHARE_PROXY_USERNAME', None):
-                proxy_config = WebshareProxyConfig(
-                    proxy_username=os.getenv('WEB_SHARE_PROXY_USERNAME'),
-                    proxy_password=os.getenv('WEB_SHARE_PROXY_PASSWORD'),
-                )
-            else:
-                proxy_config = None
-            ytt_api = YouTubeTranscriptApi(
-                proxy_config=proxy_config
-            )
-            transcript_data = ytt_api.fetch(video_id).to_raw_data()
+            transcript_data = await self._fetch_transcript(video_id)
             # The transcript_data is already a list of dictionaries with the format we need
             # Each item has keys: 'text', 'start', 'duration'
             return transcript_data
@@ -842,10 +894,12 @@ class YouTubeTranscriptScraper(Scraper):
                 end_date = end_date.replace(tzinfo=dt.timezone.utc)
 
             # Get channel uploads playlist
-            channels_response = self.youtube.channels().list(
-                id=channel_id,
-                part="contentDetails,snippet"
-            ).execute()
+            channels_response = await self._execute(
+                self.youtube.channels().list(
+                    id=channel_id,
+                    part="contentDetails,snippet"
+                )
+            )
 
             if not channels_response.get("items"):
                 bt.logging.warning(f"Channel {channel_id} not found")
@@ -867,11 +921,13 @@ class YouTubeTranscriptScraper(Scraper):
                 api_calls += 1
 
                 try:
-                    playlist_response = self.youtube.playlistItems().list(
-                        playlistId=uploads_playlist_id,
-                        part="snippet,contentDetails",
-                        maxResults=50  # Maximum allowed by API
-                    ).execute()
+                    playlist_response = await self._execute(
+                        self.youtube.playlistItems().list(
+                            playlistId=uploads_playlist_id,
+                            part="snippet,contentDetails",
+                            maxResults=50  # Maximum allowed by API
+                        )
+                    )
 
                     if not playlist_response.get("items"):
                         bt.logging.info("No more items in playlist")
@@ -914,19 +970,7 @@ class YouTubeTranscriptScraper(Scraper):
 
                         # Check for transcript availability
                         try:
-                            # transcript = YouTubeTranscriptApi.get_transcript(video_id)
-                            if os.getenv('WEB_SHARE_PROXY_USERNAME', None):
-                                proxy_config = WebshareProxyConfig(
-                                    proxy_username= os.getenv('WEB_SHARE_PROXY_USERNAME'),
-                                    proxy_password=os.getenv('WEB_SHARE_PROXY_PASSWORD'),
-                                )
-                            else:
-                                proxy_config = None
-                            ytt_api = YouTubeTranscriptApi(
-                                proxy_config=proxy_config
-                            )
-
-                            transcript = ytt_api.fetch(video_id).to_raw_data()
+                            transcript = await self._fetch_transcript(video_id)
                             if transcript:
                                 videos.append({
                                     "id": video_id,
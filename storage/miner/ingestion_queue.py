@@ -0,0 +1,157 @@
+import asyncio
+import collections
+import threading
+import traceback
+from typing import Deque, List, Optional
+
+import bittensor as bt
+
+from common.data import DataEntity
+from storage.miner.miner_storage import MinerStorage
+
+
+class IngestionQueue:
+    """Stores scraped DataEntities on a dedicated writer thread, off the scrapers' event loop.
+
+    Why? Storing entities is a synchronous SQLite write, which may also have to clear space first. Run on the event
+    loop, each write stalls every other scraper.
+
+    Batches from all scrapers are coalesced into writes of up to MAX_WRITE_ENTITIES. At most MAX_PENDING_ENTITIES wait
+    to be written. Once full, put() waits for the writer to catch up, slowing scrapers down to the rate storage can
+    sustain.
+
+    Thread safe.
+    """
+
+    # The maximum number of entities waiting to be written before put() waits.
+    MAX_PENDING_ENTITIES = 50_000
+
+    # The maximum number of entities written in a single call to storage.
+    MAX_WRITE_ENTITIES = 10_000
+
+    def __init__(
+        self,
+        storage: MinerStorage,
+        max_pending_entities: int = MAX_PENDING_ENTITIES,
+        max_write_entities: int = MAX_WRITE_ENTITIES,
+    ):
+        self.storage = storage
+        self.max_pending_entities = max_pending_entities
+        self.max_write_entities = max_write_entities
+
+        self.pending: Deque[List[DataEntity]] = collections.deque()
+        self.pending_entities = 0
+        # Notified when batches are added, when space is freed, and when stopping.
+        self.condition = threading.Condition()
+        self.is_running = False
+        self.thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Starts the writer thread."""
+        assert not self.is_running, "IngestionQueue already running"
+
+        self.is_running = True
+        self.thread = threading.Thread(
+            target=self._run, name="IngestionQueue", daemon=True
+        )
+        self.thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        """Stops the writer thread, once all pending entities are written."""
+        with self.condition:
+            self.is_running = False
+            self.condition.notify_all()
+        if self.thread:
+            self.thread.join(timeout)
+
+    async def put(self, data_entities: List[DataEntity]):
+        """Queues the entities to be stored, waiting without blocking the event loop if the queue is full."""
+        if not data_entities:
+            return
+        if not self._try_put(data_entities):
+            await asyncio.get_running_loop().run_in_executor(
+                None, self.put_blocking, data_entities
+            )
+
+    def put_blocking(self, data_entities: List[DataEntity]):
+        """Queues the entities to be stored, blocking the calling thread while the queue is full."""
+        with self.condition:
+            self.condition.wait_for(lambda: self._has_space_for(data_entities))
+            self._append(data_entities)
+
+    def _try_put(self, data_entities: List[DataEntity]) -> bool:
+        with self.condition:
+            if not self._has_space_for(data_entities):
+                return False
+            self._append(data_entities)
+            return True
+
+    def _has_space_for(self, data_entities: List[DataEntity]) -> bool:
+        # Always accept a batch once everything else is written, so batches larger than the limit can't wait forever.
+        return (
+            self.pending_entities == 0
+            or self.pending_entities + len(data_entities) <= self.max_pending_entities
+        )
+
+    def _append(self, data_entities: List[DataEntity]):
+        self.pending.append(data_entities)
+        self.pending_entities += len(data_entities)
+        self.condition.notify_all()
+
+    def _take_batches(self) -> List[List[DataEntity]]:
+        """Waits for pending batches, and takes as many as fit in one write. Returns [] once stopped and drained."""
+        with self.condition:
+            self.condition.wait_for(lambda: self.pending or not self.is_running)
+
+            batches = []
+            entity_count = 0
+            while self.pending and (
+                not batches
+                or entity_count + len(self.pending[0]) <= self.max_write_entities
+            ):
+                batch = self.pending.popleft()
+                batches.append(batch)
+                entity_count += len(batch)
+            return batches
+
+    def _on_written(self, batches: List[List[DataEntity]]):
+        with self.condition:
+            self.pending_entities -= sum(len(batch) for batch in batches)
+            self.condition.notify_all()
+
+    def _run(self):
+        while True:
+            batches = self._take_batches()
+            if not batches:
+                bt.logging.info("IngestionQueue stopped.")
+                return
+
+            try:
+                self._write(batches)
+            finally:
+                self._on_written(batches)
+
+    def _write(self, batches: List[List[DataEntity]]):
+        try:
+            self.storage.store_data_entities(
+                [entity for batch in batches for entity in batch]
+            )
+            return
+        except Exception:
+            if len(batches) == 1:
+                bt.logging.error(
+                    f"Failed to store {len(batches[0])} entities: {traceback.format_exc()}"
+                )
+                return
+
+        # The combined write can fail where the individual ones wouldn't, e.g. by exceeding the max content size.
+        bt.logging.warning(
+            f"Failed to store {len(batches)} batches together. Storing them separately."
+        )
+        for batch in batches:
+            try:
+                self.storage.store_data_entities(batch)
+            except Exception:
+                bt.logging.error(
+                    f"Failed to store {len(batch)} entities: {traceback.format_exc()}"
+                )
@@ -4,7 +4,7 @@ from common.data import (
     DataEntity,
     DataEntityBucketId,
 )
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 import datetime as dt
 
 
@@ -16,6 +16,13 @@ class MinerStorage(ABC):
         """Stores any number of DataEntities, making space if necessary."""
         raise NotImplemented
 
+    @abstractmethod
+    def list_unstored_data_entities(
+        self, data_entities: List[DataEntity]
+    ) -> List[DataEntity]:
+        """Returns the DataEntities whose URIs aren't already stored, in their original order."""
+        raise NotImplemented
+
     @abstractmethod
     def list_data_entities_in_data_entity_bucket(
         self, data_entity_bucket_id: DataEntityBucketId
@@ -28,6 +35,11 @@ class MinerStorage(ABC):
         """Gets the compressed MinedIndex, which is a summary of all of the DataEntities that this MinerStorage is currently serving."""
         raise NotImplemented
 
+    @abstractmethod
+    def get_compressed_index_with_hash(self) -> Tuple[CompressedMinerIndex, Optional[str]]:
+        """Gets the compressed MinerIndex along with a hash that changes whenever the index changes."""
+        raise NotImplemented
+
     @abstractmethod
     def refresh_compressed_index(self, date_time: dt.timedelta):
         """Refreshes the compressed MinerIndex."""
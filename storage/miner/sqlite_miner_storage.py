@@ -1,6 +1,8 @@
 from collections import defaultdict
+import hashlib
 import threading
-from common import constants, utils
+import traceback
+from common import constants, time_buckets, utils
 from common.data import (
     CompressedEntityBucket,
     CompressedMinerIndex,
@@ -13,7 +15,8 @@ from common.data import (
     HuggingFaceMetadata,
 )
 from storage.miner.miner_storage import MinerStorage
-from typing import Dict, List
+from storage.miner.uri_filter import UriFilter
+from typing import Dict, List, Optional, Tuple
 import datetime as dt
 import sqlite3
 import contextlib
@@ -83,6 +86,23 @@ class SqliteMinerStorage(MinerStorage):
                                 encodingKey         TEXT
                                 ) WITHOUT ROWID"""
 
+    # The fewest and most URIs the URI filter is sized for: 2**18 and 2**25 buckets of 4 one-byte fingerprints,
+    # bounding it to between 1MiB and 128MiB in memory and on disk.
+    URI_FILTER_MIN_CAPACITY = UriFilter.max_capacity(2**18)
+    URI_FILTER_MAX_CAPACITY = UriFilter.max_capacity(2**25)
+
+    # The URI filter is sized for this many times the stored URIs, leaving room for growth before it's rebuilt.
+    URI_FILTER_HEADROOM = 2
+
+    # The fraction of the URI filter's slots that may fill before it's rebuilt with a larger capacity.
+    URI_FILTER_GROW_LOAD = 0.8
+
+    # How often the URI filter is written to disk, at most.
+    URI_FILTER_SAVE_INTERVAL = dt.timedelta(minutes=10)
+
+    # The most URIs looked up in a single query, below SQLite's limit on query parameters.
+    URI_LOOKUP_BATCH_SIZE = 500
+
     def __init__(
         self,
         database="SqliteMinerStorage.sqlite",
@@ -124,8 +144,121 @@ class SqliteMinerStorage(MinerStorage):
         # Lock around the cached get miner index.
         self.cached_index_lock = threading.Lock()
         self.cached_index_4 = None
+        self.cached_index_hash = None
         self.cached_index_updated = dt.datetime.min
 
+        # A filter over the URIs of stored DataEntities, so most newly scraped entities can be recognised as new
+        # without querying the database. Kept next to the database, and maintained on every insert and eviction.
+        self.uri_filter_path = database + ".urifilter.npz"
+        self.uri_filter_save_lock = threading.Lock()
+        self.uri_filter_last_saved = dt.datetime.now()
+
+        # Lock around replacing the URI filter with one rebuilt from the table. While it's being built, the new filter
+        # is pending and kept up to date alongside the current one.
+        self.uri_filter_build_lock = threading.Lock()
+        self.uri_filter_builder: Optional[threading.Thread] = None
+        self.pending_uri_filter: Optional[UriFilter] = None
+        self._load_or_build_uri_filter()
+
+    def _load_or_build_uri_filter(self):
+        """Loads the URI filter saved with the database, or starts building a new one if there isn't one."""
+        with contextlib.closing(self._create_connection()) as connection:
+            is_empty = (
+                connection.execute("SELECT 1 FROM DataEntity LIMIT 1").fetchone() is None
+            )
+
+        # A filter saved alongside a database that has since been emptied or replaced is discarded.
+        uri_filter = None if is_empty else UriFilter.load(self.uri_filter_path)
+        if uri_filter:
+            bt.logging.info(
+                f"Loaded URI filter of {uri_filter.count} URIs from {self.uri_filter_path}."
+            )
+            self.uri_filter = uri_filter
+            return
+
+        self.uri_filter = UriFilter(
+            capacity=SqliteMinerStorage.URI_FILTER_MIN_CAPACITY
+        )
+        if not is_empty:
+            # Until it's built the filter reports every URI as absent, so entities are stored as if it didn't exist.
+            self._start_uri_filter_build()
+
+    def _start_uri_filter_build(self):
+        """Starts rebuilding the URI filter from the table, sized for the stored URIs, unless a build is running."""
+        with self.uri_filter_build_lock:
+            if self.uri_filter_builder is not None and self.uri_filter_builder.is_alive():
+                return
+            self.uri_filter_builder = threading.Thread(
+                target=self._build_uri_filter,
+                name="UriFilterBuilder",
+                daemon=True,
+            )
+            self.uri_filter_builder.start()
+
+    def _build_uri_filter(self):
+        """Builds a URI filter over all stored DataEntities, and replaces the current one with it."""
+        bt.logging.info("Building URI filter from the stored DataEntities.")
+        try:
+            with contextlib.closing(self._create_connection()) as connection:
+                row_count = connection.execute(
+                    "SELECT COUNT(*) FROM DataEntity"
+                ).fetchone()[0]
+                capacity = min(
+                    max(
+                        row_count * SqliteMinerStorage.URI_FILTER_HEADROOM,
+                        SqliteMinerStorage.URI_FILTER_MIN_CAPACITY,
+                    ),
+                    SqliteMinerStorage.URI_FILTER_MAX_CAPACITY,
+                )
+                # From here on, inserts and evictions also update the new filter. Rows inserted before now are read below.
+                with self.uri_filter_build_lock:
+                    self.pending_uri_filter = UriFilter(capacity=capacity)
+
+                cursor = connection.execute("SELECT uri FROM DataEntity")
+                while True:
+                    rows = cursor.fetchmany(10_000)
+                    if not rows:
+                        break
+                    self.pending_uri_filter.add([row["uri"] for row in rows])
+
+            with self.uri_filter_build_lock:
+                self.uri_filter = self.pending_uri_filter
+            bt.logging.success(
+                f"Built URI filter of {self.uri_filter.count} URIs, taking {self.uri_filter.size_bytes} bytes."
+            )
+            self._save_uri_filter()
+        except Exception:
+            bt.logging.error(f"Failed to build URI filter: {traceback.format_exc()}")
+        finally:
+            with self.uri_filter_build_lock:
+                self.pending_uri_filter = None
+
+    def _get_uri_filters(self) -> List[UriFilter]:
+        """Returns the URI filters to update on inserts and evictions: the current one and any being built."""
+        with self.uri_filter_build_lock:
+            return [
+                uri_filter
+                for uri_filter in (self.uri_filter, self.pending_uri_filter)
+                if uri_filter is not None
+            ]
+
+    def _save_uri_filter(self):
+        with self.uri_filter_save_lock:
+            try:
+                self.uri_filter.save(self.uri_filter_path)
+            except OSError as e:
+                bt.logging.warning(
+                    f"Failed to save URI filter to {self.uri_filter_path}: {e}."
+                )
+            self.uri_filter_last_saved = dt.datetime.now()
+
+    def _save_uri_filter_if_due(self):
+        if (
+            dt.datetime.now() - self.uri_filter_last_saved
+            >= SqliteMinerStorage.URI_FILTER_SAVE_INTERVAL
+        ):
+            self._save_uri_filter()
+
     def _create_connection(self):
         # Create the database if it doesn't exist, defaulting to the local directory.
         # Use PARSE_DECLTYPES to convert accessed values into the appropriate type.
@@ -194,11 +327,13 @@ class SqliteMinerStorage(MinerStorage):
             # Parse every DataEntity into an list of value lists for inserting.
             values = []
 
-            for data_entity in data_entities:
+            time_bucket_ids = time_buckets.ids_from_datetimes(
+                data_entity.datetime for data_entity in data_entities
+            ).tolist()
+            for data_entity, time_bucket_id in zip(data_entities, time_bucket_ids):
                 label = (
                     "NULL" if (data_entity.label is None) else data_entity.label.value
                 )
-                time_bucket_id = TimeBucket.from_datetime(data_entity.datetime).id
                 values.append(
                     [
                         data_entity.uri,
@@ -217,6 +352,58 @@ class SqliteMinerStorage(MinerStorage):
             # Commit the insert.
             connection.commit()
 
+        for uri_filter in self._get_uri_filters():
+            uri_filter.add([data_entity.uri for data_entity in data_entities])
+        self._save_uri_filter_if_due()
+
+        # Rebuild the filter larger before it fills up and starts dropping URIs.
+        if (
+            self.uri_filter.count
+            >= SqliteMinerStorage.URI_FILTER_GROW_LOAD * self.uri_filter.capacity
+            and self.uri_filter.capacity < SqliteMinerStorage.URI_FILTER_MAX_CAPACITY
+        ):
+            self._start_uri_filter_build()
+
+    def list_unstored_data_entities(
+        self, data_entities: List[DataEntity]
+    ) -> List[DataEntity]:
+        """Returns the DataEntities whose URIs aren't already stored, in their original order.
+
+        Entities the URI filter reports as absent are new. Only those it reports as maybe present are looked up.
+        """
+        maybe_stored_uris = [
+            data_entity.uri
+            for data_entity, maybe_stored in zip(
+                data_entities,
+                self.uri_filter.contains(
+                    [data_entity.uri for data_entity in data_entities]
+                ),
+            )
+            if maybe_stored
+        ]
+        if not maybe_stored_uris:
+            return list(data_entities)
+
+        stored_uris = set()
+        with contextlib.closing(self._create_connection()) as connection:
+            for i in range(
+                0, len(maybe_stored_uris), SqliteMinerStorage.URI_LOOKUP_BATCH_SIZE
+            ):
+                batch = maybe_stored_uris[
+                    i : i + SqliteMinerStorage.URI_LOOKUP_BATCH_SIZE
+                ]
+                cursor = connection.execute(
+                    f"SELECT uri FROM DataEntity WHERE uri IN ({','.join('?' * len(batch))})",
+                    batch,
+                )
+                stored_uris.update(row["uri"] for row in cursor)
+
+        return [
+            data_entity
+            for data_entity in data_entities
+            if data_entity.uri not in stored_uris
+        ]
+
     def store_hf_dataset_info(self, hf_metadatas: List[HuggingFaceMetadata]):
         with contextlib.closing(self._create_connection()) as connection:
             cursor = connection.cursor()
@@ -338,13 +525,14 @@ class SqliteMinerStorage(MinerStorage):
                     return data_entities
                 else:
                     # Construct the new DataEntity with all non null columns.
-                    data_entity = DataEntity(
+                    # Rows were validated as DataEntities before being stored, so skip validating them again.
+                    data_entity = DataEntity.from_trusted_values(
                         uri=row["uri"],
                         datetime=row["datetime"],
-                        source=DataSource(row["source"]),
+                        source=row["source"],
                         content=row["content"],
                         content_size_bytes=row["contentSizeBytes"],
-                        label=DataLabel(value=row["label"]) if row["label"] != "NULL" else None
+                        label=row["label"] if row["label"] != "NULL" else None
                     )
 
                     data_entities.append(data_entity)
@@ -385,10 +573,10 @@ class SqliteMinerStorage(MinerStorage):
             with contextlib.closing(self._create_connection()) as connection:
                 cursor = connection.cursor()
 
-                oldest_time_bucket_id = TimeBucket.from_datetime(
+                oldest_time_bucket_id = time_buckets.id_from_datetime(
                     dt.datetime.now()
                     - dt.timedelta(constants.DATA_ENTITY_BUCKET_AGE_LIMIT_DAYS)
-                ).id
+                )
 
                 # Get sum of content_size_bytes for all rows grouped by DataEntityBucket.
                 cursor.execute(
@@ -428,13 +616,19 @@ class SqliteMinerStorage(MinerStorage):
 
                 # Convert the buckets_by_source_by_label into a list of lists of CompressedEntityBucket and return
                 bt.logging.trace("Creating protocol 4 cached index.")
+                cached_index = CompressedMinerIndex(
+                    sources={
+                        source: list(labels_to_buckets.values())
+                        for source, labels_to_buckets in buckets_by_source_by_label.items()
+                    }
+                )
+                # Hash the index once here, so validators can cheaply check whether it changed since their last query.
+                cached_index_hash = hashlib.sha256(
+                    cached_index.model_dump_json().encode()
+                ).hexdigest()
                 with self.cached_index_lock:
-                    self.cached_index_4 = CompressedMinerIndex(
-                        sources={
-                            source: list(labels_to_buckets.values())
-                            for source, labels_to_buckets in buckets_by_source_by_label.items()
-                        }
-                    )
+                    self.cached_index_4 = cached_index
+                    self.cached_index_hash = cached_index_hash
                     self.cached_index_updated = dt.datetime.now()
                     bt.logging.success(
                         f"Created cached index of {CompressedMinerIndex.size_bytes(self.cached_index_4)} bytes "
@@ -505,6 +699,13 @@ class SqliteMinerStorage(MinerStorage):
         bucket_count_limit=constants.DATA_ENTITY_BUCKET_COUNT_LIMIT_PER_MINER_INDEX_PROTOCOL_4,
     ) -> CompressedMinerIndex:
         """Gets the compressed MinerIndex, which is a summary of all of the DataEntities that this MinerStorage is currently serving."""
+        return self.get_compressed_index_with_hash(bucket_count_limit)[0]
+
+    def get_compressed_index_with_hash(
+        self,
+        bucket_count_limit=constants.DATA_ENTITY_BUCKET_COUNT_LIMIT_PER_MINER_INDEX_PROTOCOL_4,
+    ) -> Tuple[CompressedMinerIndex, Optional[str]]:
+        """Gets the compressed MinerIndex along with a hash that changes whenever the index changes."""
 
         # Force refresh index if 10 minutes beyond refersh period. Expected to be refreshed earlier by refresh loop.
         self.refresh_compressed_index(
@@ -513,7 +714,7 @@ class SqliteMinerStorage(MinerStorage):
 
         with self.cached_index_lock:
             # Only protocol 4 is supported at this time.
-            return self.cached_index_4
+            return self.cached_index_4, self.cached_index_hash
 
     def clear_content_from_oldest(self, content_bytes_to_clear: int):
         """Deletes entries starting from the oldest until we have cleared the specified amount of content."""
@@ -537,21 +738,30 @@ class SqliteMinerStorage(MinerStorage):
                 earliest_datetime_to_clear = row["datetime"]
                 # Once we have enough content to clear then we do so.
                 if running_bytes >= content_bytes_to_clear:
+                    cleared_uris = [
+                        uri_row["uri"]
+                        for uri_row in connection.execute(
+                            "SELECT uri FROM DataEntity WHERE datetime <= ?",
+                            [earliest_datetime_to_clear],
+                        )
+                    ]
                     cursor.execute(
                         "DELETE FROM DataEntity WHERE datetime <= ?",
                         [earliest_datetime_to_clear],
                     )
                     connection.commit()
+                    for uri_filter in self._get_uri_filters():
+                        uri_filter.remove(cleared_uris)
 
     def list_data_entity_buckets(self) -> List[DataEntityBucket]:
         """Lists all DataEntityBuckets for all the DataEntities that this MinerStorage is currently serving."""
 
         with contextlib.closing(self._create_connection()) as connection:
             cursor = connection.cursor()
-            oldest_time_bucket_id = TimeBucket.from_datetime(
+            oldest_time_bucket_id = time_buckets.id_from_datetime(
                 dt.datetime.now()
                 - dt.timedelta(constants.DATA_ENTITY_BUCKET_AGE_LIMIT_DAYS)
-            ).id
+            )
             # Get sum of content_size_bytes for all rows grouped by DataEntityBucket.
             cursor.execute(
                 """SELECT SUM(contentSizeBytes) AS bucketSize, timeBucketId, source, label FROM DataEntity
@@ -0,0 +1,195 @@
+import hashlib
+import os
+import random
+import threading
+from typing import Iterable, List, Optional
+
+import bittensor as bt
+import numpy as np
+
+
+class UriFilter:
+    """A cuckoo filter over URIs, answering whether a URI may have been added.
+
+    A URI that was added (and not since removed) is always reported as maybe present. A URI that wasn't added is
+    occasionally reported as maybe present too, roughly 3% of the time when the filter is full, so callers that need
+    certainty must confirm positives elsewhere.
+
+    Unlike a Bloom filter, URIs can be removed. Removing a URI whose fingerprint is shared with another URI may also
+    remove the other, and adding to a full filter may evict another URI's fingerprint. Both only cause URIs to be
+    reported as absent when present, which callers must also tolerate.
+
+    Thread safe.
+    """
+
+    # The number of fingerprints per bucket.
+    BUCKET_SIZE = 4
+
+    # The number of fingerprints to relocate before giving up on an insert.
+    MAX_KICKS = 500
+
+    # The fraction of slots that can be filled before inserts start to fail, with buckets of 4.
+    LOAD_FACTOR = 0.95
+
+    def __init__(self, capacity: int):
+        """Creates an empty filter with room for roughly capacity URIs."""
+        # 0 marks an empty slot, so fingerprints are in [1, 255].
+        self.table = np.zeros(
+            (self.bucket_count(capacity), self.BUCKET_SIZE), dtype=np.uint8
+        )
+        self.count = 0
+        self.lock = threading.Lock()
+        self.rng = random.Random()
+
+    @classmethod
+    def bucket_count(cls, capacity: int) -> int:
+        """Returns the number of buckets in a filter created with room for capacity URIs.
+
+        The bucket count must be a power of 2 for the alternate bucket computation to be reversible, so it's rounded
+        up, and the filter takes up to twice the space capacity alone needs.
+        """
+        bucket_count = max(1, int(np.ceil(capacity / (cls.BUCKET_SIZE * cls.LOAD_FACTOR))))
+        return 1 << (bucket_count - 1).bit_length()
+
+    @classmethod
+    def max_capacity(cls, bucket_count: int) -> int:
+        """Returns the largest capacity that creates a filter of at most bucket_count buckets."""
+        return int(bucket_count * cls.BUCKET_SIZE * cls.LOAD_FACTOR)
+
+    @property
+    def capacity(self) -> int:
+        return self.table.size
+
+    @property
+    def size_bytes(self) -> int:
+        return self.table.nbytes
+
+    def _hashes(self, uris: Iterable[str]):
+        """Returns the fingerprint, first bucket and alternate bucket of each URI."""
+        hashes = np.fromiter(
+            (
+                int.from_bytes(
+                    hashlib.blake2b(uri.encode(), digest_size=8).digest(), "little"
+                )
+                for uri in uris
+            ),
+            dtype=np.uint64,
+        )
+        mask = np.uint64(len(self.table) - 1)
+        fingerprints = (hashes & np.uint64(0xFF)) % np.uint64(255) + np.uint64(1)
+        first_buckets = (hashes >> np.uint64(8)) & mask
+        alternate_buckets = first_buckets ^ (self._fingerprint_hashes(fingerprints) & mask)
+        return (
+            fingerprints.astype(np.uint8),
+            first_buckets.astype(np.int64),
+            alternate_buckets.astype(np.int64),
+        )
+
+    @staticmethod
+    def _fingerprint_hashes(fingerprints: np.ndarray) -> np.ndarray:
+        return fingerprints.astype(np.uint64) * np.uint64(0x5BD1E995)
+
+    def _alternate_bucket(self, bucket: int, fingerprint: int) -> int:
+        return bucket ^ (int(fingerprint) * 0x5BD1E995 & (len(self.table) - 1))
+
+    def contains(self, uris: List[str]) -> List[bool]:
+        """Returns, for each URI, whether it may have been added."""
+        if not uris:
+            return []
+        fingerprints, first_buckets, alternate_buckets = self._hashes(uris)
+        with self.lock:
+            return (
+                (self.table[first_buckets] == fingerprints[:, None]).any(axis=1)
+                | (self.table[alternate_buckets] == fingerprints[:, None]).any(axis=1)
+            ).tolist()
+
+    def add(self, uris: List[str]):
+        """Adds the URIs to the filter. URIs that may already be present aren't added again."""
+        if not uris:
+            return
+        fingerprints, first_buckets, alternate_buckets = self._hashes(uris)
+        with self.lock:
+            for fingerprint, first_bucket, alternate_bucket in zip(
+                fingerprints.tolist(), first_buckets.tolist(), alternate_buckets.tolist()
+            ):
+                if (
+                    fingerprint in self.table[first_bucket]
+                    or fingerprint in self.table[alternate_bucket]
+                ):
+                    continue
+                if self._insert(fingerprint, first_bucket, alternate_bucket):
+                    self.count += 1
+
+    def _insert(self, fingerprint: int, first_bucket: int, alternate_bucket: int) -> bool:
+        """Inserts the fingerprint, relocating others if both its buckets are full.
+
+        Returns whether the fingerprint count grew, i.e. False if a fingerprint had to be dropped.
+
+        Requires: self.lock is held.
+        """
+        for bucket in (first_bucket, alternate_bucket):
+            if self._place(fingerprint, bucket):
+                return True
+
+        bucket = self.rng.choice((first_bucket, alternate_bucket))
+        for _ in range(self.MAX_KICKS):
+            slot = self.rng.randrange(self.BUCKET_SIZE)
+            fingerprint, self.table[bucket, slot] = int(self.table[bucket, slot]), fingerprint
+            bucket = self._alternate_bucket(bucket, fingerprint)
+            if self._place(fingerprint, bucket):
+                return True
+
+        # The filter is too full. The last relocated fingerprint is dropped.
+        return False
+
+    def _place(self, fingerprint: int, bucket: int) -> bool:
+        empty_slots = np.flatnonzero(self.table[bucket] == 0)
+        if len(empty_slots) == 0:
+            return False
+        self.table[bucket, empty_slots[0]] = fingerprint
+        return True
+
+    def remove(self, uris: List[str]):
+        """Removes the URIs from the filter."""
+        if not uris:
+            return
+        fingerprints, first_buckets, alternate_buckets = self._hashes(uris)
+        with self.lock:
+            for fingerprint, first_bucket, alternate_bucket in zip(
+                fingerprints.tolist(), first_buckets.tolist(), alternate_buckets.tolist()
+            ):
+                for bucket in (first_bucket, alternate_bucket):
+                    slots = np.flatnonzero(self.table[bucket] == fingerprint)
+                    if len(slots) > 0:
+                        self.table[bucket, slots[0]] = 0
+                        self.count -= 1
+                        break
+
+    def save(self, path: str):
+        """Writes the filter to path, replacing any previous file atomically."""
+        with self.lock:
+            table = self.table.copy()
+            count = self.count
+
+        temp_path = path + ".tmp"
+        with open(temp_path, "wb") as f:
+            np.savez(f, table=table, count=np.array(count))
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> Optional["UriFilter"]:
+        """Reads a filter written by save, or returns None if there isn't a readable one at path."""
+        try:
+            with np.load(path) as data:
+                table = data["table"]
+                count = int(data["count"])
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            bt.logging.warning(f"Failed to load URI filter from {path}: {e}.")
+            return None
+
+        uri_filter = cls(capacity=1)
+        uri_filter.table = table
+        uri_filter.count = count
+        return uri_filter
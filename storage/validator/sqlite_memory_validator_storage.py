@@ -3,9 +3,10 @@ import datetime as dt
 import bittensor as bt
 import sqlite3
 import threading
-from typing import Any, Dict, Optional, Set, Tuple, List
+import numpy as np
+from typing import Any, Dict, Optional, Set, Tuple, List, Union
 from common.data import CompressedMinerIndex, DataLabel, HuggingFaceMetadata
-from common.data_v2 import ScorableDataEntityBucket, ScorableMinerIndex
+from common.data_v2 import ColumnarCompressedMinerIndex, ColumnarScorableMinerIndex
 from storage.validator.validator_storage import ValidatorStorage
 
 
@@ -89,6 +90,7 @@ class SqliteMemoryValidatorStorage(ValidatorStorage):
                             hotkey      VARCHAR(64)     NOT NULL,
                             lastUpdated TIMESTAMP(6)    NOT NULL,
                             credibility FLOAT           NOT NULL    DEFAULT 0.00,
+                            indexHash   VARCHAR(64),
                             UNIQUE(hotkey)
                             )"""
 
@@ -155,7 +157,13 @@ class SqliteMemoryValidatorStorage(ValidatorStorage):
         connection.isolation_level = None
         return connection
 
-    def _upsert_miner(self, hotkey: str, now_str: str, credibility: float) -> int:
+    def _upsert_miner(
+        self,
+        hotkey: str,
+        now_str: str,
+        credibility: float,
+        index_hash: Optional[str] = None,
+    ) -> int:
         miner_id = 0
 
         with self.lock:
@@ -163,12 +171,12 @@ class SqliteMemoryValidatorStorage(ValidatorStorage):
                 cursor = connection.cursor()
 
                 cursor.execute(
-                    "UPDATE OR IGNORE Miner SET lastUpdated=?, credibility=? WHERE hotkey=?",
-                    [now_str, credibility, hotkey],
+                    "UPDATE OR IGNORE Miner SET lastUpdated=?, credibility=?, indexHash=? WHERE hotkey=?",
+                    [now_str, credibility, index_hash, hotkey],
                 )
                 cursor.execute(
-                    """INSERT OR IGNORE INTO Miner (hotkey, lastUpdated, credibility) VALUES (?, ?, ?)""",
-                    [hotkey, now_str, credibility],
+                    """INSERT OR IGNORE INTO Miner (hotkey, lastUpdated, credibility, indexHash) VALUES (?, ?, ?, ?)""",
+                    [hotkey, now_str, credibility, index_hash],
                 )
                 connection.commit()
 
@@ -187,41 +195,52 @@ class SqliteMemoryValidatorStorage(ValidatorStorage):
         return "NULL" if (label is None) else label.casefold()
 
     def upsert_compressed_miner_index(
-        self, index: CompressedMinerIndex, hotkey: str, credibility: float
+        self,
+        index: Union[CompressedMinerIndex, ColumnarCompressedMinerIndex],
+        hotkey: str,
+        credibility: float,
+        index_hash: Optional[str] = None,
     ):
-        """Stores the index for all of the data that a specific miner promises to provide."""
+        """Stores the index for all of the data that a specific miner promises to provide.
+
+        Args:
+            index_hash (Optional[str]): The hash the miner reported for this index, if any.
+        """
+        if isinstance(index, CompressedMinerIndex):
+            index = ColumnarCompressedMinerIndex.from_compressed_index(index)
 
         bt.logging.trace(
-            f"{hotkey}: Upserting miner index with {CompressedMinerIndex.bucket_count(index)} buckets"
+            f"{hotkey}: Upserting miner index with {index.bucket_count()} buckets"
         )
 
         now_str = dt.datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S.%f")
 
         # Upsert this Validator's minerId for the specified hotkey.
-        miner_id = self._upsert_miner(hotkey, now_str, credibility)
+        miner_id = self._upsert_miner(hotkey, now_str, credibility, index_hash)
+
+        # Resolve each distinct label once, then map every bucket to its label's id.
+        label_dict_ids = np.empty(len(index.labels), dtype=np.int64)
+        for i, label in enumerate(index.labels):
+            try:
+                label_dict_ids[i] = self.label_dict.get_or_insert(
+                    self._label_value_parse_str(label)
+                )
+            except:
+                # In the case that we fail to get a label (due to unsupported characters) we drop just those buckets.
+                label_dict_ids[i] = -1
+        bucket_label_ids = label_dict_ids[index.label_ids]
+        keep = bucket_label_ids >= 0
 
         # Parse every DataEntityBucket from the index into a list of values to insert.
-        values = []
-        for source, compressed_buckets in index.sources.items():
-            for compressed_bucket in compressed_buckets:
-                for time_bucket_id, size_bytes in zip(
-                    compressed_bucket.time_bucket_ids, compressed_bucket.sizes_bytes
-                ):
-                    try:
-                        values.append(
-                            [
-                                miner_id,
-                                int(source),
-                                self.label_dict.get_or_insert(
-                                    self._label_value_parse_str(compressed_bucket.label)
-                                ),
-                                time_bucket_id,
-                                size_bytes,
-                            ]
-                        )
-                    except:
-                        # In the case that we fail to get a label (due to unsupported characters) we drop just that one bucket.
-                        pass
+        values = list(
+            zip(
+                [miner_id] * int(keep.sum()),
+                index.sources[keep].tolist(),
+                bucket_label_ids[keep].tolist(),
+                index.time_bucket_ids[keep].tolist(),
+                index.sizes_bytes[keep].tolist(),
+            )
+        )
 
         with self.lock:
             # Clear the previous keys for this miner.
@@ -244,7 +263,7 @@ class SqliteMemoryValidatorStorage(ValidatorStorage):
     def read_miner_index(
         self,
         miner_hotkey: str,
-    ) -> Optional[ScorableMinerIndex]:
+    ) -> Optional[ColumnarScorableMinerIndex]:
         """Gets a scored index for all of the data that a specific miner promises to provide."""
 
         with self.lock:
@@ -285,26 +304,40 @@ class SqliteMemoryValidatorStorage(ValidatorStorage):
 
                 cursor.execute(sql_string, [miner_id, miner_credibility, miner_id])
 
-                # Create to a list to hold each of the ScorableDataEntityBuckets we generate for this miner.
-                scored_data_entity_buckets = []
-
-                # For each row (representing a DataEntityBucket and Uniqueness) turn it into a ScorableDataEntityBucket.
-                for row in cursor:
-                    label_value = self.label_dict.get_by_id(row[1])
-
-                    # Add the bucket to the list of scored buckets on the overall index.
-                    scored_data_entity_buckets.append(
-                        ScorableDataEntityBucket(
-                            time_bucket_id=int(row[2]),
-                            source=int(row[0]),
-                            label=label_value if label_value != "NULL" else None,
-                            size_bytes=int(row[3] if row[3] else 0),
-                            scorable_bytes=int(row[4] if row[4] else 0),
-                        )
-                    )
+                rows = cursor.fetchall()
 
-                scored_index = ScorableMinerIndex(
-                    scorable_data_entity_buckets=scored_data_entity_buckets,
+                # Build each column of the index directly from the rows, rather than creating one object per bucket.
+                # Label ids are remapped from the storage wide ids to positions in this index's own label table.
+                global_label_ids = np.fromiter(
+                    (row[1] for row in rows), dtype=np.int64, count=len(rows)
+                )
+                unique_global_label_ids, label_ids = np.unique(
+                    global_label_ids, return_inverse=True
+                )
+                labels = []
+                for global_label_id in unique_global_label_ids.tolist():
+                    label_value = self.label_dict.get_by_id(global_label_id)
+                    labels.append(label_value if label_value != "NULL" else None)
+
+                scored_index = ColumnarScorableMinerIndex(
+                    sources=np.fromiter(
+                        (row[0] for row in rows), dtype=np.int8, count=len(rows)
+                    ),
+                    label_ids=label_ids,
+                    labels=labels,
+                    time_bucket_ids=np.fromiter(
+                        (row[2] for row in rows), dtype=np.int64, count=len(rows)
+                    ),
+                    size_bytes=np.fromiter(
+                        (int(row[3]) if row[3] else 0 for row in rows),
+                        dtype=np.int64,
+                        count=len(rows),
+                    ),
+                    scorable_bytes=np.fromiter(
+                        (int(row[4]) if row[4] else 0 for row in rows),
+                        dtype=np.int64,
+                        count=len(rows),
+                    ),
                     last_updated=last_updated,
                 )
 
@@ -349,6 +382,45 @@ class SqliteMemoryValidatorStorage(ValidatorStorage):
                 else:
                     return None
 
+    def read_miner_index_hash(self, miner_hotkey: str) -> Optional[str]:
+        """Gets the hash the miner reported for its stored index, if any."""
+        with self.lock:
+            with contextlib.closing(self._create_connection()) as connection:
+                cursor = connection.cursor()
+                cursor.execute(
+                    "SELECT indexHash FROM Miner WHERE hotkey = ?", [miner_hotkey]
+                )
+                result = cursor.fetchone()
+                if result is not None:
+                    return result[0]
+                else:
+                    return None
+
+    def touch_miner_index(self, miner_hotkey: str, credibility: float) -> bool:
+        """Marks the stored index of a miner as up to date, without replacing it.
+
+        Returns:
+            bool: Whether the miner had a stored index to mark.
+        """
+        now_str = dt.datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S.%f")
+        with self.lock:
+            with contextlib.closing(self._create_connection()) as connection:
+                cursor = connection.cursor()
+                cursor.execute(
+                    "UPDATE Miner SET lastUpdated=?, credibility=? WHERE hotkey=?",
+                    [now_str, credibility, miner_hotkey],
+                )
+                connection.commit()
+                return cursor.rowcount > 0
+
+    def read_miners_last_updated(self) -> Dict[str, dt.datetime]:
+        """Gets when each known miner was last updated, keyed by hotkey."""
+        with self.lock:
+            with contextlib.closing(self._create_connection()) as connection:
+                cursor = connection.cursor()
+                cursor.execute("SELECT hotkey, lastUpdated FROM Miner")
+                return dict(cursor.fetchall())
+
     # Hugging face functionality
     def upsert_hf_metadata(self, hotkey: str, metadata: List[HuggingFaceMetadata]):
         """Stores or updates the HuggingFace metadata for a specific miner."""
@@ -1,9 +1,9 @@
 from abc import ABC, abstractmethod
 from common.data import CompressedMinerIndex
-from typing import Optional
+from typing import Dict, Optional, Union
 import datetime as dt
 
-from common.data_v2 import ScorableMinerIndex
+from common.data_v2 import ColumnarCompressedMinerIndex, ColumnarScorableMinerIndex
 
 
 class ValidatorStorage(ABC):
@@ -11,13 +11,17 @@ class ValidatorStorage(ABC):
 
     @abstractmethod
     def upsert_compressed_miner_index(
-        self, index: CompressedMinerIndex, hotkey: str, credibility: float = 0
+        self,
+        index: Union[CompressedMinerIndex, ColumnarCompressedMinerIndex],
+        hotkey: str,
+        credibility: float = 0,
+        index_hash: Optional[str] = None,
     ):
         """Stores the index for all of the data that a specific miner promises to provide."""
         raise NotImplemented
 
     @abstractmethod
-    def read_miner_index(self, miner_hotkey: str) -> Optional[ScorableMinerIndex]:
+    def read_miner_index(self, miner_hotkey: str) -> Optional[ColumnarScorableMinerIndex]:
         """Gets a scored index for all of the data that a specific miner promises to provide."""
         raise NotImplemented
 
@@ -30,3 +34,19 @@ class ValidatorStorage(ABC):
     def read_miner_last_updated(self, miner_hotkey: str) -> Optional[dt.datetime]:
         """Gets when a specific miner was last updated."""
         raise NotImplemented
+
+
+    @abstractmethod
+    def read_miners_last_updated(self) -> Dict[str, dt.datetime]:
+        """Gets when each known miner was last updated, keyed by hotkey."""
+        raise NotImplemented
+
+    @abstractmethod
+    def read_miner_index_hash(self, miner_hotkey: str) -> Optional[str]:
+        """Gets the hash the miner reported for its stored index, if any."""
+        raise NotImplemented
+
+    @abstractmethod
+    def touch_miner_index(self, miner_hotkey: str, credibility: float) -> bool:
+        """Marks the stored index of a miner as up to date, without replacing it. Returns whether it had one."""
+        raise NotImplemented
@@ -0,0 +1,253 @@
+import base64
+import datetime as dt
+import random
+import time
+import unittest
+import zlib
+
+import msgpack
+
+from common import binary_encoding, constants
+from common.data import (
+    CompressedEntityBucket,
+    CompressedMinerIndex,
+    DataEntity,
+    DataEntityBucketId,
+    DataLabel,
+    DataSource,
+    TimeBucket,
+)
+from common.protocol import GetContentsByBuckets, GetDataEntityBucket, GetMinerIndex
+
+
+def _create_data_entities(count: int, content_size: int) -> list:
+    now = dt.datetime(2024, 5, 1, 12, 30, tzinfo=dt.timezone.utc)
+    return [
+        DataEntity(
+            uri=f"https://x.com/user/status/{i}",
+            datetime=now + dt.timedelta(seconds=i),
+            source=DataSource.X,
+            label=DataLabel(value="#bittensor") if i % 2 else None,
+            content=f'{{"text": "tweet {i} {"lorem ipsum " * (content_size // 12)}"}}'.encode(),
+            content_size_bytes=content_size,
+        )
+        for i in range(count)
+    ]
+
+
+class TestBinaryEncoding(unittest.TestCase):
+    def test_supports_binary_encoding(self):
+        """Tests that only new enough protocol versions negotiate the binary encoding."""
+        self.assertFalse(binary_encoding.supports_binary_encoding(None))
+        self.assertFalse(
+            binary_encoding.supports_binary_encoding(
+                constants.BINARY_ENCODING_PROTOCOL_VERSION - 1
+            )
+        )
+        self.assertTrue(
+            binary_encoding.supports_binary_encoding(
+                constants.BINARY_ENCODING_PROTOCOL_VERSION
+            )
+        )
+
+    def test_compressed_index_round_trip(self):
+        """Tests that a compressed index survives encoding and transport in a GetMinerIndex."""
+        index = CompressedMinerIndex(
+            sources={
+                DataSource.REDDIT.value: [
+                    CompressedEntityBucket(
+                        label="r/bittensor_",
+                        time_bucket_ids=[5, 6],
+                        sizes_bytes=[100, 200],
+                    )
+                ],
+                DataSource.X.value: [
+                    CompressedEntityBucket(
+                        time_bucket_ids=[10, 11, 12], sizes_bytes=[300, 400, 500]
+                    ),
+                    CompressedEntityBucket(
+                        label="#bittensor", time_bucket_ids=[5], sizes_bytes=[100]
+                    ),
+                ],
+            }
+        )
+        response = GetMinerIndex(
+            compressed_index_encoded=binary_encoding.encode_compressed_index(index)
+        )
+        response = GetMinerIndex.model_validate_json(response.model_dump_json())
+
+        decoded = binary_encoding.decode_compressed_index(
+            response.compressed_index_encoded
+        )
+        self.assertEqual(decoded.to_compressed_index(), index)
+
+    def test_data_entities_round_trip(self):
+        """Tests that DataEntities survive encoding and transport in a GetDataEntityBucket."""
+        entities = _create_data_entities(10, 100)
+        # Include content that is not valid utf-8.
+        entities.append(
+            DataEntity(
+                uri="https://reddit.com/r/bittensor_/1",
+                datetime=dt.datetime(2024, 5, 1, tzinfo=dt.timezone.utc),
+                source=DataSource.REDDIT,
+                label=DataLabel(value="r/bittensor_"),
+                content=bytes(range(256)),
+                content_size_bytes=256,
+            )
+        )
+        response = GetDataEntityBucket(
+            data_entities_encoded=binary_encoding.encode_data_entities(entities)
+        )
+        response = GetDataEntityBucket.model_validate_json(response.model_dump_json())
+
+        self.assertEqual(
+            binary_encoding.decode_data_entities(response.data_entities_encoded),
+            entities,
+        )
+
+    def test_bucket_contents_round_trip(self):
+        """Tests that bucket contents survive encoding and transport in a GetContentsByBuckets."""
+        bucket_ids_to_contents = [
+            (
+                DataEntityBucketId(
+                    time_bucket=TimeBucket(id=5),
+                    source=DataSource.REDDIT,
+                    label=DataLabel(value="r/bittensor_"),
+                ),
+                [b"content1", b"content2"],
+            ),
+            (
+                DataEntityBucketId(time_bucket=TimeBucket(id=6), source=DataSource.X),
+                [b"content3"],
+            ),
+        ]
+        response = GetContentsByBuckets(
+            bucket_ids_to_contents_encoded=binary_encoding.encode_bucket_contents(
+                bucket_ids_to_contents
+            )
+        )
+        response = GetContentsByBuckets.model_validate_json(response.model_dump_json())
+
+        self.assertEqual(
+            binary_encoding.decode_bucket_contents(
+                response.bucket_ids_to_contents_encoded
+            ),
+            bucket_ids_to_contents,
+        )
+
+    def test_decode_invalid_payloads(self):
+        """Tests that malformed payloads are rejected with a ValueError."""
+
+        def pack(obj) -> str:
+            return base64.b64encode(zlib.compress(msgpack.packb(obj))).decode()
+
+        invalid_payloads = [
+            (binary_encoding.decode_compressed_index, "not base64!"),
+            (binary_encoding.decode_compressed_index, base64.b64encode(b"x").decode()),
+            (binary_encoding.decode_compressed_index, pack({"a": 1})),
+            (binary_encoding.decode_compressed_index, pack([[1, "a", [1]]])),
+            (binary_encoding.decode_compressed_index, pack([[1, "a", [1], ["1"]]])),
+            (binary_encoding.decode_data_entities, pack([["uri"]])),
+            (
+                binary_encoding.decode_data_entities,
+                pack([["uri", "not a date", 1, None, b"", 0]]),
+            ),
+            (
+                binary_encoding.decode_data_entities,
+                pack([["uri", "2024-01-01T00:00:00+00:00", 1, None, b"", -1]]),
+            ),
+            (binary_encoding.decode_bucket_contents, pack([[1, 1, None, ["str"]]])),
+            (
+                binary_encoding.decode_bucket_contents,
+                base64.b64encode(
+                    zlib.compress(
+                        b"\0" * (constants.BINARY_ENCODING_DECODED_SIZE_LIMIT_BYTES + 1)
+                    )
+                ).decode(),
+            ),
+        ]
+        for decode, payload in invalid_payloads:
+            with self.subTest(decode=decode.__name__, payload=payload[:50]):
+                with self.assertRaises(ValueError):
+                    decode(payload)
+
+    def test_binary_encoding_perf(self):
+        """A perf test comparing the JSON and binary encodings of large responses."""
+
+        def compare(name, json_response, binary_response, cls, json_decode, decode):
+            start = time.time()
+            json_payload = json_response().model_dump_json()
+            json_encode_time = time.time() - start
+            start = time.time()
+            json_decode(cls.model_validate_json(json_payload))
+            json_decode_time = time.time() - start
+
+            start = time.time()
+            binary_payload = binary_response().model_dump_json()
+            binary_encode_time = time.time() - start
+            start = time.time()
+            decode(cls.model_validate_json(binary_payload))
+            binary_decode_time = time.time() - start
+
+            print(
+                f"{name}: JSON {len(json_payload)} bytes, encode {json_encode_time:.3f}s, decode {json_decode_time:.3f}s | "
+                + f"binary {len(binary_payload)} bytes, encode {binary_encode_time:.3f}s, decode {binary_decode_time:.3f}s"
+            )
+            self.assertLess(len(binary_payload), len(json_payload))
+
+        # A maximal index.
+        num_time_buckets = constants.DATA_ENTITY_BUCKET_AGE_LIMIT_DAYS * 24
+        num_labels = (
+            constants.DATA_ENTITY_BUCKET_COUNT_LIMIT_PER_MINER_INDEX_PROTOCOL_4
+            // 2
+            // num_time_buckets
+        )
+        index = CompressedMinerIndex(
+            sources={
+                int(source): [
+                    CompressedEntityBucket(
+                        label=f"label{i}",
+                        time_bucket_ids=list(range(1, num_time_buckets + 1)),
+                        sizes_bytes=[
+                            random.randint(1, 112345678)
+                            for _ in range(num_time_buckets)
+                        ],
+                    )
+                    for i in range(num_labels)
+                ]
+                for source in [DataSource.REDDIT, DataSource.X]
+            }
+        )
+        compare(
+            "GetMinerIndex",
+            lambda: GetMinerIndex(compressed_index_serialized=index.model_dump_json()),
+            lambda: GetMinerIndex(
+                compressed_index_encoded=binary_encoding.encode_compressed_index(index)
+            ),
+            GetMinerIndex,
+            lambda response: CompressedMinerIndex.model_validate_json(
+                response.compressed_index_serialized
+            ),
+            lambda response: binary_encoding.decode_compressed_index(
+                response.compressed_index_encoded
+            ),
+        )
+
+        # A bucket of entities.
+        entities = _create_data_entities(10_000, 1_000)
+        compare(
+            "GetDataEntityBucket",
+            lambda: GetDataEntityBucket(data_entities=entities),
+            lambda: GetDataEntityBucket(
+                data_entities_encoded=binary_encoding.encode_data_entities(entities)
+            ),
+            GetDataEntityBucket,
+            lambda response: response.data_entities,
+            lambda response: binary_encoding.decode_data_entities(
+                response.data_entities_encoded
+            ),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,21 @@
+import datetime as dt
 import unittest
-from common.data import DataEntityBucketId, DataLabel, DataSource, TimeBucket
-from common.data_v2 import ScorableDataEntityBucket, DataEntityBucket
+from common import constants
+from common.data import (
+    CompressedEntityBucket,
+    CompressedMinerIndex,
+    DataEntityBucketId,
+    DataLabel,
+    DataSource,
+    TimeBucket,
+)
+from common.data_v2 import (
+    ColumnarCompressedMinerIndex,
+    ColumnarScorableMinerIndex,
+    ScorableDataEntityBucket,
+    ScorableMinerIndex,
+    DataEntityBucket,
+)
 
 
 class TestDataV2(unittest.TestCase):
@@ -86,6 +101,168 @@ class TestDataV2(unittest.TestCase):
         # Verify that the two instances are equal
         self.assertEqual(scorable_data_entity_bucket_1, scorable_data_entity_bucket_2)
 
+    def test_columnar_index_round_trip(self):
+        """Tests that a columnar index materializes the same buckets it was built from."""
+        buckets = [
+            ScorableDataEntityBucket(
+                time_bucket_id=10,
+                source=DataSource.REDDIT,
+                label="Label_A",
+                size_bytes=100,
+                scorable_bytes=50,
+            ),
+            ScorableDataEntityBucket(
+                time_bucket_id=11,
+                source=DataSource.X,
+                label=None,
+                size_bytes=200,
+                scorable_bytes=200,
+            ),
+            ScorableDataEntityBucket(
+                time_bucket_id=12,
+                source=DataSource.REDDIT,
+                label="label_a",
+                size_bytes=300,
+                scorable_bytes=0,
+            ),
+        ]
+        now = dt.datetime.now(tz=dt.timezone.utc)
+
+        index = ColumnarScorableMinerIndex.from_index(
+            ScorableMinerIndex(scorable_data_entity_buckets=buckets, last_updated=now)
+        )
+
+        self.assertEqual(index.bucket_count(), 3)
+        # Labels are casefolded, so both buckets share one label entry.
+        self.assertEqual(len(index.labels), 2)
+        self.assertEqual(index.scorable_data_entity_buckets, buckets)
+        self.assertEqual(index.last_updated, now)
+        self.assertEqual(
+            index.to_data_entity_bucket(0), buckets[0].to_data_entity_bucket()
+        )
+        self.assertEqual(
+            index.to_data_entity_bucket(1), buckets[1].to_data_entity_bucket()
+        )
+
+    def test_columnar_index_validation(self):
+        """Tests that a columnar index applies the same bounds as ScorableDataEntityBucket."""
+        now = dt.datetime.now(tz=dt.timezone.utc)
+        valid = dict(
+            sources=[DataSource.REDDIT],
+            label_ids=[0],
+            labels=["label"],
+            time_bucket_ids=[1],
+            size_bytes=[100],
+            scorable_bytes=[100],
+            last_updated=now,
+        )
+        ColumnarScorableMinerIndex(**valid)
+
+        invalid_cases = [
+            {"label_ids": [1]},
+            {"labels": ["a" * (constants.MAX_LABEL_LENGTH + 1)]},
+            {"size_bytes": [-1], "scorable_bytes": [0]},
+            {
+                "size_bytes": [constants.DATA_ENTITY_BUCKET_SIZE_LIMIT_BYTES + 1],
+                "scorable_bytes": [0],
+            },
+            {"scorable_bytes": [101]},
+            {"time_bucket_ids": [1, 2]},
+        ]
+        for case in invalid_cases:
+            with self.subTest(case=case):
+                with self.assertRaises(ValueError):
+                    ColumnarScorableMinerIndex(**{**valid, **case})
+
+    def test_columnar_index_bucket_at_scorable_byte(self):
+        """Tests that each scorable byte maps to the bucket holding it, skipping buckets without scorable bytes."""
+        index = ColumnarScorableMinerIndex(
+            sources=[DataSource.REDDIT] * 4,
+            label_ids=[0] * 4,
+            labels=[None],
+            time_bucket_ids=[1, 2, 3, 4],
+            size_bytes=[100, 100, 100, 100],
+            scorable_bytes=[2, 0, 3, 1],
+            last_updated=dt.datetime.now(tz=dt.timezone.utc),
+        )
+
+        self.assertEqual(index.total_scorable_bytes(), 6)
+        self.assertEqual(
+            [index.bucket_at_scorable_byte(byte) for byte in range(6)],
+            [0, 0, 2, 2, 2, 3],
+        )
+        for byte in [-1, 6]:
+            with self.assertRaises(ValueError):
+                index.bucket_at_scorable_byte(byte)
+
+
+    def test_columnar_compressed_index_from_json(self):
+        """Tests that decoding a serialized index matches decoding it with pydantic."""
+        compressed_index = CompressedMinerIndex(
+            sources={
+                DataSource.REDDIT: [
+                    CompressedEntityBucket(
+                        label="r/bittensor_",
+                        time_bucket_ids=[5, 6],
+                        sizes_bytes=[100, 200],
+                    ),
+                    CompressedEntityBucket(
+                        label=None, time_bucket_ids=[7], sizes_bytes=[0]
+                    ),
+                ],
+                DataSource.X: [
+                    CompressedEntityBucket(
+                        label="#Bittensor",
+                        time_bucket_ids=[6],
+                        sizes_bytes=[300],
+                    )
+                ],
+            }
+        )
+
+        index = ColumnarCompressedMinerIndex.from_json(
+            compressed_index.model_dump_json()
+        )
+
+        self.assertEqual(index.bucket_count(), 4)
+        self.assertEqual(index.size_bytes(), 600)
+        self.assertEqual(index.to_compressed_index(), compressed_index)
+        self.assertEqual(
+            index.to_compressed_index(),
+            CompressedMinerIndex.model_validate_json(
+                compressed_index.model_dump_json()
+            ),
+        )
+
+    def test_columnar_compressed_index_from_json_invalid(self):
+        """Tests that invalid serialized indexes are rejected with a ValueError."""
+        invalid_payloads = [
+            "not json",
+            "[]",
+            '{"sources": []}',
+            '{"sources": {"reddit": []}}',
+            '{"sources": {"1": {}}}',
+            '{"sources": {"1": [{"label": 5, "time_bucket_ids": [1], "sizes_bytes": [1]}]}}',
+            '{"sources": {"1": [{"label": "a", "time_bucket_ids": ["1"], "sizes_bytes": [1]}]}}',
+            '{"sources": {"1": [{"label": "a", "time_bucket_ids": [1], "sizes_bytes": [1.5]}]}}',
+            '{"sources": {"1": [{"label": "a", "time_bucket_ids": [1], "sizes_bytes": [-1]}]}}',
+            '{"sources": {"1": [{"label": "a", "time_bucket_ids": [1], "sizes_bytes": [%d]}]}}'
+            % (constants.DATA_ENTITY_BUCKET_SIZE_LIMIT_BYTES + 1),
+            '{"sources": {"1": [{"label": "%s", "time_bucket_ids": [1], "sizes_bytes": [1]}]}}'
+            % ("a" * (constants.MAX_LABEL_LENGTH + 1)),
+            '{"sources": {"1": [{"label": "a", "time_bucket_ids": [%s], "sizes_bytes": []}]}}'
+            % ",".join(
+                ["1"]
+                * (
+                    constants.DATA_ENTITY_BUCKET_COUNT_LIMIT_PER_MINER_INDEX_PROTOCOL_4
+                    + 1
+                )
+            ),
+        ]
+        for payload in invalid_payloads:
+            with self.subTest(payload=payload[:100]):
+                with self.assertRaises(ValueError):
+                    ColumnarCompressedMinerIndex.from_json(payload)
 
 if __name__ == "__main__":
     unittest.main()
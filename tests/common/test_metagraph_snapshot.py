@@ -0,0 +1,60 @@
+import dataclasses
+import unittest
+from types import SimpleNamespace
+
+import bittensor as bt
+import numpy as np
+
+from common import utils
+from common.metagraph_snapshot import MetagraphSnapshot
+
+
+def _create_metagraph() -> SimpleNamespace:
+    return SimpleNamespace(
+        netuid=13,
+        block=np.array([100]),
+        n=np.array([3]),
+        uids=np.array([0, 1, 2]),
+        hotkeys=["hotkey0", "hotkey1", "hotkey2"],
+        coldkeys=["coldkey0", "coldkey1", "coldkey1"],
+        axons=[bt.AxonInfo(0, "0.0.0.0", 0, 0, hotkey, "") for hotkey in ["hotkey0", "hotkey1", "hotkey2"]],
+        S=np.array([20_000.0, 0.0, 0.0]),
+        I=np.array([0.0, 0.25, 0.75]),
+        validator_permit=np.array([True, False, False]),
+    )
+
+
+class TestMetagraphSnapshot(unittest.TestCase):
+    def test_from_metagraph(self):
+        """Tests that a snapshot copies the metagraph, and works with the metagraph helpers in utils."""
+        metagraph = _create_metagraph()
+        snapshot = MetagraphSnapshot.from_metagraph(metagraph)
+
+        self.assertEqual(snapshot.block, 100)
+        self.assertEqual(snapshot.n, 3)
+        self.assertEqual(snapshot.hotkeys, ("hotkey0", "hotkey1", "hotkey2"))
+        self.assertEqual(snapshot.get_uid("hotkey2"), 2)
+        self.assertIsNone(snapshot.get_uid("unknown"))
+        self.assertEqual(utils.get_miner_uids(snapshot, 0, 10_000), [1, 2])
+        self.assertTrue(utils.is_validator(0, snapshot))
+
+        # Changes to the metagraph after the snapshot is built aren't reflected in it.
+        metagraph.I[1] = 1.0
+        metagraph.hotkeys[1] = "replaced"
+        self.assertEqual(snapshot.I[1], 0.25)
+        self.assertEqual(snapshot.hotkeys[1], "hotkey1")
+
+    def test_is_immutable(self):
+        """Tests that a snapshot can't be modified."""
+        snapshot = MetagraphSnapshot.from_metagraph(_create_metagraph())
+
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            snapshot.block = 101
+        with self.assertRaises(ValueError):
+            snapshot.I[0] = 1.0
+        with self.assertRaises(TypeError):
+            snapshot.uid_by_hotkey["new"] = 3
+
+
+if __name__ == "__main__":
+    unittest.main()
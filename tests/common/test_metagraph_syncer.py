@@ -36,6 +36,13 @@ class TestMetagraphSyncer(unittest.TestCase):
         self.assertEqual(metagraph_syncer.get_metagraph(1).netuid, metagraph1.netuid)
         self.assertEqual(metagraph_syncer.get_metagraph(2).netuid, metagraph2.netuid)
 
+        # Verify a snapshot is built once per sync and shared.
+        self.assertEqual(metagraph_syncer.get_metagraph_snapshot(1).netuid, 1)
+        self.assertIs(
+            metagraph_syncer.get_metagraph_snapshot(2),
+            metagraph_syncer.get_metagraph_snapshot(2),
+        )
+
     def test_listener_called(self):
         # Mock subtensor.metagraph() function
         metagraph1 = bt.metagraph(netuid=1, sync=False)
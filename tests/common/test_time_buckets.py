@@ -0,0 +1,88 @@
+import datetime as dt
+import unittest
+
+import numpy as np
+import pytz
+
+from common import time_buckets
+from common.data import TimeBucket
+from common.date_range import DateRange
+
+
+class TestTimeBuckets(unittest.TestCase):
+    def setUp(self):
+        start = dt.datetime(2023, 12, 12, 0, 0, 0, tzinfo=dt.timezone.utc)
+        self.datetimes = [
+            start + dt.timedelta(minutes=minutes, microseconds=1)
+            for minutes in range(0, 48 * 60, 17)
+        ] + [
+            start,
+            start - dt.timedelta(microseconds=1),
+            dt.datetime(2023, 12, 12, 2, 30, tzinfo=pytz.timezone("America/Los_Angeles")),
+        ]
+
+    def test_id_from_datetime(self):
+        """Tests that ids match the ids of the equivalent TimeBuckets."""
+        for datetime in self.datetimes:
+            expected = int(datetime.astimezone(dt.timezone.utc).timestamp() // 3600)
+            self.assertEqual(time_buckets.id_from_datetime(datetime), expected)
+            self.assertEqual(TimeBucket.from_datetime(datetime).id, expected)
+
+    def test_id_from_naive_datetime(self):
+        """Tests that naive datetimes are interpreted the same way as datetime.astimezone."""
+        datetime = dt.datetime(2023, 12, 12, 1, 30)
+        self.assertEqual(
+            time_buckets.id_from_datetime(datetime),
+            int(datetime.astimezone(dt.timezone.utc).timestamp() // 3600),
+        )
+
+    def test_ids_from_datetimes(self):
+        """Tests that the vectorized ids match the scalar ids."""
+        ids = time_buckets.ids_from_datetimes(self.datetimes)
+
+        self.assertEqual(ids.dtype, np.int64)
+        self.assertEqual(
+            ids.tolist(),
+            [time_buckets.id_from_datetime(datetime) for datetime in self.datetimes],
+        )
+        self.assertEqual(time_buckets.ids_from_datetimes([]).tolist(), [])
+
+    def test_to_date_range(self):
+        """Tests that the date range covers exactly the hour of the TimeBucket, in UTC."""
+        for datetime in self.datetimes:
+            time_bucket_id = time_buckets.id_from_datetime(datetime)
+            date_range = time_buckets.to_date_range(time_bucket_id)
+
+            self.assertTrue(date_range.contains(datetime))
+            self.assertEqual(date_range.start.tzinfo, dt.timezone.utc)
+            self.assertEqual(date_range.end - date_range.start, dt.timedelta(hours=1))
+            self.assertEqual(
+                date_range, TimeBucket.to_date_range(TimeBucket(id=time_bucket_id))
+            )
+            self.assertEqual(
+                date_range,
+                DateRange(
+                    start=dt.datetime.fromtimestamp(
+                        time_bucket_id * 3600, tz=dt.timezone.utc
+                    ),
+                    end=dt.datetime.fromtimestamp(
+                        (time_bucket_id + 1) * 3600, tz=dt.timezone.utc
+                    ),
+                ),
+            )
+
+    def test_ages_in_hours(self):
+        """Tests that the vectorized ages match the scalar ages, with future buckets treated as current."""
+        time_bucket_ids = np.array([90, 99, 100, 101, 150])
+
+        ages = time_buckets.ages_in_hours(time_bucket_ids, 100)
+
+        self.assertEqual(ages.tolist(), [10, 1, 0, 0, 0])
+        self.assertEqual(
+            ages.tolist(),
+            [time_buckets.age_in_hours(i, 100) for i in time_bucket_ids.tolist()],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
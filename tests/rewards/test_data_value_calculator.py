@@ -2,7 +2,7 @@ import unittest
 
 from attr import dataclass
 from common import constants, utils
-from common.data_v2 import ScorableDataEntityBucket
+from common.data_v2 import ColumnarScorableMinerIndex, ScorableDataEntityBucket
 from rewards.data import DataSourceDesirability, DataDesirabilityLookup
 from rewards.data_value_calculator import DataValueCalculator
 from common.data import (
@@ -164,6 +164,61 @@ class TestDataValueCalculator(unittest.TestCase):
             self.assertLess(score, previous_score)
             previous_score = score
 
+    def test_get_score_for_index_matches_per_bucket_scores(self):
+        """Verifies scoring a columnar index equals the sum of scoring each bucket individually."""
+        now = dt.datetime(2023, 12, 12, 12, 30, 0, tzinfo=dt.timezone.utc)
+        current_time_bucket = TimeBucket.from_datetime(now)
+
+        buckets = []
+        labels = ["testlabel", "unscoredlabel", "penalizedlabel", "other", None]
+        for hours_back in range(0, constants.DATA_ENTITY_BUCKET_AGE_LIMIT_DAYS * 24 + 5, 7):
+            for i, label in enumerate(labels):
+                buckets.append(
+                    ScorableDataEntityBucket(
+                        time_bucket_id=current_time_bucket.id - hours_back,
+                        source=DataSource.REDDIT if i % 2 else DataSource.X,
+                        label=("#" + label) if label and i % 2 == 0 else label,
+                        size_bytes=200 + i,
+                        scorable_bytes=100 + i,
+                    )
+                )
+        # Include a bucket from the future, which is treated as current.
+        buckets.append(
+            ScorableDataEntityBucket(
+                time_bucket_id=current_time_bucket.id + 3,
+                source=DataSource.REDDIT,
+                label="testlabel",
+                size_bytes=10,
+                scorable_bytes=10,
+            )
+        )
+
+        expected = sum(
+            self.value_calculator.get_score_for_data_entity_bucket(
+                bucket, current_time_bucket
+            )
+            for bucket in buckets
+        )
+        index = ColumnarScorableMinerIndex.from_scorable_buckets(buckets, now)
+
+        self.assertAlmostEqual(
+            self.value_calculator.get_score_for_index(index, current_time_bucket),
+            expected,
+            places=5,
+        )
+
+    def test_get_score_for_empty_index(self):
+        """Verifies an empty columnar index scores 0."""
+        now = dt.datetime(2023, 12, 12, 12, 30, 0, tzinfo=dt.timezone.utc)
+        index = ColumnarScorableMinerIndex.from_scorable_buckets([], now)
+
+        self.assertEqual(
+            self.value_calculator.get_score_for_index(
+                index, TimeBucket.from_datetime(now)
+            ),
+            0.0,
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
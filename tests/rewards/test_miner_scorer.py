@@ -452,6 +452,17 @@ class TestMinerScorer(unittest.TestCase):
             0.92 * self.scorable_index_full_score,
         )
 
+    def test_miner_scoring_state_round_trip(self):
+        """Tests that a miner's scoring state, including its HF boost and credibility, is restored exactly."""
+        self._add_score_to_uid(0)
+        self.scorer.update_hf_boost_and_cred(0, 80)
+        state = self.scorer.get_miner_scoring_state(0)
+
+        self.scorer.set_miner_scoring_state(1, state)
+
+        self.assertEqual(state, self.scorer.get_miner_scoring_state(1))
+        self.assertNotEqual(1.0, state["hf_credibility"])
+
     def test_score_miner_perf(self):
         """A perf test to check how long it takes to score an index."""
 
@@ -0,0 +1,140 @@
+import asyncio
+import time
+import unittest
+
+from scraping.adaptive_concurrency import AimdConcurrencyLimiter, ScrapeOutcome
+
+
+class TestAimdConcurrencyLimiter(unittest.TestCase):
+    def test_additive_increase(self):
+        """Tests that the limit grows by ~1 per limit's worth of successes, up to the max."""
+
+        async def run():
+            limiter = AimdConcurrencyLimiter(max_limit=3)
+            self.assertEqual(1.0, limiter.limit)
+
+            # A single success at a limit of 1 raises it to 2.
+            await limiter.release(await limiter.acquire(), ScrapeOutcome.SUCCESS)
+            self.assertEqual(2.0, limiter.limit)
+
+            # Each success adds 1 / limit, so from 2 it takes 3 successes to reach 3.
+            for _ in range(2):
+                await limiter.release(await limiter.acquire(), ScrapeOutcome.SUCCESS)
+            self.assertAlmostEqual(2.9, limiter.limit)
+            await limiter.release(await limiter.acquire(), ScrapeOutcome.SUCCESS)
+            self.assertEqual(3.0, limiter.limit)
+
+            # The limit never exceeds the max.
+            for _ in range(10):
+                await limiter.release(await limiter.acquire(), ScrapeOutcome.SUCCESS)
+            self.assertEqual(3.0, limiter.limit)
+
+        asyncio.run(run())
+
+    def test_multiplicative_decrease(self):
+        """Tests that failures and timeouts halve the limit, down to 1."""
+
+        async def run():
+            limiter = AimdConcurrencyLimiter(max_limit=10, initial_limit=8)
+
+            for outcome, expected_limit in [
+                (ScrapeOutcome.ERROR, 4.0),
+                (ScrapeOutcome.TIMEOUT, 2.0),
+                (ScrapeOutcome.ERROR, 1.0),
+            ]:
+                await limiter.release(await limiter.acquire(), outcome)
+                self.assertEqual(expected_limit, limiter.limit)
+
+        asyncio.run(run())
+
+    def test_empty_streak_decreases(self):
+        """Tests that empty scrapes leave the limit alone, unless there are EMPTY_STREAK_LIMIT in a row."""
+
+        async def run():
+            limiter = AimdConcurrencyLimiter(max_limit=10, initial_limit=8)
+
+            for _ in range(AimdConcurrencyLimiter.EMPTY_STREAK_LIMIT - 1):
+                await limiter.release(await limiter.acquire(), ScrapeOutcome.EMPTY)
+            self.assertEqual(8.0, limiter.limit)
+
+            # A success ends the streak.
+            await limiter.release(await limiter.acquire(), ScrapeOutcome.SUCCESS)
+            limit = limiter.limit
+            for _ in range(AimdConcurrencyLimiter.EMPTY_STREAK_LIMIT - 1):
+                await limiter.release(await limiter.acquire(), ScrapeOutcome.EMPTY)
+            self.assertEqual(limit, limiter.limit)
+
+            await limiter.release(await limiter.acquire(), ScrapeOutcome.EMPTY)
+            self.assertEqual(limit / 2, limiter.limit)
+
+        asyncio.run(run())
+
+    def test_concurrent_failures_decrease_once(self):
+        """Tests that scrapes already running when the limit was decreased don't decrease it again."""
+
+        async def run():
+            limiter = AimdConcurrencyLimiter(max_limit=10, initial_limit=8)
+            started = [await limiter.acquire() for _ in range(4)]
+
+            for started_at in started:
+                await limiter.release(started_at, ScrapeOutcome.ERROR)
+
+            self.assertEqual(4.0, limiter.limit)
+            self.assertEqual(0, limiter.in_flight)
+
+        asyncio.run(run())
+
+    def test_slow_success_decreases(self):
+        """Tests that a success much slower than typical counts as congestion."""
+
+        async def run():
+            limiter = AimdConcurrencyLimiter(max_limit=10, initial_limit=4)
+            limiter.typical_latency = 5.0
+
+            await limiter.release(
+                time.monotonic() - 10 * limiter.typical_latency, ScrapeOutcome.SUCCESS
+            )
+
+            self.assertEqual(2.0, limiter.limit)
+
+        asyncio.run(run())
+
+    def test_fast_success_never_slow(self):
+        """Tests that a success faster than MIN_CONGESTED_LATENCY_SECS doesn't count as congestion, however typical."""
+
+        async def run():
+            limiter = AimdConcurrencyLimiter(max_limit=10, initial_limit=4)
+            limiter.typical_latency = 0.001
+
+            await limiter.release(time.monotonic() - 1.0, ScrapeOutcome.SUCCESS)
+
+            self.assertEqual(4.25, limiter.limit)
+
+        asyncio.run(run())
+
+    def test_acquire_waits_for_capacity(self):
+        """Tests that no more than limit scrapes run at once."""
+
+        async def run():
+            limiter = AimdConcurrencyLimiter(max_limit=2, initial_limit=2)
+            running = 0
+            max_running = 0
+
+            async def scrape():
+                nonlocal running, max_running
+                started_at = await limiter.acquire()
+                running += 1
+                max_running = max(max_running, running)
+                await asyncio.sleep(0.01)
+                running -= 1
+                # Fail, so the limit stays at 2 or below.
+                await limiter.release(started_at, ScrapeOutcome.ERROR)
+
+            await asyncio.gather(*[scrape() for _ in range(6)])
+            return max_running
+
+        self.assertLessEqual(asyncio.run(run()), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
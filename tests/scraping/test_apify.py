@@ -0,0 +1,108 @@
+import asyncio
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from scraping.apify import ActorRunError, ActorRunner, RunConfig
+
+
+def _make_client(finished_run, items=()):
+    """Returns a mock ApifyClientAsync whose runs finish as finished_run, with the given dataset items."""
+    client = MagicMock()
+    client.actor.return_value.start = AsyncMock(
+        return_value={"id": "run", "status": "READY", "defaultDatasetId": "dataset"}
+    )
+    client.run.return_value.wait_for_finish = AsyncMock(return_value=finished_run)
+    client.run.return_value.abort = AsyncMock(
+        return_value={"id": "run", "status": "ABORTED", "defaultDatasetId": "dataset"}
+    )
+
+    async def iterate_items():
+        for item in items:
+            yield item
+
+    client.dataset.return_value.iterate_items = iterate_items
+    return client
+
+
+class TestActorRunner(unittest.TestCase):
+    def setUp(self):
+        self.config = RunConfig(
+            api_key="key", actor_id="actor", timeout_secs=60, debug_info="test"
+        )
+
+    def test_run_reuses_client(self):
+        """Tests that runs on the same event loop share a client."""
+        client = _make_client(
+            {"status": "SUCCEEDED", "defaultDatasetId": "dataset"}, items=[{"a": 1}]
+        )
+        runner = ActorRunner()
+
+        async def run():
+            return [await runner.run(self.config, {}) for _ in range(2)]
+
+        with patch("scraping.apify.ApifyClientAsync", return_value=client) as factory:
+            results = asyncio.run(run())
+
+        self.assertEqual([[{"a": 1}], [{"a": 1}]], results)
+        factory.assert_called_once_with("key")
+
+    def test_run_failed(self):
+        client = _make_client({"status": "FAILED", "defaultDatasetId": "dataset"})
+
+        with patch("scraping.apify.ApifyClientAsync", return_value=client):
+            with self.assertRaises(ActorRunError):
+                asyncio.run(ActorRunner().run(self.config, {}))
+
+    def test_run_exceeding_timeout_aborted(self):
+        """Tests that a run still going after its timeout is aborted, and its partial results returned."""
+        for status in ["READY", "RUNNING", "TIMING-OUT", "ABORTING"]:
+            with self.subTest(status=status):
+                client = _make_client(
+                    {"status": status, "defaultDatasetId": "dataset"}, items=[{"a": 1}]
+                )
+
+                with patch("scraping.apify.ApifyClientAsync", return_value=client):
+                    results = asyncio.run(ActorRunner().run(self.config, {}))
+
+                self.assertEqual([{"a": 1}], results)
+                client.run.return_value.abort.assert_awaited_once()
+
+    def test_cancelled_run_aborted(self):
+        client = _make_client(None)
+        client.run.return_value.wait_for_finish = AsyncMock(
+            side_effect=asyncio.CancelledError()
+        )
+
+        with patch("scraping.apify.ApifyClientAsync", return_value=client):
+            with self.assertRaises(asyncio.CancelledError):
+                asyncio.run(ActorRunner().run(self.config, {}))
+
+        client.run.return_value.abort.assert_awaited_once()
+
+    def test_concurrent_runs_limited_per_actor(self):
+        runner = ActorRunner(max_concurrent_runs_per_actor=2)
+        client = _make_client(None)
+        running = 0
+        max_running = 0
+
+        async def wait_for_finish(wait_secs):
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return {"status": "SUCCEEDED", "defaultDatasetId": "dataset"}
+
+        client.run.return_value.wait_for_finish = wait_for_finish
+
+        async def run():
+            await asyncio.gather(*[runner.run(self.config, {}) for _ in range(6)])
+
+        with patch("scraping.apify.ApifyClientAsync", return_value=client):
+            asyncio.run(run())
+
+        self.assertEqual(2, max_running)
+
+
+if __name__ == "__main__":
+    unittest.main()
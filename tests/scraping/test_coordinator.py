@@ -1,5 +1,7 @@
 from collections import defaultdict
+import asyncio
 import datetime as dt
+import threading
 from typing import Any, Callable, Iterable
 import unittest
 from unittest.mock import Mock
@@ -14,7 +16,10 @@ from scraping.coordinator import (
     ScraperCoordinator,
     _choose_scrape_configs,
 )
+from rewards.data import DataDesirabilityLookup, DataSourceDesirability
 from scraping.provider import ScraperProvider
+from scraping.scrape_scheduler import ScrapeScheduler
+from scraping.scrape_yield_store import ScrapeYieldStore
 from scraping.scraper import ScrapeConfig, Scraper, ScraperId
 from storage.miner.miner_storage import MinerStorage
 import tests.utils as test_utils
@@ -66,6 +71,39 @@ class TestScraperCoordinator(unittest.TestCase):
             tracker.get_scraper_ids_ready_to_scrape(now),
         )
 
+    def test_tracker_get_next_scrape_time(self):
+        """Tests the Coordinator's Tracker returns when the next scraper is due."""
+        config = CoordinatorConfig(
+            scraper_configs={
+                ScraperId.REDDIT_LITE: ScraperConfig(
+                    cadence_seconds=60,
+                    labels_to_scrape=[],
+                ),
+                ScraperId.X_MICROWORLDS: ScraperConfig(
+                    cadence_seconds=120,
+                    labels_to_scrape=[],
+                ),
+            }
+        )
+        now = dt.datetime.now()
+        tracker = ScraperCoordinator.Tracker(config, now)
+
+        self.assertEqual(now + dt.timedelta(seconds=60), tracker.get_next_scrape_time())
+
+        tracker.on_scrape_scheduled(ScraperId.REDDIT_LITE, now + dt.timedelta(seconds=90))
+        self.assertEqual(
+            now + dt.timedelta(seconds=120), tracker.get_next_scrape_time()
+        )
+
+        # Excluded scrapers aren't considered.
+        self.assertEqual(
+            now + dt.timedelta(seconds=150),
+            tracker.get_next_scrape_time([ScraperId.X_MICROWORLDS]),
+        )
+        self.assertIsNone(
+            tracker.get_next_scrape_time([ScraperId.X_MICROWORLDS, ScraperId.REDDIT_LITE])
+        )
+
     def test_choose_scrape_configs(self):
         """Verifies the Coordinator logic for choosing scrape configs."""
 
@@ -163,6 +201,217 @@ class TestScraperCoordinator(unittest.TestCase):
             self.assertGreater(count, previous_count)
             previous_count = count
 
+    def test_choose_scrape_configs_with_scheduler(self):
+        """Verifies that a scheduler chooses labels by desirability, within the configured choices and age."""
+        config = CoordinatorConfig(
+            scraper_configs={
+                ScraperId.REDDIT_LITE: ScraperConfig(
+                    cadence_seconds=60,
+                    labels_to_scrape=[
+                        LabelScrapingConfig(
+                            label_choices=[
+                                DataLabel(value="r/desirable"),
+                                DataLabel(value="r/undesirable"),
+                            ],
+                            max_data_entities=10,
+                            max_age_hint_minutes=60 * 5,
+                        ),
+                    ],
+                ),
+            }
+        )
+        scheduler = ScrapeScheduler(
+            DataDesirabilityLookup(
+                distribution={
+                    DataSource.REDDIT: DataSourceDesirability(
+                        weight=1.0,
+                        default_scale_factor=-1.0,
+                        label_scale_factors={DataLabel(value="r/desirable"): 1.0},
+                    ),
+                },
+                max_age_in_hours=24,
+            )
+        )
+        now = dt.datetime(2023, 12, 12, 12, 45, 0)
+        oldest_start = TimeBucket.to_date_range(
+            TimeBucket.from_datetime(now - dt.timedelta(hours=5))
+        ).start
+
+        label_counts = defaultdict(int)
+        runs = 1000
+        for _ in range(runs):
+            scrape_configs = _choose_scrape_configs(
+                ScraperId.REDDIT_LITE, config, now, scheduler
+            )
+
+            self.assertEqual(1, len(scrape_configs))
+            self.assertEqual(10, scrape_configs[0].entity_limit)
+            self.assertGreaterEqual(scrape_configs[0].date_range.start, oldest_start)
+            label_counts[scrape_configs[0].labels[0]] += 1
+
+        # The undesirable label is only chosen when the scheduler explores.
+        self.assertLess(
+            label_counts[DataLabel(value="r/undesirable")] / runs,
+            ScrapeScheduler.EXPLORATION_RATE,
+        )
+
+    def test_scrape_drops_stored_entities(self):
+        """Tests that entities already in storage are dropped after a scrape, and counted per scraper and label, and
+        that the scrape's yield is recorded."""
+        entities = [
+            DataEntity(
+                uri=f"http://example.com/{i}",
+                datetime=dt.datetime.now(),
+                source=DataSource.REDDIT,
+                content=b"content",
+                content_size_bytes=7,
+            )
+            for i in range(4)
+        ]
+        mock_scraper = Mock(spec=Scraper)
+        mock_scraper.scrape.return_value = entities
+        mock_storage = Mock(spec=MinerStorage)
+        mock_storage.list_unstored_data_entities.return_value = entities[:1]
+        mock_yield_store = Mock(spec=ScrapeYieldStore)
+        coordinator = ScraperCoordinator(
+            scraper_provider=ScraperProvider(factories={}),
+            miner_storage=mock_storage,
+            config=CoordinatorConfig(
+                scraper_configs={
+                    ScraperId.REDDIT_LITE: ScraperConfig(
+                        cadence_seconds=60, labels_to_scrape=[]
+                    )
+                }
+            ),
+            scrape_yield_store=mock_yield_store,
+        )
+        scrape_config = ScrapeConfig(
+            entity_limit=None,
+            date_range=TimeBucket.to_date_range(TimeBucket.from_datetime(dt.datetime.now())),
+            labels=[DataLabel(value="r/bittensor_")],
+        )
+
+        new_entities = asyncio.run(
+            coordinator._scrape(ScraperId.REDDIT_LITE, mock_scraper, scrape_config)
+        )
+
+        self.assertEqual(entities[:1], new_entities)
+        mock_storage.list_unstored_data_entities.assert_called_once_with(entities)
+        self.assertEqual(
+            {(ScraperId.REDDIT_LITE, "r/bittensor_"): 0.75},
+            coordinator.get_duplicate_rates(),
+        )
+        # Only new bytes count towards the label's yield.
+        self.assertEqual(
+            7,
+            coordinator.scheduler.yield_bytes[(ScraperId.REDDIT_LITE, "r/bittensor_")],
+        )
+        # The scrape's yield is recorded.
+        scrape_yield = mock_yield_store.record.call_args.args[0]
+        self.assertEqual(ScraperId.REDDIT_LITE.value, scrape_yield.scraper_id)
+        self.assertEqual("r/bittensor_", scrape_yield.label)
+        self.assertEqual("success", scrape_yield.outcome)
+        self.assertEqual((4, 1), (scrape_yield.entity_count, scrape_yield.new_entity_count))
+        self.assertEqual(
+            (28, 7),
+            (scrape_yield.content_size_bytes, scrape_yield.new_content_size_bytes),
+        )
+
+    def test_worker_wakes_loop_for_backlogged_scraper(self):
+        """Tests that a worker finishing a scrape reschedules its scraper if it was deferred for a backlog."""
+        coordinator = ScraperCoordinator(
+            scraper_provider=ScraperProvider(factories={}),
+            miner_storage=Mock(spec=MinerStorage),
+            config=CoordinatorConfig(
+                scraper_configs={
+                    ScraperId.REDDIT_LITE: ScraperConfig(
+                        cadence_seconds=60, labels_to_scrape=[]
+                    )
+                }
+            ),
+        )
+        coordinator.backlogged_scraper_ids.add(ScraperId.REDDIT_LITE)
+
+        async def run():
+            coordinator.wakeup = asyncio.Event()
+            queue = asyncio.Queue()
+
+            async def scrape():
+                return []
+
+            queue.put_nowait(scrape)
+            queue.put_nowait(None)
+            await coordinator._worker("worker", ScraperId.REDDIT_LITE, queue)
+            return coordinator.wakeup.is_set()
+
+        self.assertTrue(asyncio.run(run()))
+        self.assertEqual(set(), coordinator.backlogged_scraper_ids)
+
+    def test_stop_wakes_coordinator(self):
+        """Tests that the coordinator stops promptly, without waiting for the next scrape to be due."""
+        coordinator = ScraperCoordinator(
+            scraper_provider=ScraperProvider(
+                factories={ScraperId.REDDIT_LITE: lambda: Mock(spec=Scraper)}
+            ),
+            miner_storage=Mock(spec=MinerStorage),
+            config=CoordinatorConfig(
+                scraper_configs={
+                    ScraperId.REDDIT_LITE: ScraperConfig(
+                        cadence_seconds=3600, labels_to_scrape=[]
+                    )
+                }
+            ),
+        )
+        coordinator.run_in_background_thread()
+        test_utils.wait_for_condition(lambda: coordinator.wakeup is not None)
+
+        coordinator.stop()
+        coordinator.thread.join(timeout=10)
+
+        self.assertFalse(coordinator.thread.is_alive())
+
+    def test_scrapes_scheduled_while_coverage_refreshes(self):
+        """Tests that scrapes aren't held up while the miner's index is still being built."""
+        index_built = threading.Event()
+        mock_storage = Mock(spec=MinerStorage)
+        mock_storage.get_compressed_index.side_effect = lambda: index_built.wait()
+        mock_storage.list_unstored_data_entities.side_effect = lambda entities: entities
+        mock_scraper = Mock(spec=Scraper)
+        mock_scraper.scrape.return_value = []
+        coordinator = ScraperCoordinator(
+            scraper_provider=ScraperProvider(
+                factories={ScraperId.REDDIT_LITE: lambda: mock_scraper}
+            ),
+            miner_storage=mock_storage,
+            config=CoordinatorConfig(
+                scraper_configs={
+                    ScraperId.REDDIT_LITE: ScraperConfig(
+                        cadence_seconds=1,
+                        labels_to_scrape=[
+                            LabelScrapingConfig(
+                                label_choices=[DataLabel(value="label1")],
+                                max_data_entities=10,
+                                max_age_hint_minutes=60
+                                * 24
+                                * constants.DATA_ENTITY_BUCKET_AGE_LIMIT_DAYS,
+                            ),
+                        ],
+                    )
+                }
+            ),
+        )
+
+        coordinator.run_in_background_thread()
+        try:
+            test_utils.wait_for_condition(
+                lambda: mock_scraper.scrape.called, timeout=30
+            )
+            self.assertTrue(mock_storage.get_compressed_index.called)
+        finally:
+            index_built.set()
+            coordinator.stop()
+            coordinator.thread.join(timeout=10)
+
     def test_scraping_coordinator_runs(self):
         """Tests the ScrapingCoordinator successfully performs a scrape and stores it into storage."""
         # Create some DataEntities to return from the Mock Scraper.
@@ -181,6 +430,7 @@ class TestScraperCoordinator(unittest.TestCase):
         mock_scraper.scrape.return_value = expected_entities
 
         mock_storage = Mock(spec=MinerStorage)
+        mock_storage.list_unstored_data_entities.side_effect = lambda entities: entities
 
         # Create a ScraperProvider that uses the Mock Scraper
         provider = ScraperProvider(
@@ -0,0 +1,87 @@
+import unittest
+from unittest.mock import Mock
+
+from common.data import CompressedEntityBucket, CompressedMinerIndex, DataSource
+from scraping.coverage_planner import CoveragePlanner
+from storage.miner.miner_storage import MinerStorage
+
+
+class TestCoveragePlanner(unittest.TestCase):
+    def setUp(self):
+        self.storage = Mock(spec=MinerStorage)
+        self.storage.get_compressed_index.return_value = CompressedMinerIndex(
+            sources={
+                DataSource.REDDIT: [
+                    CompressedEntityBucket(
+                        label="r/bittensor_",
+                        time_bucket_ids=[10, 11, 12],
+                        sizes_bytes=[100, 25, 200],
+                    ),
+                ],
+                DataSource.X: [
+                    CompressedEntityBucket(
+                        label=None, time_bucket_ids=[10], sizes_bytes=[50]
+                    ),
+                ],
+            }
+        )
+        self.planner = CoveragePlanner(self.storage, target_bucket_size_bytes=100)
+
+    def test_get_unfilled_fractions(self):
+        self.planner.refresh()
+
+        self.assertEqual(
+            [0.0, 0.75, 0.0, 1.0],
+            self.planner.get_unfilled_fractions(
+                DataSource.REDDIT, "r/bittensor_", [10, 11, 12, 13]
+            ),
+        )
+        self.assertEqual(
+            [0.5], self.planner.get_unfilled_fractions(DataSource.X, None, [10])
+        )
+        # Labels and sources the miner holds nothing for are entirely unfilled.
+        self.assertEqual(
+            [1.0], self.planner.get_unfilled_fractions(DataSource.X, "#tao", [10])
+        )
+        self.assertEqual(
+            [1.0],
+            self.planner.get_unfilled_fractions(DataSource.YOUTUBE, None, [10]),
+        )
+
+    def test_get_unfilled_fractions_truncated_index(self):
+        """Tests that buckets left out of a full index are assumed to hold as much as the smallest bucket it lists."""
+        self.planner.INDEX_BUCKET_COUNT_LIMIT = 4
+        self.planner.refresh()
+
+        # The smallest listed bucket holds 25 of the target 100 bytes.
+        self.assertEqual(
+            [0.75, 0.75],
+            self.planner.get_unfilled_fractions(DataSource.REDDIT, "r/bittensor_", [13])
+            + self.planner.get_unfilled_fractions(DataSource.YOUTUBE, None, [10]),
+        )
+        self.assertEqual(
+            [0.5], self.planner.get_unfilled_fractions(DataSource.X, None, [10])
+        )
+
+    def test_get_unfilled_fractions_before_refresh(self):
+        self.assertEqual(
+            [1.0, 1.0],
+            self.planner.get_unfilled_fractions(
+                DataSource.REDDIT, "r/bittensor_", [10, 11]
+            ),
+        )
+        self.storage.get_compressed_index.assert_not_called()
+
+    def test_refresh_if_stale(self):
+        """Tests that the index is only re-read once it's been REFRESH_INTERVAL since it was last read."""
+        self.planner.refresh_if_stale()
+        self.planner.refresh_if_stale()
+        self.assertEqual(1, self.storage.get_compressed_index.call_count)
+
+        self.planner.last_refreshed -= CoveragePlanner.REFRESH_INTERVAL
+        self.planner.refresh_if_stale()
+        self.assertEqual(2, self.storage.get_compressed_index.call_count)
+
+
+if __name__ == "__main__":
+    unittest.main()
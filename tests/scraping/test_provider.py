@@ -0,0 +1,53 @@
+import asyncio
+import unittest
+from unittest.mock import AsyncMock, Mock
+
+from scraping.provider import ScraperProvider
+from scraping.scraper import Scraper, ScraperId
+
+
+class TestScraperProvider(unittest.TestCase):
+    def _make_provider(self):
+        factory = Mock(side_effect=lambda: Mock(spec=Scraper))
+        return ScraperProvider(factories={ScraperId.REDDIT_LITE: factory}), factory
+
+    def test_get_reuses_scraper(self):
+        """Tests that a scraper is only created once per id."""
+        provider, factory = self._make_provider()
+
+        scraper = provider.get(ScraperId.REDDIT_LITE)
+
+        self.assertIs(scraper, provider.get(ScraperId.REDDIT_LITE))
+        factory.assert_called_once()
+
+    def test_get_unsupported(self):
+        provider, _ = self._make_provider()
+
+        with self.assertRaises(AssertionError):
+            provider.get(ScraperId.X_MICROWORLDS)
+
+    def test_start(self):
+        """Tests that start creates and starts the scrapers, and that a failure to start doesn't propagate."""
+        provider, _ = self._make_provider()
+        scraper = provider.get(ScraperId.REDDIT_LITE)
+        scraper.start = AsyncMock(side_effect=Exception("Failed to connect"))
+
+        asyncio.run(provider.start([ScraperId.REDDIT_LITE]))
+
+        scraper.start.assert_awaited_once()
+
+    def test_close(self):
+        """Tests that close closes the scrapers and that later calls to get create new ones."""
+        provider, factory = self._make_provider()
+        scraper = provider.get(ScraperId.REDDIT_LITE)
+        scraper.close = AsyncMock()
+
+        asyncio.run(provider.close())
+
+        scraper.close.assert_awaited_once()
+        self.assertIsNot(scraper, provider.get(ScraperId.REDDIT_LITE))
+        self.assertEqual(2, factory.call_count)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,182 @@
+import datetime as dt
+import random
+import unittest
+from collections import Counter
+from unittest.mock import Mock
+
+from common import time_buckets
+from common.data import DataEntity, DataLabel, DataSource
+from rewards.data import DataDesirabilityLookup, DataSourceDesirability
+from scraping.coverage_planner import CoveragePlanner
+from scraping.scrape_scheduler import ScrapeScheduler, source_for_scraper_id
+from scraping.scraper import ScraperId
+
+
+def _lookup(x_label_scale_factors, max_age_in_hours=24) -> DataDesirabilityLookup:
+    return DataDesirabilityLookup(
+        distribution={
+            DataSource.REDDIT: DataSourceDesirability(weight=0.5),
+            DataSource.X: DataSourceDesirability(
+                weight=0.5,
+                default_scale_factor=0.0,
+                label_scale_factors={
+                    DataLabel(value=label): factor
+                    for label, factor in x_label_scale_factors.items()
+                },
+            ),
+        },
+        max_age_in_hours=max_age_in_hours,
+    )
+
+
+def _entity(size: int) -> DataEntity:
+    return DataEntity(
+        uri="https://x.com/1",
+        datetime=dt.datetime(2024, 1, 1, tzinfo=dt.timezone.utc),
+        source=DataSource.X,
+        content=b"a" * size,
+        content_size_bytes=size,
+    )
+
+
+class TestScrapeScheduler(unittest.TestCase):
+    def setUp(self):
+        self.labels = [DataLabel(value="#a"), DataLabel(value="#b"), DataLabel(value="#c")]
+
+    def _count_choices(self, scheduler: ScrapeScheduler, n: int = 2000) -> Counter:
+        return Counter(
+            scheduler.choose_label(ScraperId.X_APIDOJO, self.labels)[0].value
+            for _ in range(n)
+        )
+
+    def test_source_for_scraper_id(self):
+        self.assertEqual(DataSource.REDDIT, source_for_scraper_id(ScraperId.REDDIT_LITE))
+        self.assertEqual(DataSource.X, source_for_scraper_id(ScraperId.X_APIDOJO))
+        self.assertEqual(
+            DataSource.YOUTUBE, source_for_scraper_id(ScraperId.YOUTUBE_TRANSCRIPT)
+        )
+        # CoordinatorConfig stores ScraperIds by value.
+        self.assertEqual(DataSource.X, source_for_scraper_id("X.flash"))
+
+    def test_choose_label_no_choices(self):
+        scheduler = ScrapeScheduler(rng=random.Random(0))
+        self.assertIsNone(scheduler.choose_label(ScraperId.X_APIDOJO, None))
+        self.assertIsNone(scheduler.choose_label(ScraperId.X_APIDOJO, []))
+
+    def test_choose_label_by_desirability(self):
+        """Tests that labels are chosen in proportion to desirability, and undesirable labels only when exploring."""
+        scheduler = ScrapeScheduler(
+            _lookup({"#a": 1.0, "#b": 0.25, "#c": -1.0}), rng=random.Random(0)
+        )
+
+        counts = self._count_choices(scheduler)
+
+        self.assertGreater(counts["#a"], 3 * counts["#b"])
+        self.assertGreater(counts["#b"], counts["#c"])
+        # Only chosen when exploring, a third of the time.
+        self.assertLess(counts["#c"], 2000 * ScrapeScheduler.EXPLORATION_RATE)
+
+    def test_choose_label_by_yield(self):
+        """Tests that among equally desirable labels, those that yield more are chosen more often."""
+        scheduler = ScrapeScheduler(
+            _lookup({"#a": 1.0, "#b": 1.0, "#c": 1.0}), rng=random.Random(0)
+        )
+        scheduler.on_scrape_completed(
+            ScraperId.X_APIDOJO, [self.labels[0]], [_entity(1000)]
+        )
+        scheduler.on_scrape_completed(ScraperId.X_APIDOJO, [self.labels[1]], [_entity(10)])
+
+        counts = self._count_choices(scheduler)
+
+        # #c hasn't been scraped yet, so is assumed to yield as much as #a.
+        self.assertGreater(counts["#a"], 10 * counts["#b"])
+        self.assertGreater(counts["#c"], 10 * counts["#b"])
+
+    def test_on_scrape_completed_moving_average(self):
+        scheduler = ScrapeScheduler()
+
+        scheduler.on_scrape_completed(ScraperId.X_APIDOJO, [self.labels[0]], [_entity(100)])
+        scheduler.on_scrape_completed(ScraperId.X_APIDOJO, [self.labels[0]], [])
+        scheduler.on_scrape_completed(ScraperId.X_APIDOJO, None, [_entity(5)])
+
+        self.assertAlmostEqual(
+            100 * (1 - ScrapeScheduler.YIELD_ALPHA),
+            scheduler.yield_bytes[(ScraperId.X_APIDOJO, "#a")],
+        )
+        self.assertEqual(5, scheduler.yield_bytes[(ScraperId.X_APIDOJO, None)])
+
+    def test_set_lookup(self):
+        """Tests that a new lookup changes which labels are chosen."""
+        scheduler = ScrapeScheduler(
+            _lookup({"#a": 1.0, "#b": 0.0, "#c": 0.0}), rng=random.Random(0)
+        )
+        self.assertGreater(self._count_choices(scheduler)["#a"], 1600)
+
+        scheduler.set_lookup(_lookup({"#a": 0.0, "#b": 0.0, "#c": 1.0}))
+
+        self.assertGreater(self._count_choices(scheduler)["#c"], 1600)
+
+    def test_choose_date_range_within_max_age(self):
+        """Tests that chosen hours are within both the hint and the lookup's max age, favoring recent hours."""
+        scheduler = ScrapeScheduler(_lookup({}, max_age_in_hours=10), rng=random.Random(0))
+        now = dt.datetime(2024, 1, 1, 12, 30, tzinfo=dt.timezone.utc)
+        current_bucket_id = time_buckets.id_from_datetime(now)
+
+        ages = Counter(
+            current_bucket_id
+            - time_buckets.id_from_datetime(
+                scheduler.choose_date_range(60 * 24, now).start
+            )
+            for _ in range(2000)
+        )
+
+        self.assertEqual(set(range(11)), set(ages))
+        self.assertGreater(ages[0], ages[10])
+
+        date_range = scheduler.choose_date_range(30, now)
+        self.assertEqual(time_buckets.to_date_range(current_bucket_id), date_range)
+
+    def test_choose_date_range_by_coverage(self):
+        """Tests that hours whose bucket is already full for the label aren't chosen, unless all of them are."""
+        now = dt.datetime(2024, 1, 1, 12, 30, tzinfo=dt.timezone.utc)
+        current_bucket_id = time_buckets.id_from_datetime(now)
+        coverage_planner = Mock(spec=CoveragePlanner)
+        coverage_planner.get_unfilled_fractions.side_effect = (
+            lambda source, label, bucket_ids: [
+                1.0 if bucket_id == current_bucket_id - 3 else 0.0
+                for bucket_id in bucket_ids
+            ]
+        )
+        scheduler = ScrapeScheduler(
+            _lookup({}), rng=random.Random(0), coverage_planner=coverage_planner
+        )
+
+        for _ in range(100):
+            date_range = scheduler.choose_date_range(
+                60 * 5, now, ScraperId.X_APIDOJO, [self.labels[0]]
+            )
+            self.assertEqual(
+                time_buckets.to_date_range(current_bucket_id - 3), date_range
+            )
+        coverage_planner.get_unfilled_fractions.assert_called_with(
+            DataSource.X, "#a", list(range(current_bucket_id - 5, current_bucket_id + 1))
+        )
+
+        # Once every bucket is full, hours are chosen by age alone.
+        coverage_planner.get_unfilled_fractions.side_effect = (
+            lambda source, label, bucket_ids: [0.0] * len(bucket_ids)
+        )
+        chosen = {
+            scheduler.choose_date_range(60 * 5, now, ScraperId.X_APIDOJO, [self.labels[0]])
+            for _ in range(200)
+        }
+        self.assertEqual(6, len(chosen))
+
+        # Coverage isn't considered when scraping "all".
+        coverage_planner.reset_mock()
+        scheduler.choose_date_range(60 * 5, now, ScraperId.X_APIDOJO, None)
+        coverage_planner.get_unfilled_fractions.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
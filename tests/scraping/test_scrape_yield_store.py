@@ -0,0 +1,119 @@
+import datetime as dt
+import os
+import shutil
+import tempfile
+import unittest
+
+from scraping.scrape_yield_store import ScrapeYield, ScrapeYieldStore
+
+
+def _make_yield(
+    scraped_at: dt.datetime,
+    scraper_id: str = "Reddit.custom",
+    label: str = "r/bittensor_",
+    outcome: str = "success",
+    entity_count: int = 10,
+    new_entity_count: int = 5,
+) -> ScrapeYield:
+    return ScrapeYield(
+        scraped_at=scraped_at,
+        scraper_id=scraper_id,
+        label=label,
+        outcome=outcome,
+        entity_count=entity_count,
+        new_entity_count=new_entity_count,
+        content_size_bytes=entity_count * 100,
+        new_content_size_bytes=new_entity_count * 100,
+        latency_seconds=2.0,
+    )
+
+
+class TestScrapeYieldStore(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.store = ScrapeYieldStore(os.path.join(self.temp_dir, "yields.sqlite"))
+        self.now = dt.datetime.now(tz=dt.timezone.utc)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_get_yield_by_scraper_and_label(self):
+        self.store.record(_make_yield(self.now))
+        self.store.record(_make_yield(self.now, new_entity_count=0))
+        self.store.record(
+            _make_yield(self.now, outcome="error", entity_count=0, new_entity_count=0)
+        )
+        self.store.record(_make_yield(self.now, scraper_id="X.apidojo", label=None))
+        # Too old to be included.
+        self.store.record(_make_yield(self.now - dt.timedelta(days=2)))
+
+        yields = self.store.get_yield_by_scraper_and_label(
+            self.now - dt.timedelta(days=1)
+        )
+
+        self.assertEqual(
+            {("Reddit.custom", "r/bittensor_"), ("X.apidojo", None)}, set(yields)
+        )
+        summary = yields[("Reddit.custom", "r/bittensor_")]
+        self.assertEqual(3, summary.scrape_count)
+        self.assertEqual(1, summary.unproductive_scrape_count)
+        self.assertEqual(20, summary.entity_count)
+        self.assertEqual(5, summary.new_entity_count)
+        self.assertAlmostEqual(0.75, summary.duplicate_rate)
+        self.assertAlmostEqual(500 / 3, summary.new_bytes_per_scrape)
+        self.assertAlmostEqual(2.0, summary.mean_latency_seconds)
+
+    def test_get_yield_by_hour(self):
+        hour = self.now.replace(minute=0, second=0, microsecond=0)
+        self.store.record(_make_yield(hour + dt.timedelta(minutes=5)))
+        self.store.record(_make_yield(hour + dt.timedelta(minutes=55)))
+        self.store.record(_make_yield(hour - dt.timedelta(minutes=5)))
+        self.store.record(
+            _make_yield(hour - dt.timedelta(minutes=5), scraper_id="X.apidojo")
+        )
+
+        yields = self.store.get_yield_by_hour(
+            hour - dt.timedelta(hours=1), scraper_id="Reddit.custom"
+        )
+
+        self.assertEqual(
+            {hour - dt.timedelta(hours=1): 1, hour: 2},
+            {hour: summary.scrape_count for hour, summary in yields.items()},
+        )
+
+    def test_flush_if_due(self):
+        """Tests that records are only written once the flush interval passes."""
+        self.store.record(_make_yield(self.now))
+
+        self.store.flush_if_due()
+        self.assertEqual(1, len(self.store.buffer))
+
+        self.store.last_flushed -= ScrapeYieldStore.FLUSH_INTERVAL
+        self.store.flush_if_due()
+        self.assertEqual([], self.store.buffer)
+
+    def test_flush_deletes_old_records(self):
+        self.store.record(_make_yield(self.now - ScrapeYieldStore.RETENTION * 2))
+        self.store.flush()
+
+        self.store.record(_make_yield(self.now))
+        yields = self.store.get_yield_by_scraper_and_label(
+            dt.datetime(2000, 1, 1, tzinfo=dt.timezone.utc)
+        )
+
+        self.assertEqual(1, yields[("Reddit.custom", "r/bittensor_")].scrape_count)
+
+    def test_records_persisted(self):
+        self.store.record(_make_yield(self.now))
+        self.store.flush()
+
+        store = ScrapeYieldStore(self.store.database)
+
+        self.assertEqual(
+            1,
+            len(store.get_yield_by_scraper_and_label(self.now - dt.timedelta(hours=1))),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
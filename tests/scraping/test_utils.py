@@ -1,3 +1,5 @@
+import asyncio
+import threading
 import unittest
 import datetime as dt
 
@@ -32,3 +34,32 @@ class TestUtils(unittest.TestCase):
                 tzinfo=dt.timezone.utc,
             ),
         )
+
+    def test_loop_local_semaphore(self):
+        """Tests that the semaphore limits concurrency on each event loop, and can be used from several loops."""
+        semaphore = utils.LoopLocalSemaphore(2)
+        max_running = []
+
+        async def run():
+            running = 0
+            most_running = 0
+
+            async def task():
+                nonlocal running, most_running
+                async with semaphore.get():
+                    running += 1
+                    most_running = max(most_running, running)
+                    await asyncio.sleep(0.01)
+                    running -= 1
+
+            # More tasks than permits, on a single loop, must not deadlock.
+            await asyncio.wait_for(asyncio.gather(*[task() for _ in range(25)]), 5)
+            max_running.append(most_running)
+
+        threads = [threading.Thread(target=asyncio.run, args=(run(),)) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual([2, 2], max_running)
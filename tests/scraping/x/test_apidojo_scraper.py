@@ -0,0 +1,121 @@
+import asyncio
+import datetime as dt
+import unittest
+from unittest.mock import AsyncMock, Mock, patch
+
+from common.data import DataEntity, DataSource
+from scraping.apify import ActorRunner
+from scraping.scraper import ValidationResult
+from scraping.x.apidojo_scraper import ApiDojoTwitterScraper
+
+
+def _make_entity(uri: str) -> DataEntity:
+    return DataEntity(
+        uri=uri,
+        datetime=dt.datetime.now(tz=dt.timezone.utc),
+        source=DataSource.X,
+        content=b"content",
+        content_size_bytes=7,
+    )
+
+
+class TestApiDojoTwitterScraper(unittest.TestCase):
+    def setUp(self):
+        self.found_uris = [
+            "https://x.com/user/status/1",
+            "https://x.com/user/status/2",
+        ]
+        self.missing_uri = "https://x.com/user/status/3"
+
+        async def run(run_config, run_input):
+            # Every tweet but the missing one is found, wherever it's fetched from.
+            return [
+                {"url": url}
+                for url in run_input["startUrls"]
+                if url != self.missing_uri
+            ]
+
+        self.runner = Mock(spec=ActorRunner)
+        self.runner.run = AsyncMock(side_effect=run)
+
+    def _validate(self, scraper, entities):
+        # Parse each item into a stand-in tweet, and accept any tweet that's found.
+        scraper._best_effort_parse_dataset = lambda dataset: (
+            [Mock(url=item["url"]) for item in dataset],
+            [False] * len(dataset),
+        )
+        with patch(
+            "scraping.x.apidojo_scraper.utils.validate_tweet_content",
+            side_effect=lambda actual_tweet, entity, is_retweet: ValidationResult(
+                is_valid=True, reason="", content_size_bytes_validated=7
+            ),
+        ):
+            return asyncio.run(scraper.validate(entities))
+
+    def _expected_results(self):
+        return [
+            ValidationResult(is_valid=True, reason="", content_size_bytes_validated=7),
+            ValidationResult(is_valid=True, reason="", content_size_bytes_validated=7),
+            ValidationResult(
+                is_valid=False,
+                reason="Tweet not found or is invalid.",
+                content_size_bytes_validated=7,
+            ),
+            ValidationResult(
+                is_valid=False, reason="Invalid URI.", content_size_bytes_validated=7
+            ),
+        ]
+
+    def _entities(self):
+        return [
+            _make_entity(uri)
+            for uri in self.found_uris + [self.missing_uri, "https://example.com/1"]
+        ]
+
+    def test_validate_in_batch(self):
+        """Tests that tweets are fetched in one run, and only those not found are fetched one by one."""
+        scraper = ApiDojoTwitterScraper(self.runner)
+        results = self._validate(scraper, self._entities())
+
+        self.assertEqual(self._expected_results(), results)
+        start_urls = [
+            call.args[1]["startUrls"] for call in self.runner.run.call_args_list
+        ]
+        # One batch, then two attempts for the missing tweet.
+        self.assertEqual(
+            [self.found_uris + [self.missing_uri], [self.missing_uri], [self.missing_uri]],
+            start_urls,
+        )
+        # The batch leaves room for more than one item per URL.
+        self.assertEqual(6, self.runner.run.call_args_list[0].args[1]["maxItems"])
+        self.assertEqual(
+            (2, 1), (scraper.batch_validated_count, scraper.fallback_validated_count)
+        )
+
+    def test_validate_without_batch(self):
+        """Tests that results are the same when validating one entity at a time."""
+        results = self._validate(
+            ApiDojoTwitterScraper(self.runner, batch_validate=False), self._entities()
+        )
+
+        self.assertEqual(self._expected_results(), results)
+        self.assertEqual(4, self.runner.run.call_count)
+
+    def test_validate_failed_batch(self):
+        """Tests that entities are validated one by one if the batch run fails."""
+        run = self.runner.run.side_effect
+
+        async def run_or_fail_batch(run_config, run_input):
+            if len(run_input["startUrls"]) > 1:
+                raise Exception("Actor failed")
+            return await run(run_config, run_input)
+
+        self.runner.run.side_effect = run_or_fail_batch
+
+        results = self._validate(ApiDojoTwitterScraper(self.runner), self._entities())
+
+        self.assertEqual(self._expected_results(), results)
+
+
+if __name__ == "__main__":
+    unittest.main()
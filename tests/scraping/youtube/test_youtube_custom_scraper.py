@@ -0,0 +1,57 @@
+import asyncio
+import threading
+import unittest
+from unittest.mock import Mock, patch
+
+from scraping.youtube.youtube_custom_scraper import YouTubeTranscriptScraper
+
+
+class TestYouTubeTranscriptScraper(unittest.TestCase):
+    def setUp(self):
+        with patch("scraping.youtube.youtube_custom_scraper.build"):
+            self.scraper = YouTubeTranscriptScraper()
+        self.scraper.api_key = "key"
+
+    def test_api_requests_run_off_the_event_loop(self):
+        """Tests that YouTube API requests, and waiting for the client, don't block the event loop."""
+        execute_threads = []
+        request = Mock()
+        request.execute.side_effect = lambda: (
+            execute_threads.append(threading.current_thread()) or {"items": []}
+        )
+        self.scraper.youtube.videos.return_value.list.return_value = request
+
+        async def run():
+            # The client is busy on another thread, so the request must wait for it without blocking the loop.
+            self.scraper.youtube_lock.acquire()
+            metadata_task = asyncio.create_task(
+                self.scraper._get_video_metadata_from_api("video")
+            )
+            await asyncio.sleep(0.05)
+            self.assertFalse(metadata_task.done())
+            self.scraper.youtube_lock.release()
+            await metadata_task
+
+        asyncio.run(run())
+
+        self.assertEqual(1, len(execute_threads))
+        self.assertIsNot(threading.main_thread(), execute_threads[0])
+
+    def test_transcripts_fetched_off_the_event_loop(self):
+        fetch_threads = []
+        transcript_api = Mock()
+        transcript_api.fetch.side_effect = lambda video_id: (
+            fetch_threads.append(threading.current_thread())
+            or Mock(to_raw_data=Mock(return_value=[{"text": "hi"}]))
+        )
+        self.scraper._get_transcript_api = Mock(return_value=transcript_api)
+
+        transcript = asyncio.run(self.scraper._get_transcript("video"))
+
+        self.assertEqual([{"text": "hi"}], transcript)
+        self.assertEqual(1, len(fetch_threads))
+        self.assertIsNot(threading.main_thread(), fetch_threads[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import asyncio
+import datetime as dt
+import threading
+import unittest
+from typing import List
+
+from common.data import DataEntity, DataSource
+from storage.miner.ingestion_queue import IngestionQueue
+
+
+class _RecordingStorage:
+    """A MinerStorage that records each call to store_data_entities, optionally waiting until released."""
+
+    def __init__(self, max_entities_per_write: int = None):
+        self.writes: List[List[str]] = []
+        self.max_entities_per_write = max_entities_per_write
+        self.released = threading.Event()
+        self.released.set()
+
+    def store_data_entities(self, data_entities: List[DataEntity]):
+        self.released.wait()
+        if self.max_entities_per_write and len(data_entities) > self.max_entities_per_write:
+            raise ValueError("Too many entities.")
+        self.writes.append([entity.uri for entity in data_entities])
+
+
+def _create_entities(*uris: str) -> List[DataEntity]:
+    return [
+        DataEntity(
+            uri=uri,
+            datetime=dt.datetime(2024, 5, 1, tzinfo=dt.timezone.utc),
+            source=DataSource.REDDIT,
+            content=b"content",
+            content_size_bytes=7,
+        )
+        for uri in uris
+    ]
+
+
+class TestIngestionQueue(unittest.TestCase):
+    def test_batches_are_coalesced(self):
+        """Tests that pending batches are written together, up to the write limit."""
+        storage = _RecordingStorage()
+        queue = IngestionQueue(storage, max_write_entities=3)
+
+        async def put_all():
+            await queue.put(_create_entities("1", "2"))
+            await queue.put(_create_entities("3"))
+            await queue.put([])
+            await queue.put(_create_entities("4", "5"))
+
+        asyncio.run(put_all())
+        queue.start()
+        queue.stop(timeout=5)
+
+        self.assertEqual(storage.writes, [["1", "2", "3"], ["4", "5"]])
+        self.assertEqual(queue.pending_entities, 0)
+
+    def test_failed_combined_write_is_retried_per_batch(self):
+        """Tests that batches are stored separately if storing them together fails."""
+        storage = _RecordingStorage(max_entities_per_write=2)
+        queue = IngestionQueue(storage)
+
+        async def put_all():
+            await queue.put(_create_entities("1", "2"))
+            await queue.put(_create_entities("3"))
+            await queue.put(_create_entities("4", "5", "6"))
+
+        asyncio.run(put_all())
+        queue.start()
+        queue.stop(timeout=5)
+
+        # The oversized batch still fails on its own, without affecting the others.
+        self.assertEqual(storage.writes, [["1", "2"], ["3"]])
+        self.assertEqual(queue.pending_entities, 0)
+
+    def test_put_waits_while_full(self):
+        """Tests that put waits for the writer once the queue is full, without blocking the event loop."""
+        storage = _RecordingStorage()
+        storage.released.clear()
+        queue = IngestionQueue(storage, max_pending_entities=2)
+        queue.start()
+
+        async def run():
+            await queue.put(_create_entities("1", "2"))
+            # Wait for the writer to take the first batch. It's still pending until written.
+            await asyncio.sleep(0.1)
+            put = asyncio.create_task(queue.put(_create_entities("3")))
+            await asyncio.sleep(0.1)
+            # The event loop is still running, but the put is waiting for space.
+            self.assertFalse(put.done())
+
+            storage.released.set()
+            await asyncio.wait_for(put, timeout=5)
+
+        asyncio.run(run())
+        queue.stop(timeout=5)
+
+        self.assertEqual(storage.writes, [["1", "2"], ["3"]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,7 @@
 import contextlib
 import time
 import unittest
+from unittest.mock import patch
 import os
 
 from common import constants
@@ -20,6 +21,7 @@ import pytz
 from tests import utils
 
 from storage.miner.sqlite_miner_storage import SqliteMinerStorage
+from storage.miner.uri_filter import UriFilter
 
 
 class TestSqliteMinerStorage(unittest.TestCase):
@@ -32,6 +34,8 @@ class TestSqliteMinerStorage(unittest.TestCase):
     def tearDown(self):
         # Clean up the test database.
         os.remove(self.test_storage.database)
+        if os.path.exists(self.test_storage.uri_filter_path):
+            os.remove(self.test_storage.uri_filter_path)
 
     def test_instantiate_sqlite_miner_storage(self):
         # Just ensure the setUp/tearDown methods work.
@@ -167,6 +171,119 @@ class TestSqliteMinerStorage(unittest.TestCase):
 
             self.assertEqual(uris, ["test_entity_2", "test_entity_3"])
 
+        # Confirm the URI filter tracks the eviction.
+        self.assertEqual(
+            [False, True, True],
+            self.test_storage.uri_filter.contains(
+                ["test_entity_1", "test_entity_2", "test_entity_3"]
+            ),
+        )
+
+    def test_list_unstored_data_entities(self):
+        """Tests that only entities whose URIs aren't stored are returned, including on URI filter false positives."""
+        now = dt.datetime.now()
+        entities = [
+            DataEntity(
+                uri=f"test_entity_{i}",
+                datetime=now,
+                source=DataSource.REDDIT,
+                content=bytes(10),
+                content_size_bytes=10,
+            )
+            for i in range(4)
+        ]
+        self.test_storage.store_data_entities(entities[:2])
+        # Simulate a false positive, by adding a URI to the filter that isn't stored.
+        self.test_storage.uri_filter.add(["test_entity_3"])
+
+        self.assertEqual(
+            [entities[2], entities[3]],
+            self.test_storage.list_unstored_data_entities(entities),
+        )
+        self.assertEqual([], self.test_storage.list_unstored_data_entities([]))
+
+    def test_uri_filter_persisted(self):
+        """Tests that the URI filter is reloaded with the database, but not once the database is emptied."""
+        entity = DataEntity(
+            uri="test_entity_1",
+            datetime=dt.datetime.now(),
+            source=DataSource.REDDIT,
+            content=bytes(10),
+            content_size_bytes=10,
+        )
+        self.test_storage.store_data_entities([entity])
+        self.test_storage._save_uri_filter()
+
+        reloaded_storage = SqliteMinerStorage(
+            self.test_storage.database, max_database_size_gb_hint=1
+        )
+        self.assertEqual([True], reloaded_storage.uri_filter.contains(["test_entity_1"]))
+
+        with contextlib.closing(self.test_storage._create_connection()) as connection:
+            connection.execute("DELETE FROM DataEntity")
+            connection.commit()
+        emptied_storage = SqliteMinerStorage(
+            self.test_storage.database, max_database_size_gb_hint=1
+        )
+        self.assertEqual([False], emptied_storage.uri_filter.contains(["test_entity_1"]))
+
+    def test_uri_filter_built_from_database(self):
+        """Tests that the URI filter is rebuilt from the table when there's no saved filter."""
+        entities = [
+            DataEntity(
+                uri=f"test_entity_{i}",
+                datetime=dt.datetime.now(),
+                source=DataSource.REDDIT,
+                content=bytes(10),
+                content_size_bytes=10,
+            )
+            for i in range(3)
+        ]
+        self.test_storage.store_data_entities(entities)
+
+        rebuilt_storage = SqliteMinerStorage(
+            self.test_storage.database, max_database_size_gb_hint=1
+        )
+        rebuilt_storage.uri_filter_builder.join()
+
+        self.assertEqual(
+            [True] * 3,
+            rebuilt_storage.uri_filter.contains([entity.uri for entity in entities]),
+        )
+        self.assertEqual(
+            SqliteMinerStorage.URI_FILTER_MIN_CAPACITY,
+            UriFilter.max_capacity(len(rebuilt_storage.uri_filter.table)),
+        )
+
+    def test_uri_filter_grows(self):
+        """Tests that the URI filter is rebuilt larger once it fills up."""
+        entities = [
+            DataEntity(
+                uri=f"test_entity_{i}",
+                datetime=dt.datetime.now(),
+                source=DataSource.REDDIT,
+                content=bytes(10),
+                content_size_bytes=10,
+            )
+            for i in range(8)
+        ]
+        with patch.object(
+            SqliteMinerStorage, "URI_FILTER_MIN_CAPACITY", UriFilter.max_capacity(1)
+        ):
+            storage = SqliteMinerStorage(
+                self.test_storage.database, max_database_size_gb_hint=1
+            )
+            storage.store_data_entities(entities[:4])
+            storage.uri_filter_builder.join()
+            storage.store_data_entities(entities[4:])
+
+        # Sized for twice the 4 URIs stored when it was rebuilt.
+        self.assertEqual(UriFilter.bucket_count(8), len(storage.uri_filter.table))
+        self.assertEqual(
+            [True] * 8,
+            storage.uri_filter.contains([entity.uri for entity in entities]),
+        )
+
     def test_get_compressed_index(self):
         """Tests that we can get the compressed miner index from storage."""
         now = dt.datetime.now()
@@ -292,6 +409,47 @@ class TestSqliteMinerStorage(unittest.TestCase):
         # Confirm we get back the expected summary.
         self.assertTrue(utils.are_compressed_indexes_equal(index, expected_index))
 
+    def test_get_compressed_index_with_hash(self):
+        """Tests that the index hash is stable across refreshes and changes with the index."""
+        now = dt.datetime.now()
+        self.test_storage.store_data_entities(
+            [
+                DataEntity(
+                    uri="test_entity_1",
+                    datetime=now,
+                    source=DataSource.REDDIT,
+                    content=bytes(10),
+                    content_size_bytes=10,
+                )
+            ]
+        )
+        index, index_hash = self.test_storage.get_compressed_index_with_hash()
+        self.assertEqual(CompressedMinerIndex.size_bytes(index), 10)
+        self.assertIsNotNone(index_hash)
+
+        # Refreshing without any new data keeps the same hash.
+        self.test_storage.refresh_compressed_index(dt.timedelta())
+        self.assertEqual(
+            self.test_storage.get_compressed_index_with_hash()[1], index_hash
+        )
+
+        # New data changes the hash.
+        self.test_storage.store_data_entities(
+            [
+                DataEntity(
+                    uri="test_entity_2",
+                    datetime=now,
+                    source=DataSource.REDDIT,
+                    content=bytes(20),
+                    content_size_bytes=20,
+                )
+            ]
+        )
+        self.test_storage.refresh_compressed_index(dt.timedelta())
+        index, new_index_hash = self.test_storage.get_compressed_index_with_hash()
+        self.assertEqual(CompressedMinerIndex.size_bytes(index), 30)
+        self.assertNotEqual(new_index_hash, index_hash)
+
     def test_get_compressed_index_multiple_bucket_per_label(self):
         """Tests that we can get the compressed miner index when there are multiple buckets for a single label."""
 
@@ -478,6 +636,47 @@ class TestSqliteMinerStorage(unittest.TestCase):
         # Confirm we get back the expected data entities.
         self.assertEqual(data_entities, [bucket2_entity1, bucket2_entity2])
 
+    def test_list_entities_in_data_entity_bucket_matches_validated_entities(self):
+        """Tests that entities read back without validation equal freshly validated entities."""
+        datetime = dt.datetime(2023, 12, 12, 1, 30, 0, 1000, tzinfo=dt.timezone.utc)
+        labels = [
+            DataLabel(value="#YouTube_c_MixedCaseChannel"),
+            DataLabel(value="UPPER_label"),
+            None,
+        ]
+        entities = [
+            DataEntity(
+                uri=f"test_entity_{i}",
+                datetime=datetime,
+                source=DataSource.YOUTUBE,
+                label=label,
+                content=bytes([i] * 10),
+                content_size_bytes=10,
+            )
+            for i, label in enumerate(labels)
+        ]
+        self.test_storage.store_data_entities(entities)
+
+        for entity in entities:
+            data_entities = self.test_storage.list_data_entities_in_data_entity_bucket(
+                DataEntityBucketId(
+                    time_bucket=TimeBucket.from_datetime(datetime),
+                    source=DataSource.YOUTUBE,
+                    label=entity.label,
+                )
+            )
+
+            self.assertEqual(len(data_entities), 1)
+            read_entity = data_entities[0]
+            self.assertIsInstance(read_entity.source, DataSource)
+            validated_entity = DataEntity.model_validate(read_entity.model_dump())
+            self.assertEqual(read_entity, entity)
+            self.assertEqual(read_entity, validated_entity)
+            self.assertEqual(hash(read_entity), hash(validated_entity))
+            self.assertEqual(
+                read_entity.model_dump_json(), validated_entity.model_dump_json()
+            )
+
     def test_list_entities_in_data_entity_bucket_over_max_size(self):
         """Tests that we can get enough entities in an over max size data entity bucket"""
         # Create two entities for the bucket.
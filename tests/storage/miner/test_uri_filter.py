@@ -0,0 +1,93 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from storage.miner.uri_filter import UriFilter
+
+
+class TestUriFilter(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_contains_added_uris(self):
+        uri_filter = UriFilter(capacity=10_000)
+        added = [f"https://x.com/status/{i}" for i in range(10_000)]
+        not_added = [f"https://reddit.com/r/{i}" for i in range(10_000)]
+
+        uri_filter.add(added)
+
+        # No false negatives.
+        self.assertTrue(all(uri_filter.contains(added)))
+        # False positives are rare, even when full.
+        self.assertLess(sum(uri_filter.contains(not_added)), 0.05 * len(not_added))
+        # URIs sharing a fingerprint and bucket with an earlier URI aren't stored separately.
+        self.assertGreater(uri_filter.count, 0.95 * len(added))
+
+    def test_add_duplicate(self):
+        uri_filter = UriFilter(capacity=100)
+
+        uri_filter.add(["a", "a"])
+        uri_filter.add(["a"])
+
+        self.assertEqual(1, uri_filter.count)
+
+    def test_remove(self):
+        uri_filter = UriFilter(capacity=100)
+        uri_filter.add(["a", "b"])
+
+        uri_filter.remove(["a", "c"])
+
+        self.assertEqual([False, True], uri_filter.contains(["a", "b"]))
+        self.assertEqual(1, uri_filter.count)
+
+    def test_add_beyond_capacity(self):
+        """Tests that adding to a full filter drops some fingerprints rather than failing."""
+        uri_filter = UriFilter(capacity=64)
+
+        uri_filter.add([str(i) for i in range(1000)])
+
+        self.assertLessEqual(uri_filter.count, uri_filter.capacity)
+
+    def test_size_bounded_by_max_capacity(self):
+        """Tests that a filter created with max_capacity has exactly the given bucket count, despite rounding up."""
+        for bucket_count in [1, 2, 1024, 2**25]:
+            self.assertEqual(
+                bucket_count, UriFilter.bucket_count(UriFilter.max_capacity(bucket_count))
+            )
+
+        uri_filter = UriFilter(capacity=UriFilter.max_capacity(1024))
+        self.assertEqual(1024 * UriFilter.BUCKET_SIZE, uri_filter.size_bytes)
+
+    def test_empty_inputs(self):
+        uri_filter = UriFilter(capacity=100)
+        uri_filter.add([])
+        uri_filter.remove([])
+        self.assertEqual([], uri_filter.contains([]))
+
+    def test_save_and_load(self):
+        path = os.path.join(self.temp_dir, "filter.npz")
+        uri_filter = UriFilter(capacity=1000)
+        uri_filter.add(["a", "b"])
+
+        uri_filter.save(path)
+        loaded = UriFilter.load(path)
+
+        self.assertEqual([True, True], loaded.contains(["a", "b"]))
+        self.assertEqual(2, loaded.count)
+        self.assertEqual(uri_filter.capacity, loaded.capacity)
+
+    def test_load_missing_or_corrupt(self):
+        path = os.path.join(self.temp_dir, "filter.npz")
+        self.assertIsNone(UriFilter.load(path))
+
+        with open(path, "wb") as f:
+            f.write(b"not a filter")
+        self.assertIsNone(UriFilter.load(path))
+
+
+if __name__ == "__main__":
+    unittest.main()
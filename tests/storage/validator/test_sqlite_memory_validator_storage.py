@@ -19,7 +19,11 @@ from common.data import (
     TimeBucket,
 )
 import datetime as dt
-from common.data_v2 import ScorableDataEntityBucket, ScorableMinerIndex
+from common.data_v2 import (
+    ColumnarScorableMinerIndex,
+    ScorableDataEntityBucket,
+    ScorableMinerIndex,
+)
 from storage.validator.sqlite_memory_validator_storage import (
     SqliteMemoryValidatorStorage,
 )
@@ -93,6 +97,7 @@ class TestSqliteMemoryValidatorStorage(unittest.TestCase):
 
         # Confirm we get back the expected index.
         index = self.test_storage.read_miner_index("hotkey1")
+        self.assertIsInstance(index, ColumnarScorableMinerIndex)
 
         expected_scorable_index = ScorableMinerIndex(
             scorable_data_entity_buckets=[
@@ -434,6 +439,77 @@ class TestSqliteMemoryValidatorStorage(unittest.TestCase):
         # Confirm the last updated is None.
         self.assertEqual(None, last_updated)
 
+    def test_read_miner_index_hash(self):
+        """Tests that the hash of a stored index is returned, and replaced along with the index."""
+        index = CompressedMinerIndex(
+            sources={
+                DataSource.REDDIT.value: [
+                    CompressedEntityBucket(
+                        label="r/bittensor_", time_bucket_ids=[5], sizes_bytes=[100]
+                    )
+                ]
+            }
+        )
+
+        # The in memory db is shared with other tests, so don't leave the miner behind.
+        self.addCleanup(self.test_storage.delete_miner, "hash_hotkey")
+        self.assertIsNone(self.test_storage.read_miner_index_hash("hash_hotkey"))
+
+        self.test_storage.upsert_compressed_miner_index(index, "hash_hotkey", 1.0, "hash1")
+        self.assertEqual("hash1", self.test_storage.read_miner_index_hash("hash_hotkey"))
+
+        # An index without a hash clears the old hash.
+        self.test_storage.upsert_compressed_miner_index(index, "hash_hotkey", 1.0)
+        self.assertIsNone(self.test_storage.read_miner_index_hash("hash_hotkey"))
+
+    def test_touch_miner_index(self):
+        """Tests that touching an index updates the miner without changing its index or hash."""
+        index = CompressedMinerIndex(
+            sources={
+                DataSource.REDDIT.value: [
+                    CompressedEntityBucket(
+                        label="r/bittensor_", time_bucket_ids=[5], sizes_bytes=[100]
+                    )
+                ]
+            }
+        )
+        # The in memory db is shared with other tests, so don't leave the miner behind.
+        self.addCleanup(self.test_storage.delete_miner, "touch_hotkey")
+        self.assertFalse(self.test_storage.touch_miner_index("touch_hotkey", 1.0))
+
+        self.test_storage.upsert_compressed_miner_index(index, "touch_hotkey", 0.5, "hash1")
+        last_updated = self.test_storage.read_miner_last_updated("touch_hotkey")
+
+        self.assertTrue(self.test_storage.touch_miner_index("touch_hotkey", 1.0))
+
+        self.assertGreater(
+            self.test_storage.read_miner_last_updated("touch_hotkey"), last_updated
+        )
+        self.assertEqual("hash1", self.test_storage.read_miner_index_hash("touch_hotkey"))
+        # Scorable bytes depend on the other miners in the shared db, so check the size instead.
+        self.assertEqual(
+            [100], self.test_storage.read_miner_index("touch_hotkey").size_bytes.tolist()
+        )
+
+    def test_read_miners_last_updated(self):
+        """Tests getting the last time each miner was updated."""
+        # Insert two miners
+        now = dt.datetime.utcnow()
+        earlier = now - dt.timedelta(hours=1)
+        self.test_storage._upsert_miner(
+            "test_hotkey", now.strftime("%Y-%m-%d %H:%M:%S.%f"), 1
+        )
+        self.test_storage._upsert_miner(
+            "test_hotkey2", earlier.strftime("%Y-%m-%d %H:%M:%S.%f"), 1
+        )
+
+        # Get the last updated
+        last_updated = self.test_storage.read_miners_last_updated()
+
+        # Confirm both miners are included. Other tests may have left miners in the shared in memory db.
+        self.assertEqual(now, last_updated["test_hotkey"])
+        self.assertEqual(earlier, last_updated["test_hotkey2"])
+
     @unittest.skip("Skip the multi threaded test by default.")
     def test_multithreaded_inserts(self):
         """In a multi-threaded environment, insert 5 indexes for 5 miners, then read them back and verify they're correct."""
@@ -0,0 +1,146 @@
+import asyncio
+import datetime as dt
+import os
+import shutil
+import tempfile
+import unittest
+from typing import List
+
+from common.data import DataEntity, DataEntityBucketId, DataLabel, DataSource, TimeBucket
+from common.data_v2 import ColumnarScorableMinerIndex
+from rewards.data_value_calculator import DataValueCalculator
+from rewards.miner_scorer import MinerScorer
+from scraping.provider import ScraperProvider
+from scraping.scraper import ScraperId, ValidationResult
+from vali_utils import evaluation_replay
+from vali_utils.evaluation_journal import (
+    EvaluationJournal,
+    EvaluationRecord,
+    JournaledEntity,
+)
+
+
+def _create_entity(uri: str) -> DataEntity:
+    return DataEntity(
+        uri=uri,
+        datetime=dt.datetime(2024, 5, 1, tzinfo=dt.timezone.utc),
+        source=DataSource.X,
+        label=DataLabel(value="#bittensor"),
+        # Not valid utf-8.
+        content=b"\xff\x00content",
+        content_size_bytes=9,
+    )
+
+
+def _create_index() -> ColumnarScorableMinerIndex:
+    return ColumnarScorableMinerIndex(
+        sources=[DataSource.X],
+        label_ids=[0],
+        labels=["#bittensor"],
+        time_bucket_ids=[TimeBucket.from_datetime(dt.datetime.now(dt.timezone.utc)).id],
+        size_bytes=[1000],
+        scorable_bytes=[1000],
+        last_updated=dt.datetime.now(dt.timezone.utc),
+    )
+
+
+class _InvalidatingScraper:
+    """A scraper that marks every entity as invalid."""
+
+    async def validate(self, entities: List[DataEntity]) -> List[ValidationResult]:
+        return [
+            ValidationResult(
+                is_valid=False, reason="Invalid.", content_size_bytes_validated=9
+            )
+            for _ in entities
+        ]
+
+
+class TestEvaluationJournal(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "journal.jsonl")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _evaluate(self, scorer: MinerScorer, uid: int, valid: bool) -> EvaluationRecord:
+        """Scores a miner the way MinerEvaluator does, and returns its record."""
+        record = EvaluationRecord(uid=uid, hotkey=f"hotkey{uid}")
+        entities = [_create_entity(f"https://x.com/{uid}/status/{i}") for i in range(2)]
+        results = [
+            ValidationResult(is_valid=valid, content_size_bytes_validated=9)
+            for _ in entities
+        ]
+        record.index_bucket_count = 1
+        record.chosen_bucket = DataEntityBucketId(
+            time_bucket=TimeBucket(id=1), source=DataSource.X
+        )
+        record.outcome = "validated"
+        record.validated_entities = [
+            JournaledEntity.from_entity(entity, result)
+            for entity, result in zip(entities, results)
+        ]
+        record.validation_results = results
+        record.scoring_state_before = scorer.get_miner_scoring_state(uid)
+        with record.timed("score"):
+            scorer.on_miner_evaluated(uid, _create_index(), results)
+        record.scoring_state_after = scorer.get_miner_scoring_state(uid)
+        return record
+
+    def test_append_and_read(self):
+        """Tests that records round trip through the journal, and the journal is rotated once full."""
+        scorer = MinerScorer(2, DataValueCalculator())
+        record = self._evaluate(scorer, 1, True)
+        journal = EvaluationJournal(self.path)
+        journal.append(record)
+        journal.append(EvaluationRecord(uid=0, hotkey="hotkey0", outcome="timeout"))
+
+        records = EvaluationJournal.read(self.path)
+        self.assertEqual(records[0], record)
+        self.assertEqual(
+            records[0].validated_entities[0].to_data_entity(),
+            _create_entity("https://x.com/1/status/0"),
+        )
+        self.assertIn("score", records[0].step_secs)
+        self.assertEqual(records[1].outcome, "timeout")
+
+        # Once full, the journal is moved to a backup and a new one is started.
+        journal.max_file_bytes = 1
+        journal.append(record)
+        self.assertEqual(len(EvaluationJournal.read(self.path)), 1)
+        self.assertEqual(len(EvaluationJournal.read(self.path + ".1")), 2)
+
+    def test_replay(self):
+        """Tests that replaying with the journaled results reproduces the scores, and other scrapers change them."""
+        scorer = MinerScorer(2, DataValueCalculator())
+        records = [self._evaluate(scorer, 1, True), self._evaluate(scorer, 0, True)]
+        # HF validation between evaluations isn't replayed, but its effect on the next score is.
+        scorer.update_hf_boost_and_cred(1, 80)
+        records += [
+            self._evaluate(scorer, 1, True),
+            EvaluationRecord(uid=0, hotkey="hotkey0", outcome="timeout"),
+        ]
+
+        replayed = asyncio.run(evaluation_replay.replay(records))
+        self.assertEqual(len(replayed), 3)
+        for evaluation in replayed:
+            self.assertFalse(evaluation.validation_changed)
+            self.assertAlmostEqual(evaluation.score_delta, 0, places=2)
+
+        replayed = asyncio.run(
+            evaluation_replay.replay(
+                records,
+                ScraperProvider(factories={ScraperId.X_APIDOJO: _InvalidatingScraper}),
+            )
+        )
+        self.assertTrue(all(evaluation.validation_changed for evaluation in replayed))
+        self.assertTrue(all(evaluation.score_delta < 0 for evaluation in replayed))
+
+        summary = evaluation_replay.summarize(records, replayed)
+        self.assertIn("validated: 3", summary)
+        self.assertIn("Validation results changed: 3", summary)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import datetime as dt
+import unittest
+
+from common import constants
+from vali_utils.evaluation_scheduler import EvaluationScheduler
+
+
+class TestEvaluationScheduler(unittest.TestCase):
+    def setUp(self):
+        self.now = dt.datetime(2024, 5, 1, 12, 0, 0)
+        self.period = constants.MIN_EVALUATION_PERIOD
+
+    def test_miners_not_due_are_not_scheduled(self):
+        """Verifies that miners evaluated within MIN_EVALUATION_PERIOD are not scheduled, and the wait is correct."""
+        scheduler = EvaluationScheduler([0, 1])
+        last_updated = {
+            0: self.now - self.period + dt.timedelta(minutes=10),
+            1: self.now - self.period + dt.timedelta(minutes=20),
+        }
+
+        due_uids, wait_secs = scheduler.get_due_uids(last_updated, [0, 0], self.now)
+
+        self.assertEqual(due_uids, [])
+        self.assertEqual(wait_secs, 10 * 60)
+
+    def test_evaluation_attempts_count_as_evaluations(self):
+        """Verifies that a miner isn't rescheduled after an evaluation, even if its index wasn't updated."""
+        scheduler = EvaluationScheduler([0])
+        scheduler.on_miner_evaluated(0, None, failed=True, now=self.now)
+
+        due_uids, wait_secs = scheduler.get_due_uids({0: None}, [0], self.now)
+
+        self.assertEqual(due_uids, [])
+        self.assertEqual(wait_secs, self.period.total_seconds())
+
+    def test_starved_miners_are_scheduled_first(self):
+        """Verifies that never evaluated and long overdue miners come before higher priority miners."""
+        scheduler = EvaluationScheduler([0, 1, 2, 3])
+        # Give miner 0 the highest possible priority.
+        scheduler.on_miner_evaluated(
+            0, 100, failed=False, now=self.now - 2 * self.period
+        )
+        scheduler.on_miner_evaluated(
+            0, 200, failed=True, now=self.now - self.period - dt.timedelta(minutes=1)
+        )
+        last_updated = {
+            0: None,
+            1: None,
+            2: self.now - 2 * self.period - dt.timedelta(minutes=5),
+            3: self.now - 2 * self.period - dt.timedelta(minutes=10),
+        }
+
+        due_uids, _ = scheduler.get_due_uids(last_updated, [1, 0, 0, 0], self.now)
+
+        self.assertEqual(due_uids, [1, 3, 2, 0])
+
+    def test_due_miners_are_ordered_by_priority(self):
+        """Verifies that each signal raises a due miner's priority."""
+        scheduler = EvaluationScheduler([0, 1, 2, 3, 4])
+        last_evaluated = self.now - self.period - dt.timedelta(minutes=1)
+        for uid in range(5):
+            scheduler.on_miner_evaluated(
+                uid, 100, failed=False, now=last_evaluated - self.period
+            )
+        # Miner 1's index grew, miner 2 failed validation and miner 4 has been due for longer.
+        scheduler.on_miner_evaluated(0, 100, failed=False, now=last_evaluated)
+        scheduler.on_miner_evaluated(1, 150, failed=False, now=last_evaluated)
+        scheduler.on_miner_evaluated(2, 100, failed=True, now=last_evaluated)
+        scheduler.on_miner_evaluated(3, 100, failed=False, now=last_evaluated)
+        scheduler.on_miner_evaluated(
+            4, 100, failed=False, now=last_evaluated - dt.timedelta(minutes=5)
+        )
+        # Miner 3 has the highest incentive.
+        incentives = [0, 0, 0, 0.2, 0]
+
+        due_uids, _ = scheduler.get_due_uids({}, incentives, self.now)
+
+        self.assertEqual(due_uids, [3, 1, 2, 4, 0])
+
+    def test_reset(self):
+        """Verifies that a reset miner is treated as never evaluated."""
+        scheduler = EvaluationScheduler([0])
+        scheduler.on_miner_evaluated(0, 100, failed=True, now=self.now)
+
+        scheduler.reset(0)
+
+        self.assertEqual(scheduler.get_due_uids({}, [0], self.now), ([0], 3600))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,261 @@
+import asyncio
+import datetime as dt
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import numpy as np
+
+from common import constants
+from common.data import CompressedEntityBucket, CompressedMinerIndex, DataSource
+from common.protocol import GetMinerIndex
+from rewards.data_value_calculator import DataValueCalculator
+from rewards.miner_scorer import MinerScorer
+from storage.validator.sqlite_memory_validator_storage import (
+    SqliteMemoryValidatorStorage,
+)
+from vali_utils.evaluation_journal import EvaluationJournal
+from vali_utils.evaluation_scheduler import EvaluationScheduler
+from vali_utils.miner_evaluator import MinerEvaluator
+from vali_utils.validation_cache import ValidationCache
+
+
+class _FakeDendritePool:
+    """A DendritePool that records the synapses it's asked to send and replies with a canned successful response."""
+
+    def __init__(self):
+        self.response = None
+        self.synapses = []
+
+    async def forward(self, axons, synapse, timeout=12, deserialize=True):
+        self.synapses.append(synapse)
+        response = self.response.model_copy(deep=True)
+        response.dendrite.status_code = 200
+        return [response]
+
+
+def _create_evaluator(uids, eval_miner=None) -> MinerEvaluator:
+    """Creates a MinerEvaluator without a wallet or metagraph syncer, using eval_miner to evaluate each miner."""
+    evaluator = MinerEvaluator.__new__(MinerEvaluator)
+    evaluator.metagraph = SimpleNamespace(
+        hotkeys=[f"hotkey{uid}" for uid in uids], I=np.zeros(len(uids))
+    )
+    evaluator.scheduler = EvaluationScheduler(uids)
+    evaluator.storage = SqliteMemoryValidatorStorage()
+    # The in memory db is shared, so clear out any miners other tests left with the same hotkeys.
+    for hotkey in evaluator.metagraph.hotkeys:
+        evaluator.storage.delete_miner(hotkey)
+    evaluator.should_exit = False
+    evaluator.lock = threading.RLock()
+    evaluator.worker_pool = ThreadPoolExecutor(max_workers=2)
+    evaluator.in_flight_evals = {}
+    evaluator.journal_lock = threading.Lock()
+    evaluator.scorer = MinerScorer(len(uids), DataValueCalculator())
+    evaluator.dendrite_pool = _FakeDendritePool()
+    evaluator.validation_cache = ValidationCache()
+    evaluator.journal = EvaluationJournal(
+        os.path.join(tempfile.mkdtemp(), MinerEvaluator.JOURNAL_FILENAME)
+    )
+    if eval_miner:
+        evaluator.eval_miner = eval_miner
+    return evaluator
+
+
+class TestMinerEvaluator(unittest.TestCase):
+    def setUp(self):
+        self.evaluator = None
+
+    def tearDown(self):
+        # The in memory db is shared, so make sure no miners leak into other tests.
+        if self.evaluator:
+            for hotkey in self.evaluator.metagraph.hotkeys:
+                self.evaluator.storage.delete_miner(hotkey)
+            self.evaluator.worker_pool.shutdown()
+            shutil.rmtree(os.path.dirname(self.evaluator.journal.path))
+
+    def test_run_next_eval_batch_rolling_window(self):
+        """Verifies that a slow miner doesn't stop other miners from being evaluated in the meantime."""
+        evaluated = []
+
+        async def eval_miner(uid: int, record=None):
+            await asyncio.sleep(1 if uid == 0 else 0.01)
+            evaluated.append(uid)
+
+        # None of the miners have been evaluated, so the slow miner is started first.
+        evaluator = self.evaluator = _create_evaluator(list(range(10)), eval_miner)
+
+        with patch.object(MinerEvaluator, "MAX_CONCURRENT_EVALS", 2):
+            start = time.time()
+            wait_secs = asyncio.run(evaluator.run_next_eval_batch())
+            duration = time.time() - start
+
+        self.assertEqual(wait_secs, 0)
+        # Every miner is evaluated exactly once, with the slow miner finishing last.
+        self.assertEqual(evaluated, list(range(1, 10)) + [0])
+        # The fast miners were evaluated while the slow miner was in flight.
+        self.assertLess(duration, 1.5)
+
+    def test_run_next_eval_batch_not_due(self):
+        """Verifies that miners evaluated within MIN_EVALUATION_PERIOD are not evaluated again."""
+        evaluated = []
+
+        async def eval_miner(uid: int, record=None):
+            evaluated.append(uid)
+
+        evaluator = self.evaluator = _create_evaluator([0, 1], eval_miner)
+        index = CompressedMinerIndex(
+            sources={
+                DataSource.REDDIT.value: [
+                    CompressedEntityBucket(
+                        label="r/bittensor_", time_bucket_ids=[5], sizes_bytes=[100]
+                    )
+                ]
+            }
+        )
+        for hotkey in evaluator.metagraph.hotkeys:
+            evaluator.storage.upsert_compressed_miner_index(index, hotkey, 1.0)
+
+        wait_secs = asyncio.run(evaluator.run_next_eval_batch())
+
+        self.assertEqual(evaluated, [])
+        self.assertGreater(wait_secs, 0)
+        self.assertLessEqual(
+            wait_secs, constants.MIN_EVALUATION_PERIOD.total_seconds()
+        )
+
+    def test_run_next_eval_batch_handles_failures(self):
+        """Verifies that failing or hanging evaluations don't fail the batch."""
+        evaluated = []
+
+        async def eval_miner(uid: int, record=None):
+            if uid == 0:
+                raise RuntimeError("Evaluation failed.")
+            if uid == 1:
+                # Never finishes.
+                await asyncio.Event().wait()
+            evaluated.append(uid)
+
+        evaluator = self.evaluator = _create_evaluator([0, 1, 2], eval_miner)
+
+        # Long enough that the evaluation that does finish never times out, even on a loaded machine.
+        with patch.object(MinerEvaluator, "EVAL_TIMEOUT", dt.timedelta(seconds=1)):
+            wait_secs = asyncio.run(evaluator.run_next_eval_batch())
+
+        self.assertEqual(wait_secs, 0)
+        self.assertEqual(evaluated, [2])
+        # The failed evaluations are journaled.
+        records = EvaluationJournal.read(evaluator.journal.path)
+        self.assertEqual(
+            sorted((record.uid, record.outcome) for record in records),
+            [(0, "error"), (1, "timeout")],
+        )
+
+    def test_run_next_eval_batch_carries_over_slow_evaluations(self):
+        """Verifies that the batch doesn't wait on slow evaluations past the drain timeout, and they carry over."""
+        evaluated = []
+        release = None
+
+        async def eval_miner(uid: int, record=None):
+            if uid == 0:
+                await release.wait()
+            evaluated.append(uid)
+
+        evaluator = self.evaluator = _create_evaluator([0, 1], eval_miner)
+
+        async def run_batches():
+            nonlocal release
+            release = asyncio.Event()
+            first_wait_secs = await evaluator.run_next_eval_batch()
+            carried_uids = list(evaluator.in_flight_evals.values())
+            release.set()
+            await evaluator.run_next_eval_batch()
+            return first_wait_secs, carried_uids
+
+        with patch.object(
+            MinerEvaluator, "EVAL_BATCH_DURATION", dt.timedelta(seconds=0.1)
+        ), patch.object(
+            MinerEvaluator, "EVAL_BATCH_DRAIN_TIMEOUT", dt.timedelta(seconds=0.1)
+        ):
+            first_wait_secs, carried_uids = asyncio.run(run_batches())
+
+        # The slow evaluation is still in flight, so the next batch should start immediately.
+        self.assertEqual(first_wait_secs, 0)
+        self.assertEqual(carried_uids, [0])
+        # The next batch finishes the carried evaluation.
+        self.assertIn(0, evaluated)
+        self.assertEqual(evaluator.in_flight_evals, {})
+
+    def test_eval_timeout_during_scoring_is_journaled_once(self):
+        """Verifies that a miner scored after its evaluation timed out is journaled once, and not as failed."""
+        evaluator = None
+
+        async def eval_miner(uid: int, record=None):
+            record.outcome = "validated"
+            await evaluator._on_miner_evaluated(uid, None, [], record)
+
+        evaluator = self.evaluator = _create_evaluator([0], eval_miner)
+
+        def slow_score(*args):
+            time.sleep(1)
+
+        with patch.object(
+            MinerEvaluator, "EVAL_TIMEOUT", dt.timedelta(seconds=0.2)
+        ), patch.object(evaluator.scorer, "on_miner_evaluated", side_effect=slow_score):
+            asyncio.run(evaluator.run_next_eval_batch())
+
+        records = EvaluationJournal.read(evaluator.journal.path)
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0].outcome, "validated")
+        self.assertIsNotNone(records[0].scoring_state_after)
+        self.assertEqual(evaluator.scheduler.activity[0].failure_rate, 0.0)
+
+    def test_update_and_get_miner_index_unchanged(self):
+        """Verifies that an unchanged index is not resent, and the stored index is reused."""
+        evaluator = self.evaluator = _create_evaluator([0])
+        hotkey = evaluator.metagraph.hotkeys[0]
+        index = CompressedMinerIndex(
+            sources={
+                DataSource.REDDIT.value: [
+                    CompressedEntityBucket(
+                        label="r/bittensor_", time_bucket_ids=[5], sizes_bytes=[100]
+                    )
+                ]
+            }
+        )
+
+        # The first query has no known hash, so the miner sends its index.
+        evaluator.dendrite_pool.response = GetMinerIndex(
+            compressed_index_serialized=index.model_dump_json(), index_hash="hash1"
+        )
+        stored_index = asyncio.run(
+            evaluator._update_and_get_miner_index(hotkey, 0, None)
+        )
+        self.assertIsNone(evaluator.dendrite_pool.synapses[-1].index_hash)
+        self.assertEqual(stored_index.bucket_count(), 1)
+        last_updated = evaluator.storage.read_miner_last_updated(hotkey)
+
+        # The second query sends the known hash, and the miner replies that it is unchanged.
+        evaluator.dendrite_pool.response = GetMinerIndex(
+            index_hash="hash1", index_unchanged=True
+        )
+        unchanged_index = asyncio.run(
+            evaluator._update_and_get_miner_index(hotkey, 0, None)
+        )
+        self.assertEqual(evaluator.dendrite_pool.synapses[-1].index_hash, "hash1")
+        self.assertEqual(unchanged_index.bucket_count(), 1)
+        self.assertEqual(
+            unchanged_index.size_bytes.tolist(), stored_index.size_bytes.tolist()
+        )
+        self.assertGreater(
+            evaluator.storage.read_miner_last_updated(hotkey), last_updated
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
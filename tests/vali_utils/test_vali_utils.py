@@ -1,7 +1,9 @@
 import bittensor as bt
 import datetime as dt
+import random
+import time
 import unittest
-from common import constants
+from common import binary_encoding, constants
 from common.data import (
     CompressedEntityBucket,
     CompressedMinerIndex,
@@ -12,7 +14,11 @@ from common.data import (
     TimeBucket,
     DataSource,
 )
-from common.data_v2 import ScorableDataEntityBucket, ScorableMinerIndex
+from common.data_v2 import (
+    ColumnarCompressedMinerIndex,
+    ScorableDataEntityBucket,
+    ScorableMinerIndex,
+)
 from common.protocol import GetMinerIndex
 import vali_utils.utils as vali_utils
 import pytz
@@ -562,5 +568,117 @@ class TestValiUtils(unittest.TestCase):
             vali_utils.get_miner_index_from_response(response)
 
 
+    def test_get_columnar_miner_index_from_response(self):
+        """Tests get_columnar_miner_index_from_response decodes the same index as get_miner_index_from_response."""
+        compressed_index = CompressedMinerIndex(
+            sources={
+                DataSource.REDDIT: [
+                    CompressedEntityBucket(
+                        label="r/bittensor_",
+                        time_bucket_ids=[5, 6],
+                        sizes_bytes=[100, 200],
+                    )
+                ],
+                DataSource.X: [
+                    CompressedEntityBucket(
+                        label="#bittensor",
+                        time_bucket_ids=[6],
+                        sizes_bytes=[300],
+                    )
+                ],
+            }
+        )
+
+        response = GetMinerIndex(
+            compressed_index_serialized=compressed_index.json(),
+            dendrite=bt.TerminalInfo(status_code=200),
+        )
+
+        index = vali_utils.get_columnar_miner_index_from_response(response)
+        self.assertIsInstance(index, ColumnarCompressedMinerIndex)
+        self.assertEqual(
+            index.to_compressed_index(),
+            vali_utils.get_miner_index_from_response(response),
+        )
+
+    def test_get_miner_index_from_binary_encoded_response(self):
+        """Tests that both index helpers read a binary encoded GetMinerIndex response."""
+        compressed_index = CompressedMinerIndex(
+            sources={
+                DataSource.REDDIT: [
+                    CompressedEntityBucket(
+                        label="r/bittensor_",
+                        time_bucket_ids=[5, 6],
+                        sizes_bytes=[100, 200],
+                    )
+                ],
+            }
+        )
+
+        response = GetMinerIndex(
+            compressed_index_encoded=binary_encoding.encode_compressed_index(
+                compressed_index
+            ),
+            dendrite=bt.TerminalInfo(status_code=200),
+        )
+
+        self.assertEqual(
+            vali_utils.get_miner_index_from_response(response), compressed_index
+        )
+        self.assertEqual(
+            vali_utils.get_columnar_miner_index_from_response(
+                response
+            ).to_compressed_index(),
+            compressed_index,
+        )
+
+    def test_get_columnar_miner_index_from_response_perf(self):
+        """A perf test comparing pydantic and columnar decoding of a maximal index."""
+        num_buckets = (
+            constants.DATA_ENTITY_BUCKET_COUNT_LIMIT_PER_MINER_INDEX_PROTOCOL_4
+        )
+        num_time_buckets = constants.DATA_ENTITY_BUCKET_AGE_LIMIT_DAYS * 24
+        num_labels = num_buckets // 2 // num_time_buckets
+
+        sources = {}
+        for source in [DataSource.REDDIT, DataSource.X]:
+            sources[int(source)] = [
+                CompressedEntityBucket(
+                    label=f"label{i}",
+                    time_bucket_ids=list(range(1, num_time_buckets + 1)),
+                    sizes_bytes=[
+                        random.randint(1, 112345678) for _ in range(num_time_buckets)
+                    ],
+                )
+                for i in range(num_labels)
+            ]
+        compressed_index = CompressedMinerIndex(sources=sources)
+        response = GetMinerIndex(
+            compressed_index_serialized=compressed_index.model_dump_json(),
+            dendrite=bt.TerminalInfo(status_code=200),
+        )
+
+        start = time.time()
+        pydantic_index = vali_utils.get_miner_index_from_response(response)
+        print(
+            f"Time to decode {CompressedMinerIndex.bucket_count(pydantic_index)} buckets with pydantic:",
+            time.time() - start,
+        )
+
+        start = time.time()
+        columnar_index = vali_utils.get_columnar_miner_index_from_response(response)
+        print(
+            f"Time to decode {columnar_index.bucket_count()} buckets into columns:",
+            time.time() - start,
+        )
+
+        self.assertEqual(
+            columnar_index.bucket_count(),
+            CompressedMinerIndex.bucket_count(pydantic_index),
+        )
+        self.assertEqual(
+            columnar_index.size_bytes(), CompressedMinerIndex.size_bytes(pydantic_index)
+        )
+
 if __name__ == "__main__":
     unittest.main()
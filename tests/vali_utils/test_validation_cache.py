@@ -0,0 +1,83 @@
+import datetime as dt
+import unittest
+
+from common.data import DataEntity, DataLabel, DataSource
+from scraping.scraper import ValidationResult
+from vali_utils.validation_cache import ValidationCache
+
+
+def _create_entity(uri: str = "https://x.com/user/status/1", **kwargs) -> DataEntity:
+    fields = dict(
+        uri=uri,
+        datetime=dt.datetime(2024, 5, 1, tzinfo=dt.timezone.utc),
+        source=DataSource.X,
+        label=DataLabel(value="#bittensor"),
+        content=b"content",
+        content_size_bytes=7,
+    )
+    fields.update(kwargs)
+    return DataEntity(**fields)
+
+
+VALID = ValidationResult(is_valid=True, content_size_bytes_validated=7)
+INVALID = ValidationResult(is_valid=False, content_size_bytes_validated=7)
+
+
+class TestValidationCache(unittest.TestCase):
+    def setUp(self):
+        self.now = dt.datetime(2024, 5, 1, 12, 0, 0)
+
+    def test_get_and_put(self):
+        """Tests that identical entities share a result, and entities differing in any field don't."""
+        cache = ValidationCache()
+        cache.put(_create_entity(), VALID, now=self.now)
+
+        self.assertEqual(cache.get(_create_entity(), now=self.now), VALID)
+        for entity in [
+            _create_entity(uri="https://x.com/user/status/2"),
+            _create_entity(content=b"other content"),
+            _create_entity(label=DataLabel(value="#other")),
+            _create_entity(content_size_bytes=8),
+            _create_entity(datetime=dt.datetime(2024, 5, 2, tzinfo=dt.timezone.utc)),
+        ]:
+            self.assertIsNone(cache.get(entity, now=self.now))
+
+        self.assertEqual(
+            cache.get_stats(), {"entries": 1, "hits": 1, "misses": 5, "hit_rate": 1 / 6}
+        )
+
+    def test_ttl(self):
+        """Tests that results expire."""
+        cache = ValidationCache()
+        entity = _create_entity()
+        cache.put(entity, VALID, now=self.now)
+
+        later = self.now + ValidationCache.VALID_TTL - dt.timedelta(seconds=1)
+        self.assertEqual(cache.get(entity, now=later), VALID)
+
+        later = self.now + ValidationCache.VALID_TTL
+        self.assertIsNone(cache.get(entity, now=later))
+        self.assertEqual(cache.get_stats()["entries"], 0)
+
+    def test_invalid_results_are_not_cached(self):
+        """Tests that failed validations aren't reused, as they may be caused by a transient scraper issue."""
+        cache = ValidationCache()
+        cache.put(_create_entity(), INVALID, now=self.now)
+
+        self.assertIsNone(cache.get(_create_entity(), now=self.now))
+        self.assertEqual(cache.get_stats()["entries"], 0)
+
+    def test_max_entries(self):
+        """Tests that the oldest results are evicted once the cache is full."""
+        cache = ValidationCache(max_entries=2)
+        entities = [_create_entity(uri=f"https://x.com/user/status/{i}") for i in range(3)]
+        for entity in entities:
+            cache.put(entity, VALID, now=self.now)
+
+        self.assertIsNone(cache.get(entities[0], now=self.now))
+        self.assertEqual(cache.get(entities[1], now=self.now), VALID)
+        self.assertEqual(cache.get(entities[2], now=self.now), VALID)
+
+
+if __name__ == "__main__":
+    unittest.main()
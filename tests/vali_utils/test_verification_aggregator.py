@@ -0,0 +1,164 @@
+import asyncio
+import datetime as dt
+import unittest
+from typing import List
+from unittest.mock import patch
+
+from common.data import DataEntity, DataSource
+from scraping.provider import ScraperProvider
+from scraping.scraper import ScraperId, ValidationResult
+from vali_utils.validation_cache import ValidationCache
+from vali_utils.verification_aggregator import VerificationAggregator
+
+
+class _RecordingScraper:
+    """A scraper that records each call to validate, and marks entities valid if their uri ends with 'valid'."""
+
+    calls: List[List[str]] = []
+
+    async def validate(self, entities: List[DataEntity]) -> List[ValidationResult]:
+        _RecordingScraper.calls.append([entity.uri for entity in entities])
+        if any(entity.uri == "raise" for entity in entities):
+            raise RuntimeError("Validation failed.")
+        return [
+            ValidationResult(
+                is_valid=entity.uri.endswith("/valid"),
+                content_size_bytes_validated=entity.content_size_bytes,
+            )
+            for entity in entities
+        ]
+
+
+def _create_entity(uri: str) -> DataEntity:
+    return DataEntity(
+        uri=uri,
+        datetime=dt.datetime(2024, 5, 1, tzinfo=dt.timezone.utc),
+        source=DataSource.X,
+        content=b"content",
+        content_size_bytes=7,
+    )
+
+
+class TestVerificationAggregator(unittest.TestCase):
+    def setUp(self):
+        _RecordingScraper.calls = []
+        self.aggregator = VerificationAggregator(
+            ScraperProvider(
+                factories={
+                    ScraperId.X_APIDOJO: _RecordingScraper,
+                    ScraperId.REDDIT_CUSTOM: _RecordingScraper,
+                }
+            )
+        )
+
+    def test_validations_are_batched_per_scraper(self):
+        """Verifies that concurrent validations share one call per batched scraper and get their own results."""
+
+        async def run():
+            return await asyncio.gather(
+                self.aggregator.validate(
+                    ScraperId.X_APIDOJO,
+                    [_create_entity("1/valid"), _create_entity("1/invalid")],
+                ),
+                self.aggregator.validate(
+                    ScraperId.X_APIDOJO, [_create_entity("2/invalid")]
+                ),
+                self.aggregator.validate(
+                    ScraperId.REDDIT_CUSTOM, [_create_entity("3/valid")]
+                ),
+                self.aggregator.validate(
+                    ScraperId.REDDIT_CUSTOM, [_create_entity("4/invalid")]
+                ),
+            )
+
+        with patch.object(VerificationAggregator, "BATCH_WINDOW_SECS", 0.01):
+            results = asyncio.run(run())
+
+        self.assertEqual(
+            [[result.is_valid for result in miner_results] for miner_results in results],
+            [[True, False], [False], [True], [False]],
+        )
+        # Reddit validates entities one after another, so its validations aren't batched.
+        self.assertCountEqual(
+            _RecordingScraper.calls,
+            [["1/valid", "1/invalid", "2/invalid"], ["3/valid"], ["4/invalid"]],
+        )
+
+    def test_full_batch_is_validated_immediately(self):
+        """Verifies that a batch is validated as soon as it is full, without waiting for the window."""
+
+        async def run():
+            return await asyncio.wait_for(
+                asyncio.gather(
+                    self.aggregator.validate(
+                        ScraperId.X_APIDOJO, [_create_entity("1/valid")]
+                    ),
+                    self.aggregator.validate(
+                        ScraperId.X_APIDOJO, [_create_entity("2/valid")]
+                    ),
+                ),
+                timeout=5,
+            )
+
+        with patch.object(VerificationAggregator, "BATCH_WINDOW_SECS", 60):
+            with patch.object(VerificationAggregator, "MAX_BATCH_SIZE", 2):
+                results = asyncio.run(run())
+
+        self.assertEqual(len(results), 2)
+        self.assertEqual(_RecordingScraper.calls, [["1/valid", "2/valid"]])
+
+    def test_failures_stay_with_their_caller(self):
+        """Verifies that if a batch fails, each validation is retried alone so only the failing one raises."""
+
+        async def run():
+            return await asyncio.gather(
+                self.aggregator.validate(ScraperId.X_APIDOJO, [_create_entity("raise")]),
+                self.aggregator.validate(
+                    ScraperId.X_APIDOJO, [_create_entity("1/valid")]
+                ),
+                return_exceptions=True,
+            )
+
+        with patch.object(VerificationAggregator, "BATCH_WINDOW_SECS", 0.01):
+            results = asyncio.run(run())
+
+        self.assertIsInstance(results[0], RuntimeError)
+        self.assertEqual([True], [result.is_valid for result in results[1]])
+        self.assertCountEqual(
+            _RecordingScraper.calls, [["raise", "1/valid"], ["raise"], ["1/valid"]]
+        )
+
+    def test_cached_and_duplicate_entities_are_validated_once(self):
+        """Verifies that valid results are reused across batches, and duplicates within a batch are validated once."""
+        cache = ValidationCache()
+        self.aggregator.validation_cache = cache
+
+        async def run():
+            return await asyncio.gather(
+                self.aggregator.validate(
+                    ScraperId.X_APIDOJO,
+                    [_create_entity("1/valid"), _create_entity("2/invalid")],
+                ),
+                self.aggregator.validate(
+                    ScraperId.X_APIDOJO, [_create_entity("1/valid")]
+                ),
+            )
+
+        with patch.object(VerificationAggregator, "BATCH_WINDOW_SECS", 0.01):
+            first_results = asyncio.run(run())
+            second_results = asyncio.run(run())
+
+        # The invalid entity isn't cached, so it's validated again.
+        self.assertEqual(
+            _RecordingScraper.calls, [["1/valid", "2/invalid"], ["2/invalid"]]
+        )
+        for results in [first_results, second_results]:
+            self.assertEqual(
+                [[result.is_valid for result in miner_results] for miner_results in results],
+                [[True, False], [True]],
+            )
+        self.assertEqual(cache.get_stats()["hits"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
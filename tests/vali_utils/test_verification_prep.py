@@ -0,0 +1,102 @@
+import datetime as dt
+import random
+import unittest
+
+from common.data import DataEntity, DataSource
+from vali_utils import verification_prep
+
+
+def _create_entity(uri: str, content: bytes, content_size_bytes: int = None) -> DataEntity:
+    return DataEntity(
+        uri=uri,
+        datetime=dt.datetime(2024, 5, 1, tzinfo=dt.timezone.utc),
+        source=DataSource.REDDIT,
+        content=content,
+        content_size_bytes=(
+            len(content) if content_size_bytes is None else content_size_bytes
+        ),
+    )
+
+
+class TestVerificationPrep(unittest.TestCase):
+    def test_sample_entities_by_size_distribution(self):
+        """Tests that entities are chosen as if drawn one at a time, weighted by size, without replacement."""
+        entities = [
+            _create_entity(f"uri{i}", b"content", content_size_bytes=size)
+            for i, size in enumerate([100, 200, 300])
+        ]
+        rng = random.Random(42)
+
+        first_counts = [0, 0, 0]
+        chosen_counts = [0, 0, 0]
+        for _ in range(10000):
+            chosen = verification_prep.sample_entities_by_size(entities, 2, rng)
+            self.assertEqual(len(chosen), 2)
+            self.assertNotEqual(chosen[0].uri, chosen[1].uri)
+            first_counts[entities.index(chosen[0])] += 1
+            for entity in chosen:
+                chosen_counts[entities.index(entity)] += 1
+
+        # The first entity drawn is proportional to size.
+        for count, expected in zip(first_counts, [1 / 6, 2 / 6, 3 / 6]):
+            self.assertAlmostEqual(count / 10000, expected, delta=0.02)
+        # See test_choose_entities_to_verify in test_vali_utils for the derivation.
+        for count, expected in zip(chosen_counts, [0.42, 0.73, 0.85]):
+            self.assertAlmostEqual(count / 10000, expected, delta=0.02)
+
+    def test_sample_entities_by_size_edge_cases(self):
+        """Tests sampling more entities than exist, and entities without content."""
+        entities = [
+            _create_entity("empty", b"", content_size_bytes=0),
+            _create_entity("full", b"content"),
+        ]
+
+        self.assertEqual(verification_prep.sample_entities_by_size(entities, 0), [])
+        self.assertEqual(
+            [e.uri for e in verification_prep.sample_entities_by_size(entities, 1)],
+            ["full"],
+        )
+        self.assertEqual(
+            [e.uri for e in verification_prep.sample_entities_by_size(entities, 5)],
+            ["full", "empty"],
+        )
+        self.assertEqual(verification_prep.sample_entities_by_size([], 2), [])
+
+    def test_are_entities_unique(self):
+        """Tests that entities sharing a uri or content are detected, including contents of the same length."""
+        self.assertTrue(
+            verification_prep.are_entities_unique(
+                [
+                    _create_entity("uri1", b"aaaa"),
+                    _create_entity("uri2", b"bbbb"),
+                    _create_entity("uri3", b"cccc"),
+                    _create_entity("uri4", b"dd"),
+                    _create_entity("uri5", b""),
+                ]
+            )
+        )
+        # Same content, different uris. Checks both the first and a later entity of a length can be the duplicate.
+        self.assertFalse(
+            verification_prep.are_entities_unique(
+                [_create_entity("uri1", b"aaaa"), _create_entity("uri2", b"aaaa")]
+            )
+        )
+        self.assertFalse(
+            verification_prep.are_entities_unique(
+                [
+                    _create_entity("uri1", b"aaaa"),
+                    _create_entity("uri2", b"bbbb"),
+                    _create_entity("uri3", b"bbbb"),
+                ]
+            )
+        )
+        # Same uri, different content.
+        self.assertFalse(
+            verification_prep.are_entities_unique(
+                [_create_entity("uri1", b"aaaa"), _create_entity("uri1", b"bbbbbb")]
+            )
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
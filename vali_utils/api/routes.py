@@ -15,10 +15,10 @@ from vali_utils.api.auth.auth import require_master_key, verify_api_key
 from vali_utils.api.utils import endpoint_error_handler
 from scraping.scraper import ScrapeConfig
 from common.date_range import DateRange
-from scraping.provider import ScraperProvider
 from scraping.scraper import ValidationResult
 from scraping.x.enhanced_apidojo_scraper import EnhancedApiDojoTwitterScraper
 from vali_utils.miner_evaluator import MinerEvaluator
+from vali_utils import utils as vali_utils
 
 from dynamic_desirability.desirability_uploader import run_uploader_from_gravity
 from dynamic_desirability.desirability_retrieval import get_hotkey_json_submission
@@ -49,9 +49,11 @@ async def query_data(request: QueryRequest,
         MIN_PENALTY = 0.01
         MAX_PENALTY = 0.05
 
+        metagraph = validator.metagraph_snapshot
+
         # Get all miner UIDs and sort by incentive
-        miner_uids = utils.get_miner_uids(validator.metagraph, validator.uid, 10_000)
-        miner_scores = [(uid, float(validator.metagraph.I[uid])) for uid in miner_uids]
+        miner_uids = utils.get_miner_uids(metagraph, validator.uid, 10_000)
+        miner_scores = [(uid, float(metagraph.I[uid])) for uid in miner_uids]
         miner_scores.sort(key=lambda x: x[1], reverse=True)
 
         # Take top 60% of miners (but at least 5 if available)
@@ -73,7 +75,7 @@ async def query_data(request: QueryRequest,
         while len(selected_miners) < NUM_MINERS_TO_QUERY and top_miners:
             idx = random.randint(0, len(top_miners) - 1)
             uid, _ = top_miners.pop(idx)
-            coldkey = validator.metagraph.coldkeys[uid]
+            coldkey = metagraph.coldkeys[uid]
 
             # Only add if we haven't selected too many miners from this coldkey
             if coldkey not in selected_coldkeys or len(selected_coldkeys) < 2:
@@ -107,28 +109,27 @@ async def query_data(request: QueryRequest,
         miner_responses = {}
         miner_data_counts = {}
 
-        async with bt.dendrite(wallet=validator.wallet) as dendrite:
-            axons = [validator.metagraph.axons[uid] for uid in selected_miners]
-            responses = await dendrite.forward(
-                axons=axons,
-                synapse=synapse,
-                timeout=30
-            )
+        axons = [metagraph.axons[uid] for uid in selected_miners]
+        responses = await validator.evaluator.dendrite_pool.forward(
+            axons=axons,
+            synapse=synapse,
+            timeout=30
+        )
 
-            # Process responses
-            for i, response in enumerate(responses):
-                if i < len(selected_miners) and response is not None:
-                    uid = selected_miners[i]
-                    hotkey = validator.metagraph.hotkeys[uid]
+        # Process responses
+        for i, response in enumerate(responses):
+            if i < len(selected_miners) and response is not None:
+                uid = selected_miners[i]
+                hotkey = metagraph.hotkeys[uid]
 
-                    # Check if response has data
-                    data = getattr(response, 'data', [])
-                    data_count = len(data) if data else 0
+                # Check if response has data
+                data = getattr(response, 'data', [])
+                data_count = len(data) if data else 0
 
-                    miner_responses[uid] = response
-                    miner_data_counts[uid] = data_count
+                miner_responses[uid] = response
+                miner_data_counts[uid] = data_count
 
-                    bt.logging.info(f"Miner {uid} ({hotkey}) returned {data_count} items")
+                bt.logging.info(f"Miner {uid} ({hotkey}) returned {data_count} items")
 
         if not miner_responses:
             return {
@@ -162,7 +163,7 @@ async def query_data(request: QueryRequest,
                                 "consensus": "no_data"
                             }
                         }
-                    scraper = ScraperProvider().get(scraper_id)
+                    scraper = validator.evaluator.scraper_provider.get(scraper_id)
                 else:
                     bt.logging.warning(f"No preferred scraper for source {synapse.source}")
                     return {
@@ -362,7 +363,7 @@ async def query_data(request: QueryRequest,
                         bt.logging.warning(f"No preferred scraper for source {synapse.source}")
                         continue
 
-                    scraper = ScraperProvider().get(scraper_id)
+                    scraper = validator.evaluator.scraper_provider.get(scraper_id)
                     if not scraper:
                         bt.logging.warning(f"Could not initialize scraper {scraper_id}")
                         continue
@@ -398,7 +399,7 @@ async def query_data(request: QueryRequest,
                         )
 
                         # Update the miner's score with this result
-                        index = validator.storage.read_miner_index(validator.metagraph.hotkeys[uid])
+                        index = validator.storage.read_miner_index(metagraph.hotkeys[uid])
                         validator.evaluator.scorer.on_miner_evaluated(uid, index, [validation_result])
 
                         # Remove this miner from consistent miners if it was there
@@ -422,7 +423,7 @@ async def query_data(request: QueryRequest,
             best_meta = {
                 "source": "validated",
                 "miner_uid": best_uid,
-                "miner_hotkey": validator.metagraph.hotkeys[best_uid],
+                "miner_hotkey": metagraph.hotkeys[best_uid],
                 "validation_rate": validated_miners[best_uid]
             }
 
@@ -435,7 +436,7 @@ async def query_data(request: QueryRequest,
             best_meta = {
                 "source": "consistent",
                 "miner_uid": best_uid,
-                "miner_hotkey": validator.metagraph.hotkeys[best_uid]
+                "miner_hotkey": metagraph.hotkeys[best_uid]
             }
 
         # Last resort: take data from any miner that returned something
@@ -447,7 +448,7 @@ async def query_data(request: QueryRequest,
             best_meta = {
                 "source": "inconsistent",
                 "miner_uid": median_uid,
-                "miner_hotkey": validator.metagraph.hotkeys[median_uid]
+                "miner_hotkey": metagraph.hotkeys[median_uid]
             }
 
         # Process the data for return
@@ -586,8 +587,9 @@ async def query_bucket(
             bt.logging.info(f"Found miner with bucket {latest_bucket}")
 
             # Find miner's UID
-            uid = validator.metagraph.hotkeys.index(target_hotkey)
-            axon = validator.metagraph.axons[uid]
+            metagraph = validator.metagraph_snapshot
+            uid = metagraph.uid_by_hotkey[target_hotkey]
+            axon = metagraph.axons[uid]
 
             # Create bucket request
             bucket_id = DataEntityBucketId(
@@ -598,15 +600,14 @@ async def query_bucket(
 
             # Query miner
             bt.logging.info(f"Querying miner {uid} for bucket {latest_bucket}")
-            async with bt.dendrite(wallet=validator.wallet) as dendrite:
-                response = await dendrite.forward(
-                    axons=[axon],
-                    synapse=GetDataEntityBucket(
-                        data_entity_bucket_id=bucket_id,
-                        version=constants.PROTOCOL_VERSION,
-                    ),
-                    timeout=30
-                )
+            response = await validator.evaluator.dendrite_pool.forward(
+                axons=[axon],
+                synapse=GetDataEntityBucket(
+                    data_entity_bucket_id=bucket_id,
+                    version=constants.PROTOCOL_VERSION,
+                ),
+                timeout=30
+            )
 
             if not response:
                 return {
@@ -615,7 +616,7 @@ async def query_bucket(
                 }
 
             data = []
-            for entity in response[0].data_entities:
+            for entity in vali_utils.get_data_entities_from_response(response[0]):
                 data.append({
                     'uri': entity.uri,
                     'datetime': entity.datetime.isoformat(),
@@ -681,7 +682,7 @@ async def list_hf_repo_names(
 async def health_check(validator=Depends(get_validator),
                        api_key: str = Depends(verify_api_key)):
     """Health check endpoint"""
-    miner_uids = utils.get_miner_uids(validator.metagraph, validator.uid, 10_000)
+    miner_uids = utils.get_miner_uids(validator.metagraph_snapshot, validator.uid, 10_000)
     return {
         "status": "healthy" if validator.is_healthy() else "unhealthy",
         "timestamp": dt.datetime.utcnow(),
@@ -820,7 +821,7 @@ async def get_desirability_list(
     try:
         subtensor = validator.subtensor
         netuid = validator.evaluator.config.netuid
-        metagraph = validator.evaluator.metagraph
+        metagraph = validator.metagraph_snapshot
         return get_hotkey_json_submission(subtensor=subtensor, netuid=netuid, metagraph=metagraph, hotkey=hotkey)
     except Exception as e:
         bt.logging.error(f"Error getting desirabilities: {str(e)}")
@@ -882,4 +883,13 @@ async def system_health_check(
     _: bool = Depends(require_master_key)
 ):
     """Internal health check endpoint for monitoring"""
-    return {"status": "healthy", "timestamp": dt.datetime.utcnow().isoformat()}
\ No newline at end of file
+    return {"status": "healthy", "timestamp": dt.datetime.utcnow().isoformat()}
+
+@router.get("/monitoring/validation-cache")
+@endpoint_error_handler
+async def validation_cache_stats(
+    validator=Depends(get_validator),
+    _: bool = Depends(require_master_key)
+):
+    """Internal endpoint reporting the hit rate of the validation cache used by miner evaluation"""
+    return validator.evaluator.validation_cache.get_stats()
@@ -0,0 +1,155 @@
+import asyncio
+import threading
+from typing import Dict, Iterable, List, Optional, Union
+
+import aiohttp
+import bittensor as bt
+
+
+class _KeepAliveDendrite(bt.dendrite):
+    """A dendrite whose session keeps connections to miners alive between queries, within the given limits."""
+
+    def __init__(self, wallet: bt.wallet, limit: int, limit_per_host: int):
+        super().__init__(wallet=wallet)
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keep_alive_session: Optional[aiohttp.ClientSession] = None
+
+    @property
+    async def session(self) -> aiohttp.ClientSession:
+        if self.keep_alive_session is None:
+            self.keep_alive_session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self.limit,
+                    limit_per_host=self.limit_per_host,
+                    keepalive_timeout=DendritePool.KEEPALIVE_TIMEOUT_SECS,
+                )
+            )
+        return self.keep_alive_session
+
+    async def aclose_session(self):
+        if self.keep_alive_session is not None:
+            await self.keep_alive_session.close()
+            self.keep_alive_session = None
+
+
+class _LoopDendrite:
+    """A dendrite and the concurrency limits for its queries, all bound to one event loop."""
+
+    def __init__(
+        self, wallet: bt.wallet, max_concurrent_queries: int, max_queries_per_miner: int
+    ):
+        # The connector limits match the semaphores below, so queries never wait on the connector, where the wait
+        # would count against the query's timeout.
+        self.dendrite = _KeepAliveDendrite(
+            wallet, max_concurrent_queries, max_queries_per_miner
+        )
+        self.max_queries_per_miner = max_queries_per_miner
+        self.global_semaphore = asyncio.Semaphore(max_concurrent_queries)
+        self.miner_semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    def get_miner_semaphore(self, hotkey: str) -> asyncio.Semaphore:
+        semaphore = self.miner_semaphores.get(hotkey)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_queries_per_miner)
+            self.miner_semaphores[hotkey] = semaphore
+        return semaphore
+
+
+class DendritePool:
+    """A thread safe pool of dendrites shared by all of the validator's queries to miners.
+
+    Why? Creating a dendrite per query creates a new aiohttp session, and new connections to the miner, every time.
+    The pool reuses a single session per event loop and keeps connections to each miner alive between queries.
+
+    Queries run on more than one event loop (e.g. miner evaluation and the axon's organic query handlers), and an
+    aiohttp session can only be used on the loop it was created on, so the pool keeps a dendrite per event loop.
+    """
+
+    # The maximum number of queries in flight at once, per event loop.
+    MAX_CONCURRENT_QUERIES = 256
+
+    # The maximum number of queries in flight to a single miner at once, per event loop.
+    MAX_QUERIES_PER_MINER = 4
+
+    # How long an idle connection to a miner is kept open.
+    KEEPALIVE_TIMEOUT_SECS = 120
+
+    def __init__(
+        self,
+        wallet: bt.wallet,
+        max_concurrent_queries: int = MAX_CONCURRENT_QUERIES,
+        max_queries_per_miner: int = MAX_QUERIES_PER_MINER,
+    ):
+        self.wallet = wallet
+        self.max_concurrent_queries = max_concurrent_queries
+        self.max_queries_per_miner = max_queries_per_miner
+        self.lock = threading.Lock()
+        self.loop_dendrites: Dict[asyncio.AbstractEventLoop, _LoopDendrite] = {}
+
+    async def forward(
+        self,
+        axons: Union[List[bt.AxonInfo], bt.AxonInfo],
+        synapse: bt.Synapse,
+        timeout: float = 12,
+        deserialize: bool = True,
+    ) -> Union[List[bt.Synapse], bt.Synapse]:
+        """Queries the axons with the synapse, in the same way as bt.dendrite.forward.
+
+        Time spent waiting for the concurrency limits does not count against the timeout.
+        """
+        loop_dendrite = await self._get_loop_dendrite()
+
+        async def call(axon: bt.AxonInfo) -> bt.Synapse:
+            async with loop_dendrite.global_semaphore:
+                async with loop_dendrite.get_miner_semaphore(axon.hotkey):
+                    return await loop_dendrite.dendrite.call(
+                        target_axon=axon,
+                        synapse=synapse.model_copy(),
+                        timeout=timeout,
+                        deserialize=deserialize,
+                    )
+
+        if not isinstance(axons, list):
+            return await call(axons)
+        return list(await asyncio.gather(*(call(axon) for axon in axons)))
+
+    def prune_miners(self, hotkeys: Iterable[str]):
+        """Forgets the per miner limits of miners not in hotkeys, e.g. because they have deregistered."""
+        hotkeys = set(hotkeys)
+        with self.lock:
+            for loop_dendrite in self.loop_dendrites.values():
+                loop_dendrite.miner_semaphores = {
+                    hotkey: semaphore
+                    for hotkey, semaphore in loop_dendrite.miner_semaphores.items()
+                    if hotkey in hotkeys
+                }
+
+    async def close(self):
+        """Closes the connections made from the current event loop."""
+        loop = asyncio.get_running_loop()
+        with self.lock:
+            loop_dendrite = self.loop_dendrites.pop(loop, None)
+        if loop_dendrite:
+            await loop_dendrite.dendrite.aclose_session()
+
+    async def _get_loop_dendrite(self) -> _LoopDendrite:
+        """Returns the dendrite for the current event loop, creating it if necessary."""
+        loop = asyncio.get_running_loop()
+        stale_dendrites = []
+        with self.lock:
+            loop_dendrite = self.loop_dendrites.get(loop)
+            if loop_dendrite is None:
+                # Forget dendrites whose loops have since been closed. Their sessions can no longer be used.
+                for closed_loop in [l for l in self.loop_dendrites if l.is_closed()]:
+                    stale_dendrites.append(self.loop_dendrites.pop(closed_loop))
+
+                loop_dendrite = _LoopDendrite(
+                    self.wallet, self.max_concurrent_queries, self.max_queries_per_miner
+                )
+                self.loop_dendrites[loop] = loop_dendrite
+
+        # Their connections died with their loops, but the sessions must still be closed to release them.
+        for stale_dendrite in stale_dendrites:
+            await stale_dendrite.dendrite.aclose_session()
+        return loop_dendrite
@@ -0,0 +1,135 @@
+import base64
+import contextlib
+import datetime as dt
+import os
+import threading
+import time
+from typing import Dict, Iterator, List, Optional
+
+import bittensor as bt
+from pydantic import BaseModel, Field
+
+from common.data import DataEntity, DataEntityBucketId, DataLabel, DataSource
+from scraping.scraper import ValidationResult
+
+
+class JournaledEntity(BaseModel):
+    """An entity that was validated during an evaluation, and the result of validating it."""
+
+    uri: str
+    datetime: dt.datetime
+    source: DataSource
+    label: Optional[str] = None
+    # Base64 encoded, as content isn't guaranteed to be valid utf-8.
+    content: str
+    content_size_bytes: int
+    result: ValidationResult
+
+    @classmethod
+    def from_entity(
+        cls, entity: DataEntity, result: ValidationResult
+    ) -> "JournaledEntity":
+        return cls(
+            uri=entity.uri,
+            datetime=entity.datetime,
+            source=entity.source,
+            label=entity.label.value if entity.label else None,
+            content=base64.b64encode(entity.content).decode(),
+            content_size_bytes=entity.content_size_bytes,
+            result=result,
+        )
+
+    def to_data_entity(self) -> DataEntity:
+        return DataEntity(
+            uri=self.uri,
+            datetime=self.datetime,
+            source=self.source,
+            label=DataLabel(value=self.label) if self.label else None,
+            content=base64.b64decode(self.content),
+            content_size_bytes=self.content_size_bytes,
+        )
+
+
+class EvaluationRecord(BaseModel):
+    """A structured record of a single miner evaluation, from fetching the index to updating the score.
+
+    Steps that weren't reached are left unset.
+    """
+
+    uid: int
+    hotkey: str
+    started_at: dt.datetime = Field(default_factory=dt.datetime.utcnow)
+
+    # How long each step of the evaluation took, in the order they ran.
+    step_secs: Dict[str, float] = Field(default_factory=dict)
+
+    # The step that decided the evaluation, e.g. "validated" or "duplicate_entities". See MinerEvaluator.eval_miner.
+    outcome: Optional[str] = None
+    reason: Optional[str] = None
+
+    index_bucket_count: Optional[int] = None
+    index_scorable_bytes: Optional[int] = None
+    chosen_bucket: Optional[DataEntityBucketId] = None
+    chosen_bucket_size_bytes: Optional[int] = None
+    entity_count: Optional[int] = None
+
+    # The entities sampled for validation, with their results. Empty if the evaluation ended before sampling.
+    validated_entities: List[JournaledEntity] = Field(default_factory=list)
+    # The results passed to the scorer.
+    validation_results: List[ValidationResult] = Field(default_factory=list)
+
+    # The miner's scoring state before and after the evaluation. See MinerScorer.get_miner_scoring_state.
+    scoring_state_before: Optional[Dict[str, float]] = None
+    scoring_state_after: Optional[Dict[str, float]] = None
+
+    # Whether the record has been appended to the journal. Not itself journaled.
+    journaled: bool = Field(default=False, exclude=True)
+
+    @contextlib.contextmanager
+    def timed(self, step: str) -> Iterator[None]:
+        """Records how long the body takes as the duration of step, even if it raises or is cancelled."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.step_secs[step] = time.perf_counter() - start
+
+
+class EvaluationJournal:
+    """An append-only journal of EvaluationRecords, stored as one JSON record per line.
+
+    Once the journal reaches MAX_FILE_BYTES it's rotated to a single backup file, so at most twice that is kept.
+
+    Thread safe.
+    """
+
+    MAX_FILE_BYTES = 100 * 1024 * 1024
+
+    def __init__(self, path: str, max_file_bytes: int = MAX_FILE_BYTES):
+        self.path = path
+        self.max_file_bytes = max_file_bytes
+        self.lock = threading.Lock()
+
+    def append(self, record: EvaluationRecord):
+        """Appends the record to the journal. Failures are logged rather than raised."""
+        line = record.model_dump_json() + "\n"
+        try:
+            with self.lock:
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+                if (
+                    os.path.exists(self.path)
+                    and os.path.getsize(self.path) >= self.max_file_bytes
+                ):
+                    os.replace(self.path, self.path + ".1")
+                with open(self.path, "a") as f:
+                    f.write(line)
+        except OSError as e:
+            bt.logging.warning(f"Failed to write to evaluation journal {self.path}: {e}.")
+
+    @staticmethod
+    def read(path: str) -> List[EvaluationRecord]:
+        """Reads all records from the journal at path, oldest first."""
+        with open(path) as f:
+            return [
+                EvaluationRecord.model_validate_json(line) for line in f if line.strip()
+            ]
@@ -0,0 +1,223 @@
+"""Replays the scoring of journaled miner evaluations offline.
+
+Usage:
+    python -m vali_utils.evaluation_replay <path to evaluation_journal.jsonl>
+
+Each journaled evaluation is re-scored with the current MinerScorer. Sampled entities are re-validated with stand-in
+scrapers, which by default return the results recorded in the journal, so no network access is needed. Pass a
+ScraperProvider to replay to validate with other scrapers instead.
+
+Indexes aren't journaled, so index scoring is replayed from the journal rather than recomputed: each evaluation's
+index scores the raw score journaled for it, whatever the current DataValueCalculator would give. HF validation isn't
+replayed either, so each miner's HF boost and credibility are taken from the journal before each evaluation.
+"""
+
+import argparse
+import asyncio
+import dataclasses
+import datetime as dt
+import time
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from common.data import DataEntity, TimeBucket
+from common.data_v2 import ColumnarScorableMinerIndex
+from rewards.data_value_calculator import DataValueCalculator
+from rewards.miner_scorer import MinerScorer
+from scraping.provider import ScraperProvider
+from scraping.scraper import Scraper, ScraperId, ValidationResult
+from vali_utils.evaluation_journal import EvaluationJournal, EvaluationRecord
+from vali_utils.miner_evaluator import MinerEvaluator
+
+
+class RecordedResultScraper(Scraper):
+    """A stand-in scraper that returns the journaled result of each entity, without network access."""
+
+    def __init__(self, results_by_uri: Dict[str, ValidationResult]):
+        self.results_by_uri = results_by_uri
+
+    async def validate(self, entities: List[DataEntity]) -> List[ValidationResult]:
+        return [
+            self.results_by_uri.get(
+                entity.uri,
+                ValidationResult(
+                    is_valid=False,
+                    reason="Entity not found in the journal.",
+                    content_size_bytes_validated=entity.content_size_bytes,
+                ),
+            )
+            for entity in entities
+        ]
+
+    async def scrape(self, scrape_config) -> List[DataEntity]:
+        raise NotImplementedError("Stand-in scrapers can only validate.")
+
+    async def validate_hf(self, entities) -> bool:
+        raise NotImplementedError("Stand-in scrapers can only validate.")
+
+
+class _RecordedValueCalculator(DataValueCalculator):
+    """Scores an index as the raw score journaled for the evaluation being replayed, since indexes aren't journaled."""
+
+    def __init__(self):
+        super().__init__()
+        self.raw_score = 0.0
+
+    def get_score_for_index(
+        self, index: ColumnarScorableMinerIndex, current_time_bucket: TimeBucket
+    ) -> float:
+        return self.raw_score
+
+
+# Stands in for the miner's index, which isn't journaled.
+_PLACEHOLDER_INDEX = ColumnarScorableMinerIndex(
+    sources=[],
+    label_ids=[],
+    labels=[],
+    time_bucket_ids=[],
+    size_bytes=[],
+    scorable_bytes=[],
+    last_updated=dt.datetime.min,
+)
+
+
+@dataclasses.dataclass
+class ReplayedEvaluation:
+    """The result of replaying a single journaled evaluation."""
+
+    record: EvaluationRecord
+    validation_results: List[ValidationResult]
+    validation_secs: float
+    scoring_state: Dict[str, float]
+
+    @property
+    def validation_changed(self) -> bool:
+        """Whether any validation result differs from the journaled one."""
+        return [r.is_valid for r in self.validation_results] != [
+            r.is_valid for r in self.record.validation_results
+        ]
+
+    @property
+    def score_delta(self) -> float:
+        """The replayed score minus the journaled score."""
+        return self.scoring_state["score"] - self.record.scoring_state_after["score"]
+
+
+async def replay(
+    records: List[EvaluationRecord],
+    scraper_provider: Optional[ScraperProvider] = None,
+) -> List[ReplayedEvaluation]:
+    """Replays the scoring of the journaled evaluations, in order.
+
+    Each miner starts from the scoring state journaled before its first replayed evaluation. After that, its state
+    comes from the replay, so differences in scoring accumulate as they would have live. Only its HF boost and
+    credibility, which the replay doesn't update, are taken from each evaluation's journaled state.
+
+    Evaluations that ended without the miner being scored, e.g. by timing out, are skipped.
+    """
+    records = [record for record in records if record.scoring_state_after is not None]
+    if not records:
+        return []
+
+    if scraper_provider is None:
+        results_by_uri = {
+            entity.uri: entity.result
+            for record in records
+            for entity in record.validated_entities
+        }
+        stand_in = RecordedResultScraper(results_by_uri)
+        scraper_provider = ScraperProvider(
+            factories={scraper_id: lambda: stand_in for scraper_id in ScraperId}
+        )
+
+    value_calculator = _RecordedValueCalculator()
+    scorer = MinerScorer(max(record.uid for record in records) + 1, value_calculator)
+    seen_uids = set()
+    replayed = []
+    for record in records:
+        if record.uid not in seen_uids:
+            scorer.set_miner_scoring_state(record.uid, record.scoring_state_before)
+            seen_uids.add(record.uid)
+        else:
+            scorer.set_miner_scoring_state(
+                record.uid,
+                {
+                    **scorer.get_miner_scoring_state(record.uid),
+                    "hf_boost": record.scoring_state_before["hf_boost"],
+                    "hf_credibility": record.scoring_state_before["hf_credibility"],
+                },
+            )
+
+        validation_secs = 0.0
+        validation_results = record.validation_results
+        if record.validated_entities:
+            scraper_id = MinerEvaluator.PREFERRED_SCRAPERS[record.chosen_bucket.source]
+            start = time.perf_counter()
+            validation_results = await scraper_provider.get(scraper_id).validate(
+                [entity.to_data_entity() for entity in record.validated_entities]
+            )
+            validation_secs = time.perf_counter() - start
+
+        value_calculator.raw_score = record.scoring_state_after["raw_score"]
+        scorer.on_miner_evaluated(
+            record.uid,
+            _PLACEHOLDER_INDEX if record.index_bucket_count is not None else None,
+            validation_results,
+        )
+        replayed.append(
+            ReplayedEvaluation(
+                record=record,
+                validation_results=validation_results,
+                validation_secs=validation_secs,
+                scoring_state=scorer.get_miner_scoring_state(record.uid),
+            )
+        )
+
+    return replayed
+
+
+def summarize(
+    records: List[EvaluationRecord], replayed: List[ReplayedEvaluation]
+) -> str:
+    """Returns a human readable summary of the journaled step timings and outcomes, and of the replay."""
+    lines = [f"{len(records)} journaled evaluations."]
+
+    lines.append("Outcomes:")
+    for outcome, count in Counter(record.outcome for record in records).most_common():
+        lines.append(f"  {outcome}: {count}")
+
+    secs_by_step = defaultdict(list)
+    for record in records:
+        for step, secs in record.step_secs.items():
+            secs_by_step[step].append(secs)
+    lines.append("Step timings (secs): p50 / p95 / max")
+    for step, secs in secs_by_step.items():
+        p50, p95 = np.percentile(secs, [50, 95])
+        lines.append(f"  {step}: {p50:.3f} / {p95:.3f} / {max(secs):.3f}")
+
+    lines.append(f"{len(replayed)} evaluations replayed.")
+    if replayed:
+        changed = [r for r in replayed if r.validation_changed]
+        largest = max(replayed, key=lambda r: abs(r.score_delta))
+        lines.append(f"  Validation results changed: {len(changed)}")
+        lines.append(
+            f"  Total replayed validation time (secs): {sum(r.validation_secs for r in replayed):.3f}"
+        )
+        lines.append(
+            f"  Largest score change: {largest.score_delta:.2f} for uid {largest.record.uid} "
+            + f"evaluated at {largest.record.started_at}"
+        )
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Replay the scoring of journaled miner evaluations offline."
+    )
+    parser.add_argument("journal", help="The path to an evaluation journal.")
+    args = parser.parse_args()
+
+    records = EvaluationJournal.read(args.journal)
+    print(summarize(records, asyncio.run(replay(records))))
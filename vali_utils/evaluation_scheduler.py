@@ -0,0 +1,167 @@
+import datetime as dt
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from common import constants
+
+
+class _MinerActivity:
+    """What the scheduler has observed about a miner's recent evaluations."""
+
+    __slots__ = "last_evaluated", "index_size_bytes", "index_change", "failure_rate"
+
+    def __init__(self):
+        # When the miner was last evaluated by this scheduler, in UTC.
+        self.last_evaluated: Optional[dt.datetime] = None
+        # The total size of the miner's index at its last evaluation.
+        self.index_size_bytes: Optional[int] = None
+        # The relative change in index size between the last two evaluations, capped at 1.
+        self.index_change: float = 0.0
+        # An exponential moving average of whether evaluations failed.
+        self.failure_rate: float = 0.0
+
+
+class EvaluationScheduler:
+    """A thread safe scheduler that chooses which miners to evaluate next.
+
+    Why? Round-robin evaluation spends the same effort on idle miners as it does on active ones. The scheduler
+    instead orders miners by signals the validator already has.
+
+    A miner is due an evaluation once MIN_EVALUATION_PERIOD has passed since it was last evaluated. Due miners are
+    ordered as follows:
+        1. Miners that have never been evaluated, or that have been due for more than MIN_EVALUATION_PERIOD, ordered
+           by how long they have been due. This guarantees that no miner is starved by higher priority miners.
+        2. All other due miners, by priority. Priority favors miners whose index changed size at their last
+           evaluation, that recently failed validation, that have high incentive, and that have been due longer.
+    """
+
+    # How much each signal contributes to a miner's priority. Each signal is normalized to [0, 1].
+    INDEX_CHANGE_WEIGHT = 1.0
+    FAILURE_WEIGHT = 1.0
+    INCENTIVE_WEIGHT = 1.0
+    OVERDUE_WEIGHT = 1.0
+
+    # The weight of the latest evaluation in a miner's failure rate.
+    FAILURE_RATE_ALPHA = 0.3
+
+    def __init__(self, miner_uids: List[int]):
+        self.miner_uids = sorted(miner_uids)
+        self.activity: Dict[int, _MinerActivity] = {}
+        self.lock = threading.Lock()
+
+    def set_miner_uids(self, miner_uids: List[int]):
+        """Updates the miner UIDs to schedule."""
+        with self.lock:
+            self.miner_uids = sorted(miner_uids)
+
+    def reset(self, uid: int):
+        """Forgets everything observed about the miner, e.g. because its hotkey was replaced."""
+        with self.lock:
+            self.activity.pop(uid, None)
+
+    def on_miner_evaluated(
+        self,
+        uid: int,
+        index_size_bytes: Optional[int],
+        failed: bool,
+        now: Optional[dt.datetime] = None,
+    ):
+        """Records the outcome of a miner's evaluation.
+
+        Args:
+            uid (int): The miner's uid.
+            index_size_bytes (Optional[int]): The total size of the miner's index, or None if it has no index.
+            failed (bool): Whether the evaluation failed validation.
+            now (Optional[datetime.datetime]): When the evaluation finished, in UTC. Defaults to now.
+        """
+        with self.lock:
+            activity = self.activity.setdefault(uid, _MinerActivity())
+            activity.last_evaluated = now or dt.datetime.utcnow()
+
+            if index_size_bytes is not None:
+                if activity.index_size_bytes is not None:
+                    activity.index_change = min(
+                        1.0,
+                        abs(index_size_bytes - activity.index_size_bytes)
+                        / max(activity.index_size_bytes, 1),
+                    )
+                activity.index_size_bytes = index_size_bytes
+
+            activity.failure_rate += EvaluationScheduler.FAILURE_RATE_ALPHA * (
+                float(failed) - activity.failure_rate
+            )
+
+    def get_due_uids(
+        self,
+        last_updated: Dict[int, Optional[dt.datetime]],
+        incentives: Sequence[float],
+        now: Optional[dt.datetime] = None,
+    ) -> Tuple[List[int], float]:
+        """Returns the uids of the miners due an evaluation, in the order they should be evaluated.
+
+        Args:
+            last_updated (Dict[int, Optional[datetime.datetime]]): When each miner's index was last stored, in UTC.
+            incentives (Sequence[float]): The incentive of each uid, from the metagraph.
+            now (Optional[datetime.datetime]): The current time in UTC. Defaults to now.
+
+        Returns:
+            The due uids, and the number of seconds until the next miner that isn't yet due becomes due.
+        """
+        now = now or dt.datetime.utcnow()
+        period = constants.MIN_EVALUATION_PERIOD
+
+        starved: List[Tuple[float, int]] = []
+        prioritized: List[Tuple[float, int]] = []
+        secs_until_next_due = period.total_seconds()
+        with self.lock:
+            max_incentive = max(
+                (incentives[uid] for uid in self.miner_uids if uid < len(incentives)),
+                default=0,
+            )
+            for uid in self.miner_uids:
+                activity = self.activity.get(uid)
+                last_evaluated = max(
+                    (
+                        t
+                        for t in (
+                            last_updated.get(uid),
+                            activity.last_evaluated if activity else None,
+                        )
+                        if t is not None
+                    ),
+                    default=None,
+                )
+
+                if last_evaluated is None:
+                    starved.append((float("inf"), uid))
+                    continue
+
+                due_for = now - (last_evaluated + period)
+                if due_for < dt.timedelta(0):
+                    secs_until_next_due = min(
+                        secs_until_next_due, -due_for.total_seconds()
+                    )
+                elif due_for >= period:
+                    starved.append((due_for.total_seconds(), uid))
+                else:
+                    priority = EvaluationScheduler.OVERDUE_WEIGHT * (due_for / period)
+                    if activity:
+                        priority += (
+                            EvaluationScheduler.INDEX_CHANGE_WEIGHT
+                            * activity.index_change
+                            + EvaluationScheduler.FAILURE_WEIGHT * activity.failure_rate
+                        )
+                    if max_incentive > 0 and uid < len(incentives):
+                        priority += (
+                            EvaluationScheduler.INCENTIVE_WEIGHT
+                            * incentives[uid]
+                            / max_incentive
+                        )
+                    prioritized.append((priority, uid))
+
+        # Sort by descending wait or priority, breaking ties by uid.
+        starved.sort(key=lambda item: (-item[0], item[1]))
+        prioritized.sort(key=lambda item: (-item[0], item[1]))
+        return [uid for _, uid in starved] + [uid for _, uid in prioritized], max(
+            0, secs_until_next_due
+        )
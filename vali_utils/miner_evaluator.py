@@ -1,5 +1,5 @@
-import copy
 import datetime
+import functools
 import traceback
 import asyncio
 import threading
@@ -7,13 +7,13 @@ import os
 import sys
 import time
 from common import constants
-from common.data_v2 import ScorableMinerIndex
+from common.data_v2 import ColumnarScorableMinerIndex
 from common.metagraph_syncer import MetagraphSyncer
 import common.utils as utils
 import datetime as dt
 import bittensor as bt
+from concurrent.futures import ThreadPoolExecutor
 from common.data import (
-    CompressedMinerIndex,
     DataEntityBucket,
     DataEntity,
     DataSource,
@@ -29,10 +29,18 @@ from storage.validator.sqlite_memory_validator_storage import (
 
 from storage.validator.hf_validator_storage import HFValidationStorage
 
-from vali_utils.miner_iterator import MinerIterator
+from vali_utils.dendrite_pool import DendritePool
+from vali_utils.evaluation_journal import (
+    EvaluationJournal,
+    EvaluationRecord,
+    JournaledEntity,
+)
+from vali_utils.evaluation_scheduler import EvaluationScheduler
 from vali_utils import utils as vali_utils
+from vali_utils.validation_cache import ValidationCache
+from vali_utils.verification_aggregator import VerificationAggregator
 
-from typing import List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 
 from vali_utils.hf_utils import (
     get_latest_commit_files,
@@ -51,6 +59,8 @@ class MinerEvaluator:
 
     SCORER_FILENAME = "scorer.pickle"
 
+    JOURNAL_FILENAME = "evaluation_journal.jsonl"
+
     # Mapping of scrapers to use based on the data source to validate.
     PREFERRED_SCRAPERS = {
         DataSource.X: ScraperId.X_APIDOJO,
@@ -58,32 +68,65 @@ class MinerEvaluator:
         DataSource.YOUTUBE: ScraperId.YOUTUBE_TRANSCRIPT
     }
 
+    # The maximum number of miner evaluations in flight at once.
+    MAX_CONCURRENT_EVALS = 15
+
+    # How long run_next_eval_batch keeps starting new evaluations before returning control to the validator.
+    EVAL_BATCH_DURATION = dt.timedelta(minutes=5)
+
+    # How long run_next_eval_batch then waits for in flight evaluations, before carrying them over to the next batch.
+    EVAL_BATCH_DRAIN_TIMEOUT = dt.timedelta(minutes=1)
+
+    # How long a single miner evaluation may take before it is cancelled.
+    EVAL_TIMEOUT = dt.timedelta(minutes=10)
+
+    # The number of worker threads used for CPU heavy or blocking steps of an evaluation.
+    EVAL_WORKER_THREADS = 4
+
     def __init__(self, config: bt.config, uid: int, metagraph_syncer: MetagraphSyncer):
         self.config = config
         self.uid = uid
         self.metagraph_syncer = metagraph_syncer
-        self.metagraph = self.metagraph_syncer.get_metagraph(config.netuid)
+        self.metagraph = self.metagraph_syncer.get_metagraph_snapshot(config.netuid)
         self.metagraph_syncer.register_listener(
             self._on_metagraph_updated, netuids=[config.netuid]
         )
         self.vpermit_rao_limit = self.config.vpermit_rao_limit
         self.wallet = bt.wallet(config=self.config)
+        # Shared by evaluations, organic queries and the API, to reuse connections to miners.
+        self.dendrite_pool = DendritePool(self.wallet)
 
         # Set up initial scoring weights for validation
         self.scorer = MinerScorer(self.metagraph.n, DataValueCalculator())
 
         # Setup dependencies.
-        self.miner_iterator = MinerIterator(
+        self.scheduler = EvaluationScheduler(
             utils.get_miner_uids(self.metagraph, self.uid, self.vpermit_rao_limit)
         )
         self.scraper_provider = ScraperProvider()
+        self.validation_cache = ValidationCache()
+        self.verification_aggregator = VerificationAggregator(
+            self.scraper_provider, self.validation_cache
+        )
         self.storage = SqliteMemoryValidatorStorage()
         self.hf_storage = HFValidationStorage(self.config.hf_results_path)
+        self.journal = EvaluationJournal(
+            os.path.join(self.config.neuron.full_path, MinerEvaluator.JOURNAL_FILENAME)
+        )
         # Instantiate runners
         self.should_exit: bool = False
         self.is_running: bool = False
         self.lock = threading.RLock()
         self.is_setup = False
+        # Evaluations all run on the validator's event loop. Anything that would block the loop runs here instead.
+        self.worker_pool = ThreadPoolExecutor(
+            max_workers=MinerEvaluator.EVAL_WORKER_THREADS,
+            thread_name_prefix="miner_eval",
+        )
+        # Evaluations still running at the end of a batch, by uid. They carry over to the next batch.
+        self.in_flight_evals: Dict[asyncio.Task, int] = {}
+        # Serializes scoring a miner with journaling a failed evaluation, so each evaluation is journaled once.
+        self.journal_lock = threading.Lock()
 
     def get_scorer(self) -> MinerScorer:
         """Returns the scorer used by the evaluator."""
@@ -93,7 +136,9 @@ class MinerEvaluator:
         """Synchronous version of eval_miner."""
         asyncio.run(self.eval_miner(uid))
 
-    async def eval_miner(self, uid: int) -> None:
+    async def eval_miner(
+        self, uid: int, record: Optional[EvaluationRecord] = None
+    ) -> None:
         """Evaluates a miner and updates their score.
 
         Specifically:
@@ -102,24 +147,29 @@ class MinerEvaluator:
             3. Performs basic validation on the data entity bucket (right labels, matching size, etc.)
             4. Samples data from the data entity bucket and verifies the data is correct
             5. Passes the validation result to the scorer to update the miner's score.
+
+        Each step is recorded in record, which is written to the evaluation journal once the miner is scored.
         """
 
-        axon_info = None
-        hotkey = None
-        with self.lock:
-            axon_info = self.metagraph.axons[uid]
-            hotkey = self.metagraph.hotkeys[uid]
+        # Snapshots are immutable, so reading both from the same one is consistent without holding the lock.
+        metagraph = self.metagraph
+        axon_info = metagraph.axons[uid]
+        hotkey = metagraph.hotkeys[uid]
+        if record is None:
+            record = EvaluationRecord(uid=uid, hotkey=hotkey)
 
         bt.logging.info(f"{hotkey}: Evaluating miner.")
 
         # Query the miner for the latest index.
-        index = await self._update_and_get_miner_index(hotkey, uid, axon_info)
+        with record.timed("get_index"):
+            index = await self._update_and_get_miner_index(hotkey, uid, axon_info)
         if not index:
             # The miner hasn't provided an index yet, so we can't validate them. Count as a failed validation.
             bt.logging.info(
                 f"{hotkey}: Failed to get an index for miner. Counting as a failed validation."
             )
-            self.scorer.on_miner_evaluated(
+            record.outcome = "no_index"
+            await self._on_miner_evaluated(
                 uid,
                 None,
                 [
@@ -129,29 +179,35 @@ class MinerEvaluator:
                         content_size_bytes_validated=0,  # Since there is just one failed result size doesn't matter.
                     )
                 ],
+                record,
             )
             return
+        record.index_bucket_count = index.bucket_count()
+        record.index_scorable_bytes = index.total_scorable_bytes()
 
         ##########
         # Query HuggingFace metadata and perform enhanced HF validation.
-        current_block = int(self.metagraph.block)
+        current_block = self.metagraph.block
         validation_info = self.hf_storage.get_validation_info(hotkey)
         hf_validation_result = None
         if validation_info is None or (current_block - validation_info['block']) > 5100:  # ~17 hrs
-            hf_validation_result = await self._perform_hf_validation(hotkey, uid, axon_info, current_block)
+            with record.timed("hf_validation"):
+                hf_validation_result = await self._perform_hf_validation(hotkey, uid, axon_info, current_block)
         ##########
 
         # From that index, find a data entity bucket to sample and get it from the miner.
         chosen_data_entity_bucket: DataEntityBucket = (
             vali_utils.choose_data_entity_bucket_to_query(index)
         )
+        record.chosen_bucket = chosen_data_entity_bucket.id
+        record.chosen_bucket_size_bytes = chosen_data_entity_bucket.size_bytes
         bt.logging.info(
             f"{hotkey} Querying miner for Bucket ID: {chosen_data_entity_bucket.id}."
         )
 
-        responses = None
-        async with bt.dendrite(wallet=self.wallet) as dendrite:
-            responses = await dendrite.forward(
+        with record.timed("query_bucket"):
+            responses = None
+            responses = await self.dendrite_pool.forward(
                 axons=[axon_info],
                 synapse=GetDataEntityBucket(
                     data_entity_bucket_id=chosen_data_entity_bucket.id,
@@ -160,16 +216,26 @@ class MinerEvaluator:
                 timeout=140,
             )
 
-        data_entity_bucket = vali_utils.get_single_successful_response(
-            responses, GetDataEntityBucket
-        )
+            data_entity_bucket = vali_utils.get_single_successful_response(
+                responses, GetDataEntityBucket
+            )
+            data_entities: Optional[List[DataEntity]] = None
+            if data_entity_bucket is not None:
+                try:
+                    data_entities = await self._run_in_worker(
+                        vali_utils.get_data_entities_from_response, data_entity_bucket
+                    )
+                except ValueError as e:
+                    bt.logging.info(f"{hotkey}: Miner returned invalid data entities: {e}.")
+                    record.reason = str(e)
         # Treat a failed response the same way we treat a failed validation.
         # If we didn't, the miner could just not respond to queries for data entity buckets it doesn't have.
-        if data_entity_bucket is None:
+        if data_entities is None:
             bt.logging.info(
                 f"{hotkey}: Miner returned an invalid/failed response for Bucket ID: {chosen_data_entity_bucket.id}."
             )
-            self.scorer.on_miner_evaluated(
+            record.outcome = "bucket_query_failed"
+            await self._on_miner_evaluated(
                 uid,
                 index,
                 [
@@ -179,24 +245,28 @@ class MinerEvaluator:
                         content_size_bytes_validated=0,  # Since there is just one failed result size doesn't matter.
                     )
                 ],
+                record,
             )
             return
+        record.entity_count = len(data_entities)
 
         # Perform basic validation on the entities.
         bt.logging.info(
             f"{hotkey}: Performing basic validation on Bucket ID: {chosen_data_entity_bucket.id} containing "
-            + f"{chosen_data_entity_bucket.size_bytes} bytes across {len(data_entity_bucket.data_entities)} entities."
+            + f"{chosen_data_entity_bucket.size_bytes} bytes across {len(data_entities)} entities."
         )
 
-        data_entities: List[DataEntity] = data_entity_bucket.data_entities
-        (valid, reason) = vali_utils.are_entities_valid(
-            data_entities, chosen_data_entity_bucket
-        )
+        with record.timed("basic_validation"):
+            (valid, reason) = await self._run_in_worker(
+                vali_utils.are_entities_valid, data_entities, chosen_data_entity_bucket
+            )
         if not valid:
             bt.logging.info(
                 f"{hotkey}: Failed basic entity validation on Bucket ID: {chosen_data_entity_bucket.id} with reason: {reason}"
             )
-            self.scorer.on_miner_evaluated(
+            record.outcome = "invalid_entities"
+            record.reason = reason
+            await self._on_miner_evaluated(
                 uid,
                 index,
                 [
@@ -206,17 +276,22 @@ class MinerEvaluator:
                         content_size_bytes_validated=0,  # Since there is just one failed result size doesn't matter.
                     )
                 ],
+                record,
             )
             return
 
         # Perform uniqueness validation on the entity contents.
         # If we didn't, the miner could just return the same data over and over again.
-        unique = vali_utils.are_entities_unique(data_entities)
+        with record.timed("uniqueness"):
+            unique = await self._run_in_worker(
+                vali_utils.are_entities_unique, data_entities
+            )
         if not unique:
             bt.logging.info(
                 f"{hotkey}: Failed enitity uniqueness checks on Bucket ID: {chosen_data_entity_bucket.id}."
             )
-            self.scorer.on_miner_evaluated(
+            record.outcome = "duplicate_entities"
+            await self._on_miner_evaluated(
                 uid,
                 index,
                 [
@@ -226,6 +301,7 @@ class MinerEvaluator:
                         content_size_bytes_validated=0,  # Since there is just one failed result size doesn't matter.
                     )
                 ],
+                record,
             )
             return
 
@@ -240,16 +316,23 @@ class MinerEvaluator:
             f"{hotkey}: Basic validation on Bucket ID: {chosen_data_entity_bucket.id} passed. Validating uris: {entity_uris}."
         )
 
-        scraper = self.scraper_provider.get(
-            MinerEvaluator.PREFERRED_SCRAPERS[chosen_data_entity_bucket.id.source]
-        )
-        validation_results = await scraper.validate(entities_to_validate)
+        # Validate together with the entities chosen by other in flight evaluations.
+        with record.timed("entity_validation"):
+            validation_results = await self.verification_aggregator.validate(
+                MinerEvaluator.PREFERRED_SCRAPERS[chosen_data_entity_bucket.id.source],
+                entities_to_validate,
+            )
 
         bt.logging.success(
             f"{hotkey}: Data validation on selected entities finished with results: {validation_results}"
         )
 
-        self.scorer.on_miner_evaluated(uid, index, validation_results)
+        record.outcome = "validated"
+        record.validated_entities = [
+            JournaledEntity.from_entity(entity, result)
+            for entity, result in zip(entities_to_validate, validation_results)
+        ]
+        await self._on_miner_evaluated(uid, index, validation_results, record)
 
         if hf_validation_result:
             if hf_validation_result.is_valid == True:
@@ -279,7 +362,9 @@ class MinerEvaluator:
                 bt.logging.info(f"{hotkey}: Trying to validate {hf_metadata.repo_name}")
 
                 # Get parquet files and commit date from the latest commit.
-                new_parquet_files, commit_date = get_latest_commit_files(hf_metadata.repo_name)
+                new_parquet_files, commit_date = await self._run_in_worker(
+                    get_latest_commit_files, hf_metadata.repo_name
+                )
                 if not new_parquet_files:
                     bt.logging.warning(f"No new parquet files found for {hf_metadata.repo_name}")
                     continue
@@ -321,7 +406,9 @@ class MinerEvaluator:
                     continue
 
                 # Get encoded URLs and a DataFrame from the parquet files.
-                encoded_urls, encoded_df = get_validation_data(hf_metadata.repo_name, new_parquet_files)
+                encoded_urls, encoded_df = await self._run_in_worker(
+                    get_validation_data, hf_metadata.repo_name, new_parquet_files
+                )
                 if encoded_urls:
                     # Retrieve decoded URLs from the miner.
                     success, decoded_urls = await self._get_decoded_urls(hotkey, uid, axon_info, encoded_urls)
@@ -365,61 +452,150 @@ class MinerEvaluator:
         return hf_validation_result
 
     async def run_next_eval_batch(self) -> int:
-        """Asynchronously runs the next batch of miner evaluations and returns the number of seconds to wait until the next batch.
+        """Runs miner evaluations and returns the number of seconds to wait until the next batch.
+
+        Evaluations run concurrently on the current event loop, in a rolling window of up to MAX_CONCURRENT_EVALS.
+        As soon as one evaluation finishes the next due miner, as chosen by the scheduler, is started, so a slow
+        miner only occupies its own slot. New evaluations are started for up to EVAL_BATCH_DURATION. In flight
+        evaluations are then awaited for up to EVAL_BATCH_DRAIN_TIMEOUT, after which any still running are carried over
+        to the next batch and control returns to the validator so it can set weights and save state.
 
-        Args:
-            block (int): The block at which we started this evaluation.
+        Since every evaluation shares the event loop, nothing they await may block it. Blocking storage and parsing
+        steps run on the worker pool, and scrapers run their own blocking calls on threads.
         """
+        deadline = time.monotonic() + MinerEvaluator.EVAL_BATCH_DURATION.total_seconds()
+        drain_deadline = deadline + MinerEvaluator.EVAL_BATCH_DRAIN_TIMEOUT.total_seconds()
+        in_flight = self.in_flight_evals
+        started_uids: Set[int] = set()
+
+        while not self.should_exit:
+            # Top up the window with the highest priority miners that are due an evaluation.
+            if (
+                len(in_flight) < MinerEvaluator.MAX_CONCURRENT_EVALS
+                and time.monotonic() < deadline
+            ):
+                due_uids, _ = await self._get_due_uids()
+                for uid in due_uids:
+                    if len(in_flight) >= MinerEvaluator.MAX_CONCURRENT_EVALS:
+                        break
+                    if uid in started_uids or uid in in_flight.values():
+                        continue
+
+                    started_uids.add(uid)
+                    in_flight[
+                        asyncio.create_task(self._eval_miner_with_timeout(uid))
+                    ] = uid
+
+            remaining_secs = drain_deadline - time.monotonic()
+            if not in_flight or remaining_secs <= 0:
+                break
+
+            done, _ = await asyncio.wait(
+                in_flight, timeout=remaining_secs, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                del in_flight[task]
 
-        # Grab a snapshot of the metagraph
-        metagraph = None
-        with self.lock:
-            metagraph = copy.deepcopy(self.metagraph)
-
-        # Check if the next miner is due an update.
-        next_uid = self.miner_iterator.peek()
-        hotkey = metagraph.hotkeys[next_uid]
-        last_evaluated = self.storage.read_miner_last_updated(hotkey)
-        now = dt.datetime.utcnow()
-        due_update = (
-            last_evaluated is None
-            or (now - last_evaluated) >= constants.MIN_EVALUATION_PERIOD
+        bt.logging.info(
+            f"Finished evaluating {len(started_uids)} miners: {sorted(started_uids)}. "
+            + f"Validation cache: {self.validation_cache.get_stats()}."
         )
+        if in_flight:
+            bt.logging.info(
+                f"Carrying over {len(in_flight)} in flight evaluations to the next batch: {sorted(in_flight.values())}."
+            )
 
-        # If the next miner is not due an update, then all subsequent miners are also not due an update.
-        # So we wait until this miner is due an update.
-        if not due_update:
-            return (
-                last_evaluated + constants.MIN_EVALUATION_PERIOD - now
-            ).total_seconds()
+        due_uids, wait_secs = await self._get_due_uids()
+        if due_uids or in_flight or self.should_exit:
+            # Run the next evaluation batch immediately.
+            return 0
 
-        # Run in batches of 15.
-        miners_to_eval = 15
+        return wait_secs
 
-        # Otherwise, execute the next batch of evaluations.
-        # Use a set in case the network has fewer than 15 miners.
-        uids_to_eval = {next(self.miner_iterator) for _ in range(miners_to_eval)}
+    async def _get_due_uids(self) -> Tuple[List[int], float]:
+        """Returns the uids of miners due an evaluation in priority order, and the seconds until the next is due."""
+        metagraph = self.metagraph
+        hotkeys = metagraph.hotkeys
+        incentives = metagraph.I.tolist()
 
-        bt.logging.info(
-            f"Running validation on the following batch of uids: {uids_to_eval}."
+        last_updated_by_hotkey = await self._run_in_worker(
+            self.storage.read_miners_last_updated
+        )
+        return self.scheduler.get_due_uids(
+            {uid: last_updated_by_hotkey.get(hotkey) for uid, hotkey in enumerate(hotkeys)},
+            incentives,
         )
-        threads = [
-            threading.Thread(target=self.eval_miner_sync, args=(uid,))
-            for uid in uids_to_eval
-        ]
-        for thread in threads:
-            thread.start()
 
-        bt.logging.trace(f"Waiting for {len(threads)} miner evals to finish.")
-        end = datetime.datetime.now() + datetime.timedelta(seconds=300)
-        for t in threads:
-            # Compute the timeout, so that all threads are waited for a total of 5 minutes.
-            timeout = max(0, (end - datetime.datetime.now()).total_seconds())
-            t.join(timeout=timeout)
-        bt.logging.trace(f"Finished waiting for {len(threads)} miner eval.")
+    async def _eval_miner_with_timeout(self, uid: int) -> None:
+        """Evaluates a miner, logging rather than raising any failure so that other evaluations are unaffected."""
+        record = EvaluationRecord(uid=uid, hotkey=self.metagraph.hotkeys[uid])
+        try:
+            await asyncio.wait_for(
+                self.eval_miner(uid, record),
+                timeout=MinerEvaluator.EVAL_TIMEOUT.total_seconds(),
+            )
+            return
+        except asyncio.TimeoutError:
+            bt.logging.warning(
+                f"Evaluation of miner {uid} did not finish within {MinerEvaluator.EVAL_TIMEOUT}."
+            )
+            outcome, reason = "timeout", None
+        except Exception as e:
+            bt.logging.error(
+                f"Failed to evaluate miner {uid}.", traceback.format_exc()
+            )
+            outcome, reason = "error", str(e)
+        await self._run_in_worker(self._journal_failure, uid, record, outcome, reason)
+
+    def _journal_failure(
+        self, uid: int, record: EvaluationRecord, outcome: str, reason: Optional[str]
+    ) -> None:
+        with self.journal_lock:
+            # Cancelling the evaluation doesn't stop scoring that already started on a worker, which then journals it.
+            if record.journaled:
+                return
+            record.outcome = outcome
+            record.reason = reason
+            # Still count the attempt, so the miner isn't immediately rescheduled.
+            self.scheduler.on_miner_evaluated(uid, None, failed=True)
+            self.journal.append(record)
+            record.journaled = True
+
+    async def _on_miner_evaluated(
+        self,
+        uid: int,
+        index: Optional[ColumnarScorableMinerIndex],
+        validation_results: List[ValidationResult],
+        record: EvaluationRecord,
+    ) -> None:
+        """Updates the miner's score, and records the outcome of the evaluation for scheduling and in the journal."""
+        await self._run_in_worker(
+            self._score_and_journal, uid, index, validation_results, record
+        )
 
-        # Run the next evaluation batch immediately.
-        return 0
+    def _score_and_journal(
+        self,
+        uid: int,
+        index: Optional[ColumnarScorableMinerIndex],
+        validation_results: List[ValidationResult],
+        record: EvaluationRecord,
+    ) -> None:
+        with self.journal_lock:
+            # The evaluation was cancelled before scoring started, and has been journaled as failed.
+            if record.journaled:
+                return
+            record.validation_results = validation_results
+            record.scoring_state_before = self.scorer.get_miner_scoring_state(uid)
+            with record.timed("score"):
+                self.scorer.on_miner_evaluated(uid, index, validation_results)
+            record.scoring_state_after = self.scorer.get_miner_scoring_state(uid)
+            self.scheduler.on_miner_evaluated(
+                uid,
+                int(index.size_bytes.sum()) if index else None,
+                failed=not all(result.is_valid for result in validation_results),
+            )
+            self.journal.append(record)
+            record.journaled = True
 
     def save_state(self):
         """Saves the state of the validator to a file."""
@@ -459,19 +635,25 @@ class MinerEvaluator:
 
     async def _update_and_get_miner_index(
         self, hotkey: str, uid: int, miner_axon: bt.AxonInfo
-    ) -> Optional[ScorableMinerIndex]:
+    ) -> Optional[ColumnarScorableMinerIndex]:
         """Updates the index for the specified miner, and returns the latest known index or None if the miner hasn't yet provided an index."""
 
         bt.logging.info(f"{hotkey}: Getting MinerIndex from miner.")
 
         try:
+            # Send the hash of the index we already have, so the miner can skip resending it if it's unchanged.
+            known_index_hash = await self._run_in_worker(
+                self.storage.read_miner_index_hash, hotkey
+            )
+
             responses: List[GetMinerIndex] = None
-            async with bt.dendrite(wallet=self.wallet) as dendrite:
-                responses = await dendrite.forward(
-                    axons=[miner_axon],
-                    synapse=GetMinerIndex(version=constants.PROTOCOL_VERSION),
-                    timeout=120,
-                )
+            responses = await self.dendrite_pool.forward(
+                axons=[miner_axon],
+                synapse=GetMinerIndex(
+                    version=constants.PROTOCOL_VERSION, index_hash=known_index_hash
+                ),
+                timeout=120,
+            )
 
             response = vali_utils.get_single_successful_response(
                 responses, GetMinerIndex
@@ -481,32 +663,24 @@ class MinerEvaluator:
                     f"{hotkey}: Miner failed to respond with an index. Using last known index if present."
                 )
                 # Miner failed to update the index. Use the latest index, if present.
-                return self.storage.read_miner_index(hotkey)
-
-            # Validate the index.
-            miner_index = None
-            try:
-                miner_index = vali_utils.get_miner_index_from_response(response)
-            except ValueError as e:
-                bt.logging.info(
-                    f"{hotkey}: Miner returned an invalid index. Reason: {e}. Using last known index if present."
+                return await self._run_in_worker(self.storage.read_miner_index, hotkey)
+
+            if (
+                response.index_unchanged
+                and known_index_hash is not None
+                and response.index_hash == known_index_hash
+            ):
+                bt.logging.success(
+                    f"{hotkey}: Miner index is unchanged. Using the stored index."
+                )
+                return await self._run_in_worker(
+                    self._touch_and_read_miner_index, hotkey, uid
                 )
-                # Miner returned an invalid index. Use the latest index, if present.
-                return self.storage.read_miner_index(hotkey)
-
-            assert miner_index is not None, "Miner index should not be None."
 
-            # Miner replied with a valid index. Store it and return it.
-            miner_credibility = self.scorer.get_miner_credibility(uid)
-            bt.logging.success(
-                f"{hotkey}: Got new compressed miner index of {CompressedMinerIndex.size_bytes(miner_index)} bytes "
-                + f"across {CompressedMinerIndex.bucket_count(miner_index)} buckets."
-            )
-            self.storage.upsert_compressed_miner_index(
-                miner_index, hotkey, miner_credibility
+            # Parsing, storing and re-reading the index are CPU heavy for large indexes.
+            return await self._run_in_worker(
+                self._store_and_read_miner_index, hotkey, uid, response
             )
-
-            return self.storage.read_miner_index(hotkey)
         except Exception:
             bt.logging.error(
                 f"{hotkey} Failed to update and get miner index.",
@@ -514,6 +688,58 @@ class MinerEvaluator:
             )
             return None
 
+    def _store_and_read_miner_index(
+        self, hotkey: str, uid: int, response: GetMinerIndex
+    ) -> Optional[ColumnarScorableMinerIndex]:
+        """Validates and stores the index from a miner's response, and returns the latest known index for the miner.
+
+        Runs on the worker pool.
+        """
+        # Validate the index.
+        miner_index = None
+        try:
+            miner_index = vali_utils.get_columnar_miner_index_from_response(response)
+        except ValueError as e:
+            bt.logging.info(
+                f"{hotkey}: Miner returned an invalid index. Reason: {e}. Using last known index if present."
+            )
+            # Miner returned an invalid index. Use the latest index, if present.
+            return self.storage.read_miner_index(hotkey)
+
+        assert miner_index is not None, "Miner index should not be None."
+
+        # Miner replied with a valid index. Store it and return it.
+        miner_credibility = self.scorer.get_miner_credibility(uid)
+        bt.logging.success(
+            f"{hotkey}: Got new compressed miner index of {miner_index.size_bytes()} bytes "
+            + f"across {miner_index.bucket_count()} buckets."
+        )
+        # Only remember well formed hashes. Anything else just means the index is always resent.
+        index_hash = response.index_hash
+        if index_hash is not None and len(index_hash) > 64:
+            index_hash = None
+        self.storage.upsert_compressed_miner_index(
+            miner_index, hotkey, miner_credibility, index_hash
+        )
+
+        return self.storage.read_miner_index(hotkey)
+
+    def _touch_and_read_miner_index(
+        self, hotkey: str, uid: int
+    ) -> Optional[ColumnarScorableMinerIndex]:
+        """Marks the stored index of a miner as up to date, and returns it.
+
+        Runs on the worker pool.
+        """
+        self.storage.touch_miner_index(hotkey, self.scorer.get_miner_credibility(uid))
+        return self.storage.read_miner_index(hotkey)
+
+    async def _run_in_worker(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Runs func on the worker pool so that it doesn't block other evaluations running on the event loop."""
+        return await asyncio.get_running_loop().run_in_executor(
+            self.worker_pool, functools.partial(func, *args)
+        )
+
     async def _query_huggingface_metadata(
             self, hotkey: str, uid: int, miner_axon: bt.AxonInfo
     ) -> Optional[List[HuggingFaceMetadata]]:
@@ -521,12 +747,11 @@ class MinerEvaluator:
 
         try:
             synapse = GetHuggingFaceMetadata(version=constants.PROTOCOL_VERSION)
-            async with bt.dendrite(wallet=self.wallet) as dendrite:
-                responses = await dendrite.forward(
-                    axons=[miner_axon],
-                    synapse=synapse,
-                    timeout=120,
-                )
+            responses = await self.dendrite_pool.forward(
+                axons=[miner_axon],
+                synapse=synapse,
+                timeout=120,
+            )
 
             if not responses or len(responses) == 0 or not isinstance(responses[0], GetHuggingFaceMetadata):
                 bt.logging.info(f"{hotkey}: Miner failed to respond with HuggingFace metadata.")
@@ -550,15 +775,14 @@ class MinerEvaluator:
             Tuple[bool, List[str]]: (success, decoded_urls)
         """
         try:
-            async with bt.dendrite(wallet=self.wallet) as dendrite:
-                responses = await dendrite.forward(
-                    axons=[axon_info],
-                    synapse=DecodeURLRequest(
-                        encoded_urls=encoded_urls[:10],
-                        version=constants.PROTOCOL_VERSION
-                    ),
-                    timeout=30
-                )
+            responses = await self.dendrite_pool.forward(
+                axons=[axon_info],
+                synapse=DecodeURLRequest(
+                    encoded_urls=encoded_urls[:10],
+                    version=constants.PROTOCOL_VERSION
+                ),
+                timeout=30
+            )
 
             if not responses or len(responses) == 0:
                 bt.logging.info(f"{hotkey}: No response received for URL decode request")
@@ -575,6 +799,7 @@ class MinerEvaluator:
         bt.logging.info(
             f"Evaluator processing an update to metagraph on subnet {netuid}."
         )
+        metagraph = self.metagraph_syncer.get_metagraph_snapshot(netuid)
 
         with self.lock:
             bt.logging.info(
@@ -591,6 +816,7 @@ class MinerEvaluator:
                         f"Hotkey {hotkey} w/ UID {uid} has been unregistered or does not qualify to mine/validate."
                     )
                     self.scorer.reset(uid)  # hotkey has been replaced
+                    self.scheduler.reset(uid)
                     try:
                         self.storage.delete_miner(hotkey)
                     except Exception:
@@ -598,8 +824,8 @@ class MinerEvaluator:
                             f"{hotkey} Failed to delete miner index.",
                             traceback.format_exc(),
                         )
-            # Update the iterator. It will keep its current position if possible.
-            self.miner_iterator.set_miner_uids(
+            # Update the miners to schedule.
+            self.scheduler.set_miner_uids(
                 utils.get_miner_uids(self.metagraph, self.uid, self.vpermit_rao_limit)
             )
 
@@ -608,10 +834,14 @@ class MinerEvaluator:
             if len(self.metagraph.hotkeys) < len(metagraph.hotkeys):
                 self.scorer.resize(len(metagraph.hotkeys))
 
-            self.metagraph = copy.deepcopy(metagraph)
+            self.metagraph = metagraph
+
+        # Drop the per miner query limits of miners that have deregistered.
+        self.dendrite_pool.prune_miners(metagraph.hotkeys)
 
 
 
     def exit(self):
         self.should_exit = True
+        self.worker_pool.shutdown(wait=False)
 
@@ -1,69 +1,51 @@
 import bittensor as bt
-import hashlib
 import random
 from typing import List, Optional, Tuple, Type, Union
 import datetime as dt
-from common import constants
+from common import binary_encoding, constants, time_buckets
 from common.data import (
     CompressedMinerIndex,
     DataEntity,
     DataEntityBucket,
-    TimeBucket,
 )
-from common.data_v2 import ScorableMinerIndex
+from common.data_v2 import (
+    ColumnarCompressedMinerIndex,
+    ColumnarScorableMinerIndex,
+    ScorableMinerIndex,
+)
 from common.date_range import DateRange
-from common.protocol import GetMinerIndex
-from scraping.x import utils as x_utils
+from common.protocol import GetDataEntityBucket, GetMinerIndex
+from vali_utils import verification_prep
 
 
-def choose_data_entity_bucket_to_query(index: ScorableMinerIndex) -> DataEntityBucket:
+def choose_data_entity_bucket_to_query(
+    index: Union[ColumnarScorableMinerIndex, ScorableMinerIndex]
+) -> DataEntityBucket:
     """Chooses a random DataEntityBucket to query from a MinerIndex.
 
     The random selection is done based on choosing a random scorable byte in the total index to query, and then
-    selecting that DataEntityBucket.
+    selecting that DataEntityBucket. Buckets without scorable bytes are never chosen, unless no bucket has any.
     """
-    total_size = sum(
-        scorable_bucket.scorable_bytes
-        for scorable_bucket in index.scorable_data_entity_buckets
-    )
-    chosen_byte = random.uniform(0, total_size)
-    iterated_bytes = 0
-    for scorable_bucket in index.scorable_data_entity_buckets:
-        if iterated_bytes + scorable_bucket.scorable_bytes >= chosen_byte:
-            return scorable_bucket.to_data_entity_bucket()
-        iterated_bytes += scorable_bucket.scorable_bytes
+    index = ColumnarScorableMinerIndex.from_index(index)
     assert (
-        False
+        index.bucket_count() > 0
     ), "Failed to choose a DataEntityBucket to query... which should never happen"
 
+    total_scorable_bytes = index.total_scorable_bytes()
+    if total_scorable_bytes == 0:
+        # No bucket is worth more than another, so just query the first.
+        return index.to_data_entity_bucket(0)
+
+    chosen_byte = random.randrange(total_scorable_bytes)
+    return index.to_data_entity_bucket(index.bucket_at_scorable_byte(chosen_byte))
+
 
 def choose_entities_to_verify(entities: List[DataEntity]) -> List[DataEntity]:
     """Given a list of DataEntities from a DataEntityBucket, chooses a random set of entities to verify."""
 
-    # For now, we just sample 2 entities, based on size. Ensure we choose different entities.
+    # For now, we just sample 2 different entities, based on size.
     # In future, consider sampling every N bytes.
-    chosen_entities = []
-    total_size = sum(entity.content_size_bytes for entity in entities)
-
-    # Ensure we don't try to choose more entities than exist to choose from.
-    num_entities_to_choose = min(2, len(entities))
-    for _ in range(num_entities_to_choose):
-        chosen_byte = random.uniform(0, total_size)
-        iterated_bytes = 0
-        for entity in entities:
-            if entity in chosen_entities:
-                # Ensure we skip over already chosen entities if we see them again.
-                continue
-
-            if iterated_bytes + entity.content_size_bytes >= chosen_byte:
-                chosen_entities.append(entity)
-                # Adjust total_size to account for the entity we already selected.
-                total_size -= entity.content_size_bytes
-                break
-
-            iterated_bytes += entity.content_size_bytes
-
-    return chosen_entities
+    return verification_prep.sample_entities_by_size(entities, 2)
 
 
 def are_entities_valid(
@@ -78,8 +60,8 @@ def are_entities_valid(
     # Check the entity size, labels, source, and timestamp.
     actual_size = 0
     claimed_size = 0
-    expected_datetime_range: DateRange = TimeBucket.to_date_range(
-        data_entity_bucket.id.time_bucket
+    expected_datetime_range: DateRange = time_buckets.to_date_range(
+        data_entity_bucket.id.time_bucket.id
     )
 
     for entity in entities:
@@ -116,38 +98,15 @@ def are_entities_valid(
     return (True, "")
 
 
-def _normalize_uri(uri: str) -> str:
-    """Normalizes a URI (independent of DataSource) for equality comparison."""
-    # For now, we only normalize twitter URIs. Other DataSources don't require any normalization.
-    # Note: This will leave the URI untouched if it is not a twitter URI.
-    return x_utils.normalize_url(uri)
-
-
 def are_entities_unique(entities: List[DataEntity]) -> bool:
     """Checks that all entities in a DataEntityBucket are unique.
 
-    This is currently done by comparing hashes of only the content as the entire scrape response is serialized into
-    the content of each DataEntity.
+    This is currently done by comparing only the content and the normalized URI, as the entire scrape response is
+    serialized into the content of each DataEntity.
 
-    Returns a tuple of (is_unique, reason) where is_unique is True if the entities are unique,
-    and reason is a string describing why they are not unique.
+    Returns True if the entities are unique.
     """
-
-    # Create a set to store the hash of each entity content.
-    entity_content_hash_set = set()
-    uris = set()
-
-    for entity in entities:
-        entity_content_hash = hashlib.sha1(entity.content).hexdigest()
-        normalized_uri = _normalize_uri(entity.uri)
-        # Check that the hash and URI have not been seen before
-        if entity_content_hash in entity_content_hash_set or normalized_uri in uris:
-            return False
-        else:
-            entity_content_hash_set.add(entity_content_hash)
-            uris.add(normalized_uri)
-
-    return True
+    return verification_prep.are_entities_unique(entities)
 
 
 def get_single_successful_response(
@@ -172,7 +131,43 @@ def get_miner_index_from_response(response: GetMinerIndex) -> CompressedMinerInd
     """Gets a MinerIndex from a GetMinerIndex response."""
     assert response.is_success
 
+    if response.compressed_index_encoded:
+        return binary_encoding.decode_compressed_index(
+            response.compressed_index_encoded
+        ).to_compressed_index()
+
     if not response.compressed_index_serialized:
         raise ValueError("GetMinerIndex response has no index.")
 
     return CompressedMinerIndex.model_validate_json(response.compressed_index_serialized)
+
+
+def get_columnar_miner_index_from_response(
+    response: GetMinerIndex,
+) -> ColumnarCompressedMinerIndex:
+    """Gets a columnar MinerIndex from a GetMinerIndex response.
+
+    Prefer this over get_miner_index_from_response on hot paths, as it decodes the index without pydantic.
+    """
+    assert response.is_success
+
+    if response.compressed_index_encoded:
+        return binary_encoding.decode_compressed_index(
+            response.compressed_index_encoded
+        )
+
+    if not response.compressed_index_serialized:
+        raise ValueError("GetMinerIndex response has no index.")
+
+    return ColumnarCompressedMinerIndex.from_json(response.compressed_index_serialized)
+
+
+def get_data_entities_from_response(response: GetDataEntityBucket) -> List[DataEntity]:
+    """Gets the DataEntities from a GetDataEntityBucket response, whether or not they were binary encoded.
+
+    Raises:
+        ValueError: If the encoded data entities are invalid.
+    """
+    if response.data_entities_encoded:
+        return binary_encoding.decode_data_entities(response.data_entities_encoded)
+    return response.data_entities
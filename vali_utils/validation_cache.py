@@ -0,0 +1,93 @@
+import collections
+import datetime as dt
+import hashlib
+import threading
+from typing import Dict, Optional, Tuple
+
+from common.data import DataEntity
+from scraping.scraper import ValidationResult
+
+
+class ValidationCache:
+    """A thread safe cache of recent ValidationResults, keyed by entity uri and content hash.
+
+    Why? Popular posts are held by many miners. Validating each miner's copy requires a scrape of the same post, so
+    identical entities seen within the TTL reuse the earlier result instead.
+
+    The hash covers every field a scraper validates, not just the content, so that a miner's copy that differs in
+    e.g. its label or claimed size is still validated on its own.
+
+    Only successful validations are cached. A failure may be caused by a transient scraper issue rather than the
+    content, and caching it would fail every other miner holding the same entity.
+    """
+
+    # How long a successful validation is reused for.
+    VALID_TTL = dt.timedelta(hours=1)
+
+    # The maximum number of results to keep. The oldest results are evicted first.
+    MAX_ENTRIES = 100_000
+
+    def __init__(self, max_entries: int = MAX_ENTRIES):
+        self.max_entries = max_entries
+        # Ordered by insertion time, so the oldest entries are first.
+        self.entries: collections.OrderedDict[
+            Tuple[str, bytes], Tuple[dt.datetime, ValidationResult]
+        ] = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def key(entity: DataEntity) -> Tuple[str, bytes]:
+        """Returns the cache key for an entity."""
+        digest = hashlib.sha1(entity.content)
+        digest.update(
+            f"|{entity.datetime.isoformat()}|{int(entity.source)}|{entity.label.value if entity.label else ''}|{entity.content_size_bytes}".encode()
+        )
+        return entity.uri, digest.digest()
+
+    def get(
+        self, entity: DataEntity, now: Optional[dt.datetime] = None
+    ) -> Optional[ValidationResult]:
+        """Returns the cached ValidationResult for the entity, or None if there isn't an unexpired one."""
+        key = ValidationCache.key(entity)
+        now = now or dt.datetime.utcnow()
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry[0] > now:
+                self.hits += 1
+                return entry[1]
+
+            if entry is not None:
+                del self.entries[key]
+            self.misses += 1
+            return None
+
+    def put(
+        self,
+        entity: DataEntity,
+        result: ValidationResult,
+        now: Optional[dt.datetime] = None,
+    ):
+        """Caches the ValidationResult for the entity, if it's valid."""
+        if not result.is_valid:
+            return
+
+        key = ValidationCache.key(entity)
+        now = now or dt.datetime.utcnow()
+        with self.lock:
+            self.entries.pop(key, None)
+            self.entries[key] = (now + ValidationCache.VALID_TTL, result)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def get_stats(self) -> Dict[str, float]:
+        """Returns the number of cached results, and the hits, misses and hit rate since startup."""
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self.entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
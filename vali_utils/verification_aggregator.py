@@ -0,0 +1,191 @@
+import asyncio
+from typing import Dict, List, Optional, Set, Tuple
+
+import bittensor as bt
+
+from common.data import DataEntity
+from scraping.provider import ScraperProvider
+from scraping.scraper import ScraperId, ValidationResult
+from vali_utils.validation_cache import ValidationCache
+
+
+class _Batch:
+    """Entities waiting to be validated together, with the futures to resolve with each caller's results."""
+
+    def __init__(self):
+        self.requests: List[Tuple[List[DataEntity], asyncio.Future]] = []
+        self.entity_count = 0
+
+
+class VerificationAggregator:
+    """Batches the entity validations of concurrent miner evaluations into one scraper call per scraper.
+
+    Why? Each evaluation only verifies a couple of entities. Validating them separately for every miner costs an
+    external round-trip per miner, while some scrapers can fetch many entities in a single round-trip.
+
+    Only scrapers in BATCHED_SCRAPER_IDS are batched. Entities submitted within BATCH_WINDOW_SECS of each other for
+    the same scraper are validated together, and each caller receives the results for just its own entities. If the
+    combined call fails, each caller's entities are validated again on their own, so one miner's entities can't fail
+    another's evaluation. Other scrapers validate entities one after another, so each caller's entities are validated
+    separately and concurrently instead.
+
+    Must only be used from a single event loop.
+
+    If a ValidationCache is provided, entities with a cached result, or that appear more than once in a batch, are
+    only validated once.
+    """
+
+    # How long to wait for other evaluations to submit entities before validating a batch.
+    BATCH_WINDOW_SECS = 2.0
+
+    # The maximum number of entities validated in one scraper call. A full batch is validated immediately.
+    MAX_BATCH_SIZE = 50
+
+    # The scrapers that fetch many entities in one external call. Batching the others would serialize their calls.
+    BATCHED_SCRAPER_IDS = frozenset({ScraperId.X_APIDOJO})
+
+    def __init__(
+        self,
+        scraper_provider: ScraperProvider,
+        validation_cache: Optional[ValidationCache] = None,
+    ):
+        self.scraper_provider = scraper_provider
+        self.validation_cache = validation_cache
+        # The batch currently accepting entities for each scraper.
+        self.open_batches: Dict[ScraperId, _Batch] = {}
+        # Holds references to the running flush tasks so they aren't garbage collected.
+        self.tasks: Set[asyncio.Task] = set()
+
+    async def validate(
+        self, scraper_id: ScraperId, entities: List[DataEntity]
+    ) -> List[ValidationResult]:
+        """Validates the entities with the specified scraper, as part of a batch.
+
+        Returns:
+            The ValidationResult of each entity, in the same order as entities.
+        """
+        if not entities:
+            return []
+
+        if scraper_id not in VerificationAggregator.BATCHED_SCRAPER_IDS:
+            return await self._validate(scraper_id, entities)
+
+        batch = self.open_batches.get(scraper_id)
+        if batch is None:
+            batch = _Batch()
+            self.open_batches[scraper_id] = batch
+            self._start_task(self._flush_after_window(scraper_id, batch))
+
+        future = asyncio.get_running_loop().create_future()
+        batch.requests.append((entities, future))
+        batch.entity_count += len(entities)
+        if batch.entity_count >= VerificationAggregator.MAX_BATCH_SIZE:
+            self._start_task(self._flush(scraper_id, batch))
+
+        return await future
+
+    def _start_task(self, coro):
+        task = asyncio.create_task(coro)
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    async def _flush_after_window(self, scraper_id: ScraperId, batch: _Batch):
+        await asyncio.sleep(VerificationAggregator.BATCH_WINDOW_SECS)
+        await self._flush(scraper_id, batch)
+
+    async def _flush(self, scraper_id: ScraperId, batch: _Batch):
+        """Validates the batch, and fans the results out to each caller."""
+        if self.open_batches.get(scraper_id) is not batch:
+            # Already flushed.
+            return
+        del self.open_batches[scraper_id]
+
+        entities = [
+            entity for request_entities, _ in batch.requests for entity in request_entities
+        ]
+        bt.logging.trace(
+            f"Validating {len(entities)} entities from {len(batch.requests)} evaluations with {scraper_id}."
+        )
+
+        try:
+            results = await self._validate(scraper_id, entities)
+        except Exception as e:
+            if len(batch.requests) == 1:
+                _, future = batch.requests[0]
+                if not future.done():
+                    future.set_exception(e)
+                return
+
+            bt.logging.warning(
+                f"Failed to validate {len(entities)} entities together with {scraper_id}. Validating each "
+                + "evaluation's entities separately."
+            )
+            await asyncio.gather(
+                *[
+                    self._resolve_alone(scraper_id, request_entities, future)
+                    for request_entities, future in batch.requests
+                ]
+            )
+            return
+
+        start = 0
+        for request_entities, future in batch.requests:
+            end = start + len(request_entities)
+            if not future.done():
+                future.set_result(results[start:end])
+            start = end
+
+    async def _resolve_alone(
+        self,
+        scraper_id: ScraperId,
+        entities: List[DataEntity],
+        future: asyncio.Future,
+    ):
+        """Validates a single caller's entities, and resolves its future with the results or the failure."""
+        try:
+            results = await self._validate(scraper_id, entities)
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+            return
+        if not future.done():
+            future.set_result(results)
+
+    async def _validate(
+        self, scraper_id: ScraperId, entities: List[DataEntity]
+    ) -> List[ValidationResult]:
+        """Validates the entities with the scraper, reusing cached results where possible."""
+        if self.validation_cache is None:
+            return await self._validate_with_scraper(scraper_id, entities)
+
+        results: List[Optional[ValidationResult]] = [
+            self.validation_cache.get(entity) for entity in entities
+        ]
+
+        # Validate each distinct uncached entity once.
+        positions_by_key: Dict[Tuple[str, bytes], List[int]] = {}
+        for i, entity in enumerate(entities):
+            if results[i] is None:
+                positions_by_key.setdefault(ValidationCache.key(entity), []).append(i)
+
+        if positions_by_key:
+            to_validate = [entities[positions[0]] for positions in positions_by_key.values()]
+            validated = await self._validate_with_scraper(scraper_id, to_validate)
+            for entity, result, positions in zip(
+                to_validate, validated, positions_by_key.values()
+            ):
+                self.validation_cache.put(entity, result)
+                for i in positions:
+                    results[i] = result
+
+        return results
+
+    async def _validate_with_scraper(
+        self, scraper_id: ScraperId, entities: List[DataEntity]
+    ) -> List[ValidationResult]:
+        results = await self.scraper_provider.get(scraper_id).validate(entities)
+        if len(results) != len(entities):
+            raise ValueError(
+                f"{scraper_id} returned {len(results)} results for {len(entities)} entities."
+            )
+        return results
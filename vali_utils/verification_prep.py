@@ -0,0 +1,82 @@
+import hashlib
+import heapq
+import math
+import random
+from typing import Dict, List, Set
+
+from common.data import DataEntity
+from scraping.x import utils as x_utils
+
+
+def sample_entities_by_size(
+    entities: List[DataEntity], k: int, rng: random.Random = random
+) -> List[DataEntity]:
+    """Chooses up to k distinct entities at random, weighted by content size, without replacement.
+
+    Equivalent to repeatedly choosing an entity with probability proportional to its size and removing it, but runs
+    in O(n log k): each entity gets the key log(u) / size for a uniform random u, and the k largest keys are chosen
+    (Efraimidis and Spirakis' weighted reservoir sampling). Entities without content are only chosen if there aren't
+    enough others.
+
+    Returns:
+        The chosen entities, in the order they would have been drawn.
+    """
+    if k <= 0:
+        return []
+
+    # A min-heap of the (key, index) of the k entities with the largest keys seen so far.
+    heap = []
+    for i, entity in enumerate(entities):
+        if entity.content_size_bytes > 0:
+            # 1 - random() is in (0, 1], so its log is always defined.
+            key = math.log(1.0 - rng.random()) / entity.content_size_bytes
+        else:
+            key = -math.inf
+
+        if len(heap) < k:
+            heapq.heappush(heap, (key, i))
+        elif key > heap[0][0]:
+            heapq.heapreplace(heap, (key, i))
+
+    return [entities[i] for _, i in sorted(heap, reverse=True)]
+
+
+def _content_digest(content: bytes) -> bytes:
+    return hashlib.blake2b(content, digest_size=16).digest()
+
+
+def are_entities_unique(entities: List[DataEntity]) -> bool:
+    """Checks that no two entities have the same normalized URI or the same content.
+
+    Contents are first compared by length, which is free to compute. Only entities whose content length collides with
+    another entity's have their full content hashed.
+    """
+    uris: Set[str] = set()
+    # The first entity seen with each content length, until another entity with the same length is seen.
+    unhashed_by_length: Dict[int, bytes] = {}
+    # The digests of all contents with a length shared by more than one entity.
+    digests_by_length: Dict[int, Set[bytes]] = {}
+
+    for entity in entities:
+        uri = x_utils.normalize_url(entity.uri)
+        if uri in uris:
+            return False
+        uris.add(uri)
+
+        content = entity.content
+        length = len(content)
+        digests = digests_by_length.get(length)
+        if digests is None:
+            first_content = unhashed_by_length.pop(length, None)
+            if first_content is None:
+                unhashed_by_length[length] = content
+                continue
+            digests = {_content_digest(first_content)}
+            digests_by_length[length] = digests
+
+        digest = _content_digest(content)
+        if digest in digests:
+            return False
+        digests.add(digest)
+
+    return True